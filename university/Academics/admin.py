@@ -1,4 +1,5 @@
 from django.contrib import admin
+from university.paginators import EstimatedCountPaginator
 from .models import (
     AcademicPeriod,
     Course,
@@ -10,9 +11,58 @@ from .models import (
     AcademicStatus,
     TeacherAssignment,
     StudentAcademicRecord,
-    Enrollment
+    Enrollment,
+    RegistrationRequest,
+    TranscriptEntry,
+    MeetingSlot
 )
 
+COURSE_OFFERING_RELATED = (
+    'course_offering__course_department__course',
+    'course_offering__course_department__department',
+    'course_offering__academic_period',
+)
+STUDENT_RECORD_RELATED = (
+    'student_record__student__user',
+    'student_record__department',
+    'student_record__academic_period',
+)
+
+
+def semester_number_filter(field_path):
+    """
+    List filter for a semester number with fixed choices.
+
+    Django's default filter for a plain field runs SELECT DISTINCT over the
+    whole table to build its choices, which is slow on large tables.
+    """
+    class SemesterNumberFilter(admin.SimpleListFilter):
+        title = 'semester number'
+        parameter_name = field_path
+
+        def lookups(self, request, model_admin):
+            return [(str(number), str(number)) for number in range(1, 13)]
+
+        def queryset(self, request, queryset):
+            if self.value():
+                return queryset.filter(**{field_path: self.value()})
+            return queryset
+
+    return SemesterNumberFilter
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow with the student body."""
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_queryset(self, request):
+        # Also used for autocomplete results, which render __str__ too.
+        queryset = super().get_queryset(request)
+        if self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        return queryset
+
 @admin.register(AcademicPeriod)
 class AcademicPeriodAdmin(admin.ModelAdmin):
     list_display = ('academic_period_id', 'academic_year', 'semester', 'start_date', 'end_date')
@@ -24,34 +74,43 @@ class CourseAdmin(admin.ModelAdmin):
     list_display = ('course_id', 'course_code', 'course_name', 'credit_hours')
     list_filter = ('credit_hours',)
     search_fields = ('course_code', 'course_name')
+    autocomplete_fields = ('prerequisite',)
 
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ('department_id', 'department_name', 'head_of_department')
+    list_select_related = ('head_of_department__user',)
     search_fields = ('department_name',)
+    autocomplete_fields = ('head_of_department',)
 
 @admin.register(CourseDepartment)
 class CourseDepartmentAdmin(admin.ModelAdmin):
     list_display = ('course', 'department')
     list_filter = ('department',)
+    list_select_related = ('course', 'department')
     search_fields = ('course__course_name', 'department__department_name')
+    autocomplete_fields = ('course', 'department')
 
 @admin.register(CourseOffering)
 class CourseOfferingAdmin(admin.ModelAdmin):
     list_display = ('offering_id', 'course_department', 'academic_period', 'semester_number')
     list_filter = ('academic_period', 'semester_number')
+    list_select_related = ('course_department__course', 'course_department__department', 'academic_period')
     search_fields = ('course_department__course__course_name', 'academic_period__academic_year')
+    autocomplete_fields = ('course_department',)
 
 @admin.register(Section)
-class SectionAdmin(admin.ModelAdmin):
-    list_display = ('section_id', 'section_name', 'max_students')
+class SectionAdmin(LargeTableAdmin):
+    list_display = ('section_id', 'section_name', 'max_students', 'enrolled_count')
     search_fields = ('section_name',)
 
 @admin.register(SectionCourseOffering)
-class SectionCourseOfferingAdmin(admin.ModelAdmin):
+class SectionCourseOfferingAdmin(LargeTableAdmin):
     list_display = ('section', 'course_offering')
-    list_filter = ('course_offering__academic_period','course_offering__semester_number','course_offering__course_department__department')
+    list_filter = ('course_offering__academic_period', semester_number_filter('course_offering__semester_number'), 'course_offering__course_department__department')
+    list_select_related = ('section',) + COURSE_OFFERING_RELATED
     search_fields = ('section__section_name', 'course_offering__course_department__course__course_name')
+    autocomplete_fields = ('section', 'course_offering')
 
 @admin.register(AcademicStatus)
 class AcademicStatusAdmin(admin.ModelAdmin):
@@ -59,21 +118,62 @@ class AcademicStatusAdmin(admin.ModelAdmin):
     search_fields = ('status_name',)
 
 @admin.register(TeacherAssignment)
-class TeacherAssignmentAdmin(admin.ModelAdmin):
+class TeacherAssignmentAdmin(LargeTableAdmin):
     list_display = ('assignment_id', 'teacher', 'section_course_offering')
     list_filter = ('section_course_offering__course_offering__academic_period',)
-    search_fields = ('teacher__username', 'section_course_offering__section__section_name')
+    list_select_related = ('teacher__user', 'section_course_offering__section') + tuple(
+        f'section_course_offering__{path}' for path in COURSE_OFFERING_RELATED
+    )
+    search_fields = ('teacher__user__username', 'section_course_offering__section__section_name')
+    autocomplete_fields = ('teacher', 'section_course_offering')
 
 @admin.register(StudentAcademicRecord)
-class StudentAcademicRecordAdmin(admin.ModelAdmin):
+class StudentAcademicRecordAdmin(LargeTableAdmin):
     list_display = ('record_id', 'student', 'department', 'academic_period', 'academic_status', 'semester_number', 'year', 'is_current')
-    list_filter = ('academic_period', 'academic_status', 'is_current','department','semester_number')
-    search_fields = ('student__username', 'department__department_name')
+    list_filter = ('academic_period', 'academic_status', 'is_current','department',semester_number_filter('semester_number'))
+    list_select_related = ('student__user', 'department', 'academic_period', 'academic_status')
+    search_fields = ('student__user__username', 'department__department_name')
+    autocomplete_fields = ('student', 'department', 'academic_period')
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(LargeTableAdmin):
     list_display = ('enrollment_id', 'student_record', 'section_course_offering', 'registration_date', 'is_retake')
-    list_filter = ('registration_date', 'is_retake','section_course_offering__section',
-                   'section_course_offering__course_offering__semester_number','section_course_offering__course_offering__academic_period',
-                   'section_course_offering__course_offering__course_department__department','student_record')
-    search_fields = ('student_record__student__username', 'section_course_offering__section__section_name')
\ No newline at end of file
+    # Newest first, from the registration_date index.
+    ordering = ('-registration_date',)
+    list_filter = ('registration_date', 'is_retake',
+                   semester_number_filter('section_course_offering__course_offering__semester_number'),'section_course_offering__course_offering__academic_period',
+                   'section_course_offering__course_offering__course_department__department')
+    list_select_related = STUDENT_RECORD_RELATED + ('section_course_offering__section',) + tuple(
+        f'section_course_offering__{path}' for path in COURSE_OFFERING_RELATED
+    )
+    search_fields = ('student_record__student__user__username', 'section_course_offering__section__section_name')
+    autocomplete_fields = ('student_record', 'section_course_offering')
+
+
+@admin.register(RegistrationRequest)
+class RegistrationRequestAdmin(LargeTableAdmin):
+    list_display = ('request_id', 'student_record', 'status', 'success_count', 'worker', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    list_select_related = ('student_record__student__user', 'student_record__department', 'student_record__academic_period')
+    search_fields = ('request_id', 'student_record__student__user__username')
+    raw_id_fields = ('student_record',)
+
+
+@admin.register(TranscriptEntry)
+class TranscriptEntryAdmin(LargeTableAdmin):
+    list_display = ('enrollment_id', 'student', 'course_code', 'academic_year', 'semester', 'credit_hours', 'is_retake')
+    list_filter = ('semester', 'is_retake')
+    list_select_related = ('student__user',)
+    search_fields = ('student__user__username', 'course_code', 'course_name')
+    raw_id_fields = ('enrollment', 'student', 'student_record', 'academic_period', 'course')
+
+
+@admin.register(MeetingSlot)
+class MeetingSlotAdmin(admin.ModelAdmin):
+    list_display = ('slot_id', 'section_course_offering', 'day_of_week', 'start_time', 'end_time', 'room')
+    list_filter = ('day_of_week', 'section_course_offering__course_offering__academic_period')
+    list_select_related = ('section_course_offering__section',) + tuple(
+        f'section_course_offering__{path}' for path in COURSE_OFFERING_RELATED
+    )
+    search_fields = ('room', 'section_course_offering__section__section_name')
+    raw_id_fields = ('section_course_offering',)
@@ -0,0 +1,87 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import CourseOffering
+from .utils import cache_timeout
+
+CATALOG_VERSION_KEY = 'academics:catalog:version'
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+
+def _new_version():
+    # Seeded from the clock so that a version key lost to eviction never
+    # comes back with a number that older catalog entries still use.
+    return time.time_ns()
+
+
+def _get_version():
+    return cache.get_or_set(CATALOG_VERSION_KEY, _new_version, None)
+
+
+def _catalog_key(version, department_id, academic_period_id, semester_number):
+    return f'academics:catalog:{version}:{department_id}:{academic_period_id}:{semester_number}'
+
+
+def _cohort_offerings(department_id, academic_period_id, semester_number):
+    return CourseOffering.objects.filter(
+        academic_period=academic_period_id,
+        semester_number=semester_number,
+        course_department__department=department_id
+    ).select_related(
+        'course_department__course',
+        'course_department__department',
+        'academic_period'
+    ).prefetch_related('sections').order_by('course_department__course__course_code')
+
+
+def get_cohort_catalog(department_id, academic_period_id, semester_number):
+    """
+    Return the course offerings open to a cohort, from the cache when possible.
+
+    Every student of the same department, academic period and semester sees
+    the same offerings, so the list is built once per cohort with the course,
+    department, period and sections already loaded, and shared through the
+    cache until the catalog is invalidated, or for at most
+    settings.UNSHARED_CACHE_TIMEOUT seconds when the cache is not shared
+    between processes. Section seat counts in the cached list may be out of
+    date; read them from Section when they matter.
+
+    Returns:
+        list: CourseOffering objects.
+    """
+    key = _catalog_key(_get_version(), department_id, academic_period_id, semester_number)
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = list(_cohort_offerings(department_id, academic_period_id, semester_number))
+        cache.set(key, catalog, cache_timeout(CATALOG_TIMEOUT))
+    return catalog
+
+
+async def aget_cohort_catalog(department_id, academic_period_id, semester_number):
+    """Async version of get_cohort_catalog()."""
+    version = await cache.aget_or_set(CATALOG_VERSION_KEY, _new_version, None)
+    key = _catalog_key(version, department_id, academic_period_id, semester_number)
+    catalog = await cache.aget(key)
+    if catalog is None:
+        catalog = [
+            offering async for offering in _cohort_offerings(department_id, academic_period_id, semester_number)
+        ]
+        await cache.aset(key, catalog, cache_timeout(CATALOG_TIMEOUT))
+    return catalog
+
+
+def invalidate_catalog():
+    """Invalidate the catalog of every cohort."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, _new_version(), None)
+
+
+def invalidate_cohort_catalog(department_id, academic_period_id, semester_number):
+    """Invalidate the catalog of a single cohort once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(
+        _catalog_key(_get_version(), department_id, academic_period_id, semester_number)
+    ))
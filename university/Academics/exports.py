@@ -0,0 +1,108 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Enrollment, StudentAcademicRecord
+
+ENROLLMENT_COLUMNS = [
+    ('enrollment_id', 'enrollment_id'),
+    ('registration_date', 'registration_date'),
+    ('is_retake', 'is_retake'),
+    ('record_id', 'student_record__record_id'),
+    ('student_id', 'student_record__student__student_id'),
+    ('username', 'student_record__student__user__username'),
+    ('email', 'student_record__student__user__email'),
+    ('first_name', 'student_record__student__user__first_name'),
+    ('last_name', 'student_record__student__user__last_name'),
+    ('department', 'student_record__department__department_name'),
+    ('academic_year', 'student_record__academic_period__academic_year'),
+    ('semester', 'student_record__academic_period__semester'),
+    ('semester_number', 'student_record__semester_number'),
+    ('year', 'student_record__year'),
+    ('section', 'section_course_offering__section__section_name'),
+    ('course_code', 'section_course_offering__course_offering__course_department__course__course_code'),
+    ('course_name', 'section_course_offering__course_offering__course_department__course__course_name'),
+    ('credit_hours', 'section_course_offering__course_offering__course_department__course__credit_hours'),
+]
+
+RECORD_COLUMNS = [
+    ('record_id', 'record_id'),
+    ('student_id', 'student__student_id'),
+    ('username', 'student__user__username'),
+    ('email', 'student__user__email'),
+    ('first_name', 'student__user__first_name'),
+    ('last_name', 'student__user__last_name'),
+    ('department', 'department__department_name'),
+    ('academic_year', 'academic_period__academic_year'),
+    ('semester', 'academic_period__semester'),
+    ('semester_number', 'semester_number'),
+    ('year', 'year'),
+    ('academic_status', 'academic_status__status_name'),
+    ('is_current', 'is_current'),
+]
+
+EXPORTS = {
+    'enrollments': (Enrollment, ENROLLMENT_COLUMNS, 'student_record__'),
+    'records': (StudentAcademicRecord, RECORD_COLUMNS, ''),
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def get_export_rows(kind, academic_period=None, department=None, semester_number=None, chunk_size=2000):
+    """
+    Stream the rows of an export as tuples, without loading model instances.
+
+    Args:
+        kind (str): 'enrollments' or 'records'.
+        academic_period (str, optional): Only rows of this AcademicPeriod ID.
+        department (str, optional): Only rows of this Department ID.
+        semester_number (int, optional): Only rows of this semester number.
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Returns:
+        tuple: (column names, iterator of row tuples)
+    """
+    model, columns, record_prefix = EXPORTS[kind]
+    filters = {}
+    if academic_period:
+        filters[f'{record_prefix}academic_period'] = academic_period
+    if department:
+        filters[f'{record_prefix}department'] = department
+    if semester_number:
+        filters[f'{record_prefix}semester_number'] = semester_number
+
+    rows = model.objects.filter(**filters).order_by('pk').values_list(
+        *[lookup for _, lookup in columns]
+    ).iterator(chunk_size=chunk_size)
+    return [name for name, _ in columns], rows
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(header, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + '\n'
+
+
+def iter_export(export_format, header, rows):
+    if export_format == 'jsonl':
+        return iter_jsonl(header, rows)
+    return iter_csv(header, rows)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Academics.retakes import backfill_retakes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Enrollment.is_retake for existing enrollments: an enrollment is a retake "
+        "when the student took the same course in an earlier academic period. Students are "
+        "processed in chunks, each committed on its own, so the command can be interrupted "
+        "and run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help="Students processed per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would change without writing.")
+
+    def handle(self, *args, **options):
+        students = changed = 0
+        started = time.perf_counter()
+        for chunk_students, chunk_changed in backfill_retakes(options['chunk_size'], options['dry_run']):
+            students += chunk_students
+            changed += chunk_changed
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {students} students, {changed} enrollments changed...")
+        elapsed = time.perf_counter() - started
+
+        verb = "Would change" if options['dry_run'] else "Changed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} is_retake on {changed} enrollments of {students} students in {elapsed:.2f}s."
+        ))
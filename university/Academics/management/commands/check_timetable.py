@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Academics.models import AcademicPeriod, Department
+from Academics.timetable import check_academic_period, find_invalid_slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Report timetable clashes in an academic period: sections whose offerings overlap "
+        "(every student of the section would have a clash), teachers booked twice at the "
+        "same time and double-booked rooms, plus meeting slots that end before they start. "
+        "Exits with an error when a problem is found."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('academic_period_id', help="ID of the academic period to check.")
+        parser.add_argument('--department', help="Only check this department's cohorts.")
+
+    def handle(self, *args, **options):
+        try:
+            academic_period = AcademicPeriod.objects.get(pk=options['academic_period_id'])
+        except AcademicPeriod.DoesNotExist:
+            raise CommandError(f"Academic period {options['academic_period_id']} does not exist.")
+        department = None
+        if options['department']:
+            try:
+                department = Department.objects.get(pk=options['department'])
+            except Department.DoesNotExist:
+                raise CommandError(f"Department {options['department']} does not exist.")
+
+        started = time.perf_counter()
+        report = check_academic_period(academic_period, department)
+        invalid_slots = find_invalid_slots(academic_period, department)
+        elapsed = time.perf_counter() - started
+
+        total = 0
+        for kind, groups in report.items():
+            for group, clashes in sorted(groups.items()):
+                for first, second in clashes:
+                    self.stdout.write(f"{kind[:-1]} {group}: {first} clashes with {second}")
+                    total += 1
+        for slot in invalid_slots:
+            self.stdout.write(f"slot {slot} ends before it starts")
+
+        if total or invalid_slots:
+            raise CommandError(
+                f"{total} clashes and {len(invalid_slots)} invalid meeting slots in {academic_period} "
+                f"(checked in {elapsed:.2f}s)."
+            )
+        self.stdout.write(self.style.SUCCESS(f"No clashes in {academic_period} (checked in {elapsed:.2f}s)."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from Academics.exports import EXPORT_FORMATS, EXPORTS, get_export_rows, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream enrollments or academic records to a CSV or JSONL file in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS), help="What to export.")
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', help="Output format.")
+        parser.add_argument('--output', '-o', help="File to write to (default: standard output).")
+        parser.add_argument('--academic-period', help="Only rows of this academic period ID.")
+        parser.add_argument('--department', help="Only rows of this department ID.")
+        parser.add_argument('--semester-number', type=int, help="Only rows of this semester number.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched from the database at a time.")
+
+    def handle(self, *args, **options):
+        header, rows = get_export_rows(
+            options['kind'],
+            academic_period=options['academic_period'],
+            department=options['department'],
+            semester_number=options['semester_number'],
+            chunk_size=options['chunk_size']
+        )
+        lines = iter_export(options['format'], header, rows)
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+                handle.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,293 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from Academics.models import (
+    AcademicPeriod,
+    AcademicStatus,
+    Course,
+    CourseDepartment,
+    CourseOffering,
+    Department,
+    Enrollment,
+    Section,
+    SectionCourseOffering,
+    StudentAcademicRecord,
+    TeacherAssignment,
+)
+from Academics.transcripts import rebuild_transcripts
+from Academics.utils import assign_unique_pks
+from Users import counters
+from Users.models import Student, Teacher, User
+
+DEPARTMENT_NAMES = [
+    'Computer Science', 'Mathematics', 'Physics', 'Chemistry', 'Biology', 'Economics',
+    'Civil Engineering', 'Electrical Engineering', 'Mechanical Engineering', 'Accounting',
+    'Management', 'Law', 'Medicine', 'Pharmacy', 'Architecture', 'Statistics',
+]
+STUDENTS_PER_TEACHER = 20
+STUDENTS_PER_DEPARTMENT = 2000
+SECTION_SIZE = 30
+FLUSH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic university for benchmarks and local testing: departments, "
+        "courses with prerequisite chains, academic periods, offerings, teachers, students, "
+        "academic records, sections, enrollments and teacher assignments. "
+        "Sizes scale with --students; the same --seed gives the same structure."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help="Number of students.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            '--departments', type=int,
+            help=f"Number of departments (default: one per {STUDENTS_PER_DEPARTMENT} students, at least 3)."
+        )
+        parser.add_argument('--semesters', type=int, default=8, help="Semesters in a programme.")
+        parser.add_argument('--courses-per-semester', type=int, default=5, help="Courses per department and semester.")
+        parser.add_argument('--history', type=int, default=1, help="Past academic periods with records and enrollments.")
+        parser.add_argument(
+            '--enrolled-ratio', type=float, default=0.8,
+            help="Share of current records already enrolled; the rest are left for registration."
+        )
+        parser.add_argument('--prefix', default='synthetic', help="Prefix for generated usernames and emails.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Users with the prefix {prefix!r} already exist, pick another --prefix.")
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            statuses = self.create_statuses()
+            periods = self.create_periods()
+            departments = self.create_departments()
+            courses = self.create_courses(departments)
+            offerings = self.create_offerings(periods, courses)
+            teachers = self.create_teachers(departments)
+            records = self.create_students(departments, periods, statuses)
+            self.create_enrollments(records, offerings, teachers, periods[-1])
+            rebuild_transcripts()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {options['students']} students in {len(departments)} departments "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
+        for model in (Course, CourseOffering, Section, StudentAcademicRecord, Enrollment, TeacherAssignment):
+            self.stdout.write(f"  {model.__name__}: {model.objects.count()}")
+
+    def bulk_create(self, model, objects):
+        assign_unique_pks(model, objects)
+        created = model.objects.bulk_create(objects, batch_size=1000)
+        counters.add(model, len(created))
+        return created
+
+    def create_statuses(self):
+        return {
+            name: AcademicStatus.objects.get_or_create(status_name=name)[0]
+            for name, _ in AcademicStatus.STATUS_CHOICES
+        }
+
+    def create_periods(self):
+        """Return the current academic period preceded by --history past ones, oldest first."""
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=30)
+        semester = 'Fall' if start.month >= 7 else 'Winter'
+        periods = []
+        for _ in range(self.options['history'] + 1):
+            year = start.year if semester == 'Fall' else start.year - 1
+            period, _ = AcademicPeriod.objects.get_or_create(
+                academic_year=f"{year}/{year + 1}",
+                semester=semester,
+                defaults={'start_date': start, 'end_date': start + datetime.timedelta(days=150)}
+            )
+            periods.insert(0, period)
+            start -= datetime.timedelta(days=182)
+            semester = 'Winter' if semester == 'Fall' else 'Fall'
+        return periods
+
+    def create_departments(self):
+        count = self.options['departments'] or max(3, self.options['students'] // STUDENTS_PER_DEPARTMENT)
+        prefix = self.options['prefix']
+        departments = []
+        for index in range(count):
+            name = DEPARTMENT_NAMES[index % len(DEPARTMENT_NAMES)]
+            if index >= len(DEPARTMENT_NAMES):
+                name = f"{name} {index // len(DEPARTMENT_NAMES) + 1}"
+            departments.append(Department(department_name=name, description=f"{prefix} department"))
+        return self.bulk_create(Department, departments)
+
+    def create_courses(self, departments):
+        """
+        Create the courses of every department, keyed by (department, semester).
+
+        Most courses require the course in the same slot of the previous
+        semester, which gives prerequisite chains as long as the programme.
+        """
+        prefix = self.options['prefix']
+        courses = {}
+        all_courses = []
+        prerequisites = []
+        for department_index, department in enumerate(departments):
+            for semester in range(1, self.options['semesters'] + 1):
+                semester_courses = []
+                for slot in range(self.options['courses_per_semester']):
+                    has_prerequisite = semester > 1 and self.rng.random() < 0.7
+                    course = Course(
+                        course_name=f"{department.department_name} {semester}.{slot + 1}",
+                        course_code=f"{prefix[:3].upper()}{department_index}-{semester}{slot:02d}",
+                        credit_hours=self.rng.choice((2, 3, 3, 3, 4, 5))
+                    )
+                    if has_prerequisite:
+                        prerequisites.append((course, courses[department.pk, semester - 1][slot]))
+                    semester_courses.append(course)
+                courses[department.pk, semester] = semester_courses
+                all_courses.extend(semester_courses)
+
+        # Linked only once the keys are final: a key redrawn after linking
+        # would leave prerequisite_id pointing at a course that never exists.
+        assign_unique_pks(Course, all_courses)
+        for course, prerequisite in prerequisites:
+            course.prerequisite = prerequisite
+        self.bulk_create(Course, all_courses)
+        CourseDepartment.objects.bulk_create([
+            CourseDepartment(course=course, department_id=department_id)
+            for (department_id, _), semester_courses in courses.items()
+            for course in semester_courses
+        ], batch_size=1000)
+        return courses
+
+    def create_offerings(self, periods, courses):
+        course_departments = {
+            (course_department.course_id, course_department.department_id): course_department
+            for course_department in CourseDepartment.objects.filter(
+                course__in=[course for semester_courses in courses.values() for course in semester_courses]
+            )
+        }
+        offerings = {}
+        all_offerings = []
+        for period in periods:
+            for (department_id, semester), semester_courses in courses.items():
+                cohort_offerings = [
+                    CourseOffering(
+                        course_department=course_departments[course.pk, department_id],
+                        academic_period=period,
+                        semester_number=semester
+                    )
+                    for course in semester_courses
+                ]
+                offerings[department_id, period.pk, semester] = cohort_offerings
+                all_offerings.extend(cohort_offerings)
+        self.bulk_create(CourseOffering, all_offerings)
+        return offerings
+
+    def create_users(self, role, count):
+        prefix = self.options['prefix']
+        letter = role[0].lower()
+        return self.bulk_create(User, [
+            User(
+                username=f"{prefix}-{letter}{index}",
+                email=f"{prefix}-{letter}{index}@example.edu",
+                first_name=f"{role}{index}",
+                last_name=prefix.title(),
+                role=role,
+                gender=self.rng.choice(('Male', 'Female')),
+                password='!'
+            )
+            for index in range(count)
+        ])
+
+    def create_teachers(self, departments):
+        count = max(len(departments), self.options['students'] // STUDENTS_PER_TEACHER)
+        users = self.create_users('Teacher', count)
+        teachers = self.bulk_create(Teacher, [
+            Teacher(user=user, department=departments[index % len(departments)])
+            for index, user in enumerate(users)
+        ])
+        by_department = {}
+        for teacher in teachers:
+            by_department.setdefault(teacher.department_id, []).append(teacher)
+        return by_department
+
+    def create_students(self, departments, periods, statuses):
+        """Create students with a current record and a record for each past period they attended."""
+        users = self.create_users('Student', self.options['students'])
+        students = self.bulk_create(Student, [Student(user=user) for user in users])
+
+        status_weights = [(statuses['enrolled'], 0.93), (statuses['probation'], 0.07)]
+        records = []
+        for student in students:
+            department = self.rng.choice(departments)
+            semester = self.rng.randint(1, self.options['semesters'])
+            status = self.rng.choices(
+                [status for status, _ in status_weights],
+                [weight for _, weight in status_weights]
+            )[0]
+            for age, period in enumerate(reversed(periods)):
+                if semester - age < 1:
+                    break
+                records.append(StudentAcademicRecord(
+                    student=student,
+                    department=department,
+                    academic_period=period,
+                    academic_status=status,
+                    semester_number=semester - age,
+                    year=min((semester - age + 1) // 2, 6),
+                    is_current=age == 0
+                ))
+        return self.bulk_create(StudentAcademicRecord, records)
+
+    def create_enrollments(self, records, offerings, teachers, current_period):
+        """Fill sections of SECTION_SIZE per cohort and enroll each student in every cohort offering."""
+        cohorts = {}
+        for record in records:
+            if record.academic_period_id == current_period.pk and self.rng.random() >= self.options['enrolled_ratio']:
+                continue
+            key = (record.department_id, record.academic_period_id, record.semester_number)
+            cohorts.setdefault(key, []).append(record)
+
+        enrollments = []
+        for (department_id, period_id, semester), cohort_records in cohorts.items():
+            cohort_offerings = offerings[department_id, period_id, semester]
+            department_name = cohort_offerings[0].course_department.department.department_name
+            chunks = [
+                cohort_records[start:start + SECTION_SIZE]
+                for start in range(0, len(cohort_records), SECTION_SIZE)
+            ]
+            sections = self.bulk_create(Section, [
+                Section(
+                    section_name=f"{department_name[:3]}-{number}sem({semester})",
+                    max_students=SECTION_SIZE,
+                    enrolled_count=len(chunk)
+                )
+                for number, chunk in enumerate(chunks, start=1)
+            ])
+            links = SectionCourseOffering.objects.bulk_create([
+                SectionCourseOffering(section=section, course_offering=offering)
+                for section in sections
+                for offering in cohort_offerings
+            ], batch_size=1000)
+            self.bulk_create(TeacherAssignment, [
+                TeacherAssignment(teacher=self.rng.choice(teachers[department_id]), section_course_offering=link)
+                for link in links
+            ])
+
+            links_by_section = {}
+            for link in links:
+                links_by_section.setdefault(link.section_id, []).append(link)
+            for section, chunk in zip(sections, chunks):
+                for record in chunk:
+                    for link in links_by_section[section.pk]:
+                        enrollments.append(Enrollment(student_record=record, section_course_offering=link))
+                if len(enrollments) >= FLUSH_SIZE:
+                    self.bulk_create(Enrollment, enrollments)
+                    enrollments = []
+        self.bulk_create(Enrollment, enrollments)
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import tempfile
+import time
+from io import StringIO
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.template import engines
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from Academics.management.commands.run_benchmarks import stub_templates_settings
+from Academics.models import StudentAcademicRecord
+from Academics.periods import invalidate_academic_periods
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare how many course registrations one worker completes through the synchronous "
+        "course_registration view (one request at a time, as a WSGI worker thread) and "
+        "through course_registration_async (many requests in flight on one event loop, as "
+        "an ASGI worker). Runs on synthetic data in a throwaway test database. "
+        "--db-latency-ms adds a delay to every query to model a database across the network."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help="Size of the synthetic university.")
+        parser.add_argument('--requests', type=int, default=100, help="Registrations per run.")
+        parser.add_argument('--concurrency', type=int, default=20, help="Requests in flight on the async worker.")
+        parser.add_argument('--db-latency-ms', type=float, default=2.0, help="Delay added to every query.")
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            # Shared-cache in-memory databases lock whole tables across
+            # threads, so the test database goes to a temporary file instead.
+            handle, path = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(handle)
+            connection.settings_dict['TEST']['NAME'] = path
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        latency = options['db_latency_ms'] / 1000
+
+        def add_latency(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def install_latency(sender, connection, **kwargs):
+            connection.execute_wrappers.append(add_latency)
+
+        try:
+            cache.clear()
+            invalidate_academic_periods()
+            call_command(
+                'generate_university_data', students=options['students'], enrolled_ratio=0.0, stdout=StringIO()
+            )
+            records = list(StudentAcademicRecord.objects.filter(
+                is_current=True
+            ).select_related('student__user').order_by('pk')[:options['requests'] * 2])
+            offering_ids = {
+                record.pk: [offering.pk for offering in record.get_course_catalog()] for record in records
+            }
+
+            with override_settings(TEMPLATES=stub_templates_settings()):
+                engines._engines = {}
+                connection.execute_wrappers.append(add_latency)
+                connection_created.connect(install_latency)
+                try:
+                    sync_batch = records[:options['requests']]
+                    async_batch = records[options['requests']:]
+                    sync_elapsed = self.run_sync(sync_batch, offering_ids)
+                    async_elapsed = asyncio.run(self.run_async(async_batch, offering_ids, options['concurrency']))
+                finally:
+                    connection_created.disconnect(install_latency)
+                    connection.execute_wrappers.remove(add_latency)
+                    engines._engines = {}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        enrolled = len(sync_batch) + len(async_batch)
+        self.stdout.write(
+            f"WSGI-style worker: {len(sync_batch)} registrations in {sync_elapsed:.2f}s "
+            f"({len(sync_batch) / sync_elapsed:.1f}/s)"
+        )
+        self.stdout.write(
+            f"ASGI worker (concurrency {options['concurrency']}): {len(async_batch)} registrations in "
+            f"{async_elapsed:.2f}s ({len(async_batch) / async_elapsed:.1f}/s)"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{enrolled} registrations, async/sync throughput ratio "
+            f"{(len(async_batch) / async_elapsed) / (len(sync_batch) / sync_elapsed):.1f}x"
+        ))
+
+    def run_sync(self, records, offering_ids):
+        clients = []
+        for record in records:
+            client = Client()
+            client.force_login(record.student.user)
+            clients.append(client)
+
+        started = time.perf_counter()
+        for client, record in zip(clients, records):
+            client.get(reverse('Academics:course_registration'))
+            client.post(
+                reverse('Academics:course_registration'),
+                {'course_offering_ids': offering_ids[record.pk]}
+            )
+        return time.perf_counter() - started
+
+    async def run_async(self, records, offering_ids, concurrency):
+        clients = []
+        for record in records:
+            client = AsyncClient()
+            await client.aforce_login(record.student.user)
+            clients.append(client)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        url = reverse('Academics:course_registration_async')
+
+        async def register(client, record):
+            async with semaphore:
+                # The ASGI handler gives every request its own thread for
+                # sync_to_async work; the test client does not, so do it here.
+                async with ThreadSensitiveContext():
+                    await client.get(url)
+                async with ThreadSensitiveContext():
+                    await client.post(url, {'course_offering_ids': offering_ids[record.pk]})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(register(client, record) for client, record in zip(clients, records)))
+        return time.perf_counter() - started
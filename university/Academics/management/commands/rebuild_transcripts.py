@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Academics.models import TranscriptEntry
+from Academics.signals import send_students_changed
+from Academics.transcripts import rebuild_transcripts
+
+
+class Command(BaseCommand):
+    help = (
+        "Repopulate the TranscriptEntry table from Enrollment. Normally the table is kept "
+        "up to date as enrollments change; run this after importing data with bulk tools "
+        "or to repair it. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Enrollments written per query.")
+        parser.add_argument('--student', action='append', dest='student_ids', help="Only rebuild this student (repeatable).")
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete the existing rows first (in one transaction with the rebuild)."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        entries = TranscriptEntry.objects.all()
+        if options['student_ids']:
+            entries = entries.filter(student__in=options['student_ids'])
+        with transaction.atomic():
+            if options['clear']:
+                entries.delete()
+            written = rebuild_transcripts(options['chunk_size'], options['student_ids'])
+            # The rows are rewritten with bulk_create, which sends no post_save.
+            send_students_changed(entries)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} transcript rows in {elapsed:.2f}s "
+            f"({written / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Academics.models import Section
+
+
+class Command(BaseCommand):
+    help = "Recompute Section.enrolled_count from Enrollment and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without fixing it.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per bulk update.")
+
+    def find_drift(self, sections, actual_counts):
+        """Return (section, actual count) for the sections whose enrolled_count is wrong."""
+        return [
+            (section, actual_counts.get(section.pk, 0)) for section in sections
+            if section.enrolled_count != actual_counts.get(section.pk, 0)
+        ]
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sections = Section.objects.only('section_id', 'section_name', 'enrolled_count').order_by('pk')
+        drifted = self.find_drift(sections.iterator(chunk_size=batch_size), Section.get_enrolled_counts())
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All section counts are up to date."))
+            return
+
+        if options['dry_run']:
+            for section, actual in drifted:
+                self.stdout.write(f"{section.section_name} ({section.pk}): {section.enrolled_count} -> {actual}")
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} section(s) drifted (dry run, nothing changed)."))
+            return
+
+        # Seats are claimed and released with F() updates while the counts
+        # above were read, so writing them back as is could overwrite those
+        # updates. The drifted sections are locked and recounted instead;
+        # claim_seat and release_seat on them wait until this commits.
+        drifted_ids = [section.pk for section, _ in drifted]
+        corrected = 0
+        with transaction.atomic():
+            for start in range(0, len(drifted_ids), batch_size):
+                section_ids = drifted_ids[start:start + batch_size]
+                locked = list(sections.select_for_update().filter(pk__in=section_ids))
+                changed = []
+                for section, actual in self.find_drift(locked, Section.get_enrolled_counts(section_ids)):
+                    self.stdout.write(f"{section.section_name} ({section.pk}): {section.enrolled_count} -> {actual}")
+                    section.enrolled_count = actual
+                    changed.append(section)
+                Section.objects.bulk_update(changed, ['enrolled_count'])
+                corrected += len(changed)
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} section count(s)."))
@@ -0,0 +1,128 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from Academics.models import AcademicPeriod, StudentAcademicRecord
+from Academics.signals import students_changed_in_bulk
+from Academics.utils import assign_unique_pks
+
+MAX_SEMESTER = 12
+MAX_YEAR = 6
+FINAL_STATUSES = ('graduated', 'dismissed')
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a new academic period for the whole student body: create the next "
+        "StudentAcademicRecord for every current record, advance semester and year, "
+        "carry the academic status forward and retire the old records. Graduated and "
+        "dismissed students are not rolled over, and the command refuses to run while a "
+        "student has more than one current record. Safe to re-run after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('academic_period_id', help="ID of the academic period to roll into.")
+        parser.add_argument(
+            '--from', dest='from_period_id',
+            help="Only roll over records of this academic period (default: every current record)."
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Records processed per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would change without writing.")
+
+    def handle(self, *args, **options):
+        try:
+            target_period = AcademicPeriod.objects.get(pk=options['academic_period_id'])
+        except AcademicPeriod.DoesNotExist:
+            raise CommandError(f"Academic period {options['academic_period_id']} does not exist.")
+
+        source_records = StudentAcademicRecord.objects.filter(
+            is_current=True
+        ).exclude(
+            academic_period=target_period
+        ).exclude(
+            academic_status__status_name__in=FINAL_STATUSES
+        )
+        if options['from_period_id']:
+            source_records = source_records.filter(academic_period=options['from_period_id'])
+
+        # Which of a student's current records would be rolled over depends on
+        # the order the chunks come in, so students with several are refused.
+        duplicates = list(source_records.values('student_id').annotate(
+            record_count=Count('pk')
+        ).filter(record_count__gt=1).order_by('student_id').values_list('student_id', flat=True)[:11])
+        if duplicates:
+            raise CommandError(
+                f"Students with more than one current academic record: {', '.join(duplicates[:10])}"
+                f"{', ...' if len(duplicates) > 10 else ''}. Retire the stale records and run again."
+            )
+
+        chunk_size = options['chunk_size']
+        dry_run = options['dry_run']
+        created = retired = skipped = processed = 0
+        last_pk = ''
+        started = time.perf_counter()
+
+        # Keyset pagination over primary keys: every chunk commits on its own,
+        # and retired records drop out of the filter, so an interrupted run
+        # simply continues with what is left when started again.
+        while True:
+            chunk = list(source_records.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'student_id', 'department_id', 'academic_status_id', 'semester_number', 'year'
+            )[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+
+            already_rolled = set(StudentAcademicRecord.objects.filter(
+                academic_period=target_period,
+                student_id__in=[row[1] for row in chunk]
+            ).values_list('student_id', flat=True))
+
+            new_records = []
+            retiring_pks = []
+            retiring_student_ids = []
+            for record_id, student_id, department_id, status_id, semester_number, year in chunk:
+                if semester_number >= MAX_SEMESTER:
+                    skipped += 1
+                    continue
+                retiring_pks.append(record_id)
+                retiring_student_ids.append(student_id)
+                if student_id in already_rolled:
+                    continue
+                new_records.append(StudentAcademicRecord(
+                    student_id=student_id,
+                    department_id=department_id,
+                    academic_period=target_period,
+                    academic_status_id=status_id,
+                    semester_number=semester_number + 1,
+                    year=min(year + 1, MAX_YEAR) if semester_number % 2 == 0 else year,
+                    is_current=True
+                ))
+
+            if not dry_run:
+                with transaction.atomic():
+                    assign_unique_pks(StudentAcademicRecord, new_records)
+                    StudentAcademicRecord.objects.bulk_create(new_records, batch_size=chunk_size)
+                    StudentAcademicRecord.objects.filter(pk__in=retiring_pks).update(is_current=False)
+                    students_changed_in_bulk.send(
+                        sender=StudentAcademicRecord,
+                        student_ids=retiring_student_ids,
+                        student_record_ids=retiring_pks
+                    )
+
+            created += len(new_records)
+            retired += len(retiring_pks)
+            processed += len(chunk)
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {processed} records processed...")
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed else 0
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Rolled over into {target_period}: {created} records created, {retired} retired, "
+            f"{skipped} skipped at semester {MAX_SEMESTER}. "
+            f"{processed} records in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        ))
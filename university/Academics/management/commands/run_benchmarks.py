@@ -0,0 +1,220 @@
+import json
+import statistics
+import subprocess
+import time
+from copy import deepcopy
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.template import engines
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from Academics.models import Section, StudentAcademicRecord, TeacherAssignment
+from Academics.periods import invalidate_academic_periods
+from university.middleware import QueryRecorder
+from Users.models import User
+
+# Used only where the project's own templates are not installed. They read the
+# same context the real pages do, so lazy context values are still resolved.
+STUB_TEMPLATES = {
+    'academics/course_registration.html': (
+        "{% for offering in available_courses %}"
+        "{{ offering.course_department.course.course_code }} {{ offering.course_department.course.credit_hours }}"
+        "{% for section in offering.sections.all %}{{ section.section_name }}{% endfor %}"
+        "{% if offering.offering_id in enrolled_course_ids %}enrolled{% endif %}"
+        "{% endfor %}"
+    ),
+    'authentication/index.html': (
+        "{{ current_academic_period }} {{ department }} {{ current_semester }} {{ academic_status }}"
+        "{% for enrollment in enrollments %}{{ enrollment.section_course_offering.section }}{% endfor %}"
+        "{% for course in current_courses %}{{ course.course_code }}{% endfor %}"
+        "{% for section in taught_sections %}{{ section }}{% endfor %}"
+        "{{ total_students }} {{ total_teachers }} {{ total_courses }} {{ total_departments }}"
+    ),
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stub_templates_settings():
+    templates = deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['loaders'] = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+        ('django.template.loaders.locmem.Loader', STUB_TEMPLATES),
+    ]
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Time and query-count the registration hot paths on synthetic data at one or more "
+        "scales in a throwaway test database, and write the results as JSON so runs "
+        "on different commits can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', type=int, nargs='+', default=[1000],
+            help="Student counts to benchmark, e.g. --scales 1000 10000 100000."
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the data generator.")
+        parser.add_argument('--output', default='benchmark_results.json', help="File to write the results to.")
+
+    def handle(self, *args, **options):
+        results = {}
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(TEMPLATES=stub_templates_settings()):
+                for scale in options['scales']:
+                    results[str(scale)] = self.run_scale(scale, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        payload = {
+            'revision': git_revision(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        with open(options['output'], 'w') as handle:
+            json.dump(payload, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+
+    def run_scale(self, scale, options):
+        self.stdout.write(f"Scale {scale}: generating data...")
+        call_command('flush', interactive=False, verbosity=0)
+        cache.clear()
+        invalidate_academic_periods()
+        call_command('generate_university_data', students=scale, seed=options['seed'], stdout=StringIO())
+
+        scale_results = {}
+        for name, scenario in self.build_scenarios(options['repeat']):
+            if scenario is None:
+                self.stdout.write(f"  {name:<32} skipped, the generated data has too few matching rows")
+                continue
+            scale_results[name] = self.measure(scenario, options['repeat'])
+            self.stdout.write(
+                f"  {name:<32} {scale_results[name]['median_ms']:>9.2f} ms  "
+                f"{scale_results[name]['queries']:>5} queries"
+            )
+        return scale_results
+
+    def measure(self, scenario, repeat):
+        timings = []
+        query_counts = []
+        for index in range(repeat):
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                started = time.perf_counter()
+                scenario(index)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(recorder.count)
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': max(query_counts),
+        }
+
+    def build_scenarios(self, repeat):
+        """
+        Return (name, scenario) pairs; the scenario is None where the data
+        has too few rows for it, e.g. at small scales or with a large repeat.
+        """
+        pending = list(StudentAcademicRecord.objects.filter(
+            is_current=True,
+            enrollments__isnull=True
+        ).select_related('student__user', 'academic_period', 'department').order_by('pk')[:repeat * 3])
+        enrolled = StudentAcademicRecord.objects.filter(
+            is_current=True,
+            enrollments__isnull=False
+        ).select_related('student__user').first()
+        teacher = TeacherAssignment.objects.select_related('teacher__user').first()
+        admin = User.objects.create_superuser(
+            email='benchmark-admin@example.edu', username='benchmark-admin', password=None, role='Admin'
+        )
+        offerings = {record.pk: list(record.get_compatible_courses()) for record in pending}
+
+        def rolled_back(func):
+            def run(index):
+                with transaction.atomic():
+                    func(index)
+                    transaction.set_rollback(True)
+            return run
+
+        def create_or_get_section(index):
+            Section.create_or_get_section(offerings[pending[index].pk])
+
+        def enroll_in_courses(index):
+            pending[index].enroll_in_courses(offerings[pending[index].pk])
+
+        def batch_enroll(index):
+            pending[index].batch_enroll([offering.pk for offering in offerings[pending[index].pk]])
+
+        template = engines['django'].from_string(STUB_TEMPLATES['authentication/index.html'])
+
+        def user_role_context(user):
+            def run(index):
+                request = RequestFactory().get('/')
+                request.user = user
+                template.render({}, request)
+            return run
+
+        def client_for(user):
+            client = Client()
+            client.force_login(user)
+            return client
+
+        # Logged in up front so that signing in is not part of the measurement.
+        clients = [client_for(record.student.user) for record in pending]
+        admin_client = client_for(admin)
+
+        def registration_get(index):
+            clients[index].get(reverse('Academics:course_registration'))
+
+        def registration_post(index):
+            record = pending[repeat + index]
+            clients[repeat + index].post(
+                reverse('Academics:course_registration'),
+                {'course_offering_ids': [offering.pk for offering in offerings[record.pk]]}
+            )
+
+        def changelist(model_name):
+            def run(index):
+                admin_client.get(f'/admin/Academics/{model_name}/')
+            return run
+
+        # Each run of a scenario uses its own pending record; the POST runs
+        # use a second set, because the GET runs must not see them enrolled.
+        enough_pending = len(pending) >= repeat
+        return [
+            ('create_or_get_section', rolled_back(create_or_get_section) if enough_pending else None),
+            ('enroll_in_courses', rolled_back(enroll_in_courses) if enough_pending else None),
+            ('batch_enroll', rolled_back(batch_enroll) if enough_pending else None),
+            ('user_role_context', user_role_context(enrolled.student.user) if enrolled else None),
+            ('teacher_role_context', user_role_context(teacher.teacher.user) if teacher else None),
+            ('admin_role_context', user_role_context(admin)),
+            ('course_registration_get', registration_get if enough_pending else None),
+            ('course_registration_post', registration_post if len(pending) >= repeat * 2 else None),
+            ('admin_enrollment_changelist', changelist('enrollment')),
+            ('admin_record_changelist', changelist('studentacademicrecord')),
+        ]
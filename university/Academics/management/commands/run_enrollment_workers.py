@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from Academics.registration_queue import run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued course registrations (REGISTRATION_QUEUE=True). Each worker "
+        "claims a batch of tickets from one cohort, enrolls them in a single transaction "
+        "and stores the outcome for the registration page to pick up. Keep the number of "
+        "workers at what the database can write concurrently: one for SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help="Worker processes.")
+        parser.add_argument('--batch-size', type=int, default=50, help="Tickets enrolled per transaction.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help="Seconds after which a claimed but unfinished ticket is put back in the queue."
+        )
+        parser.add_argument('--once', action='store_true', help="Exit when the queue is empty.")
+
+    def handle(self, *args, **options):
+        worker_options = {
+            'batch_size': options['batch_size'],
+            'poll_interval': options['poll_interval'],
+            'stale_after': options['stale_after'],
+            'once': options['once'],
+        }
+        started = time.perf_counter()
+        if options['workers'] > 1:
+            # Forked workers must not share the parent's database connection.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+                futures = [
+                    pool.submit(run_worker, index, **worker_options) for index in range(options['workers'])
+                ]
+                processed = sum(future.result() for future in futures)
+        else:
+            processed = run_worker(**worker_options)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {processed} registration requests in {elapsed:.2f}s "
+            f"({processed / elapsed if elapsed else 0:.0f}/s)."
+        ))
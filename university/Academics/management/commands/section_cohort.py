@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Academics.models import AcademicPeriod, Department
+from Academics.sectioning import MAX_SECTION_SIZE, section_cohort
+
+
+class Command(BaseCommand):
+    help = (
+        "Place every pending student of a cohort (academic period, department, semester) "
+        "in sections at once: existing sections are topped up, the rest go to the fewest "
+        "new sections that hold them with balanced sizes, and all enrollments are written "
+        "in bulk. Existing sections with a timetable clash are not filled. Prints a report "
+        "of the sections used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('academic_period_id', help="ID of the academic period.")
+        parser.add_argument('department_id', help="ID of the department.")
+        parser.add_argument('semester_number', type=int, help="Semester of the cohort.")
+        parser.add_argument(
+            '--max-students', type=int, default=MAX_SECTION_SIZE,
+            help=f"Capacity of new sections (at most {MAX_SECTION_SIZE})."
+        )
+        parser.add_argument(
+            '--no-fill-existing', dest='fill_existing', action='store_false',
+            help="Only use new sections, leaving free seats in existing ones for live registration."
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Print the plan without writing.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options['max_students'] <= MAX_SECTION_SIZE:
+            raise CommandError(f"--max-students must be between 1 and {MAX_SECTION_SIZE}.")
+        try:
+            academic_period = AcademicPeriod.objects.get(pk=options['academic_period_id'])
+        except AcademicPeriod.DoesNotExist:
+            raise CommandError(f"Academic period {options['academic_period_id']} does not exist.")
+        try:
+            department = Department.objects.get(pk=options['department_id'])
+        except Department.DoesNotExist:
+            raise CommandError(f"Department {options['department_id']} does not exist.")
+
+        started = time.perf_counter()
+        result = section_cohort(
+            academic_period,
+            department,
+            options['semester_number'],
+            max_students=options['max_students'],
+            fill_existing=options['fill_existing'],
+            dry_run=options['dry_run']
+        )
+        elapsed = time.perf_counter() - started
+
+        cohort = f"{department} semester {options['semester_number']}, {academic_period}"
+        if not result.sections:
+            self.stdout.write(f"No pending students to place in {cohort}.")
+            return
+
+        self.stdout.write(f"{'Section':<24}{'Before':>8}{'Added':>8}{'After':>8}{'Max':>6}")
+        for row in result.sections:
+            name = row['section'] + (' (new)' if row['new'] else '')
+            self.stdout.write(
+                f"{name:<24}{row['before']:>8}{row['added']:>8}{row['after']:>8}{row['max_students']:>6}"
+            )
+        for section_name, clashes in sorted(result.clashing_sections.items()):
+            self.stdout.write(
+                f"{section_name} was not filled, its timetable clashes: "
+                + ", ".join(f"{first} with {second}" for first, second in clashes)
+            )
+        for username, course_codes in sorted(result.prerequisite_failures.items()):
+            self.stdout.write(f"{username}: missing prerequisites for {', '.join(course_codes)}")
+
+        sizes = [row['after'] for row in result.sections]
+        new_count = sum(row['new'] for row in result.sections)
+        verb = "Would place" if options['dry_run'] else "Placed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.assigned} students of {cohort} in {len(sizes)} sections "
+            f"({new_count} new, sizes {min(sizes)}-{max(sizes)}) with {result.enrollments} enrollments "
+            f"in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,186 @@
+import datetime
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection
+from django.db.models import Count
+
+from Academics.models import (
+    AcademicPeriod,
+    AcademicStatus,
+    Course,
+    CourseDepartment,
+    CourseOffering,
+    Department,
+    Enrollment,
+    Section,
+    StudentAcademicRecord,
+)
+from Users import counters
+from Users.models import Student, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Register many students for the same cohort concurrently and check that "
+        "no section exceeds max_students and no section name is minted twice. "
+        "Runs against the configured database and removes its data afterwards. "
+        "The reported registrations/s and lock retries make it a load benchmark "
+        "for comparing database settings (DB_ENGINE, DB_SQLITE_TUNED, ...)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300, help="Number of students registering at once.")
+        parser.add_argument('--courses', type=int, default=5, help="Number of offerings in the cohort.")
+        parser.add_argument('--threads', type=int, default=32, help="Number of concurrent registration threads.")
+        parser.add_argument('--retries', type=int, default=50, help="Attempts per student when the database reports a lock.")
+        parser.add_argument('--keep', action='store_true', help="Keep the generated data for inspection.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        self.stdout.write(f"Building stress cohort {tag} ({connection.vendor})...")
+        period, department, offering_ids, record_ids, user_ids = self.build_cohort(
+            tag, options['students'], options['courses']
+        )
+
+        retries = []
+        failures = []
+        lock = threading.Lock()
+
+        def register(record_id):
+            close_old_connections()
+            try:
+                record = StudentAcademicRecord.objects.select_related('academic_period').get(pk=record_id)
+                for attempt in range(options['retries']):
+                    try:
+                        record.batch_enroll(offering_ids)
+                        return
+                    except OperationalError:
+                        with lock:
+                            retries.append(record_id)
+                        time.sleep(0.01 * (attempt + 1))
+                with lock:
+                    failures.append(record_id)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            list(executor.map(register, record_ids))
+        elapsed = time.perf_counter() - started
+
+        try:
+            errors = self.check_cohort(department, period, offering_ids, record_ids)
+            self.stdout.write(
+                f"{len(record_ids)} registrations in {elapsed:.2f}s "
+                f"({len(record_ids) / elapsed:.0f}/s), {len(retries)} lock retries, "
+                f"{len(failures)} gave up."
+            )
+            if failures:
+                errors.append(f"{len(failures)} students could not be registered.")
+        finally:
+            if not options['keep']:
+                self.cleanup(period, department, offering_ids, user_ids)
+
+        if errors:
+            raise CommandError("\n".join(errors))
+        self.stdout.write(self.style.SUCCESS("Section allocation stayed within capacity."))
+
+    def build_cohort(self, tag, student_count, course_count):
+        today = datetime.date.today()
+        period = AcademicPeriod.objects.create(
+            academic_year=f"stress-{tag}",
+            semester='Fall',
+            start_date=today,
+            end_date=today + datetime.timedelta(days=120)
+        )
+        department = Department.objects.create(department_name=f"Stress {tag}")
+        status, _ = AcademicStatus.objects.get_or_create(status_name='enrolled')
+
+        offering_ids = []
+        for index in range(course_count):
+            course = Course.objects.create(
+                course_name=f"Stress course {index}",
+                course_code=f"ST{tag}{index}",
+                credit_hours=3
+            )
+            course_department = CourseDepartment.objects.create(course=course, department=department)
+            offering = CourseOffering.objects.create(
+                course_department=course_department,
+                academic_period=period,
+                semester_number=1
+            )
+            offering_ids.append(offering.pk)
+
+        users = User.objects.bulk_create([
+            User(
+                email=f"stress-{tag}-{index}@example.com",
+                username=f"stress-{tag}-{index}",
+                role='Student',
+                password='!'
+            )
+            for index in range(student_count)
+        ])
+        students = Student.objects.bulk_create([Student(user=user) for user in users])
+        counters.add(Student, len(students))
+        records = StudentAcademicRecord.objects.bulk_create([
+            StudentAcademicRecord(
+                student=student,
+                department=department,
+                academic_period=period,
+                academic_status=status,
+                semester_number=1,
+                year=1
+            )
+            for student in students
+        ])
+        return period, department, offering_ids, [record.pk for record in records], [user.pk for user in users]
+
+    def check_cohort(self, department, period, offering_ids, record_ids):
+        errors = []
+        sections = Section.objects.filter(
+            section_course_offerings__course_offering__in=offering_ids
+        ).distinct().annotate(
+            student_count=Count('section_course_offerings__enrollments__student_record', distinct=True)
+        )
+        for section in sections:
+            if section.student_count > section.max_students:
+                errors.append(
+                    f"Section {section.section_name} holds {section.student_count} students "
+                    f"(max {section.max_students})."
+                )
+
+            if section.enrolled_count != section.student_count:
+                errors.append(
+                    f"Section {section.section_name} counts {section.enrolled_count} seats "
+                    f"but holds {section.student_count} students."
+                )
+
+        names = [section.section_name for section in sections]
+        if len(names) != len(set(names)):
+            errors.append(f"Duplicate section names were created: {sorted(names)}")
+
+        enrolled = Enrollment.objects.filter(
+            student_record__in=record_ids
+        ).values('student_record').distinct().count()
+        if enrolled != len(record_ids):
+            errors.append(f"Only {enrolled} of {len(record_ids)} students were enrolled.")
+
+        self.stdout.write(f"{len(names)} sections used: {', '.join(sorted(names))}")
+        return errors
+
+    def cleanup(self, period, department, offering_ids, user_ids):
+        section_ids = list(Section.objects.filter(
+            section_course_offerings__course_offering__in=offering_ids
+        ).values_list('pk', flat=True).distinct())
+        course_ids = list(CourseOffering.objects.filter(
+            pk__in=offering_ids
+        ).values_list('course_department__course', flat=True))
+        period.delete()
+        department.delete()
+        Section.objects.filter(pk__in=section_ids).delete()
+        Course.objects.filter(pk__in=course_ids).delete()
+        User.objects.filter(pk__in=user_ids).delete()
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.7 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0002_initial'),
+        ('Users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='studentacademicrecord',
+            unique_together={('student', 'academic_period')},
+        ),
+        migrations.AddIndex(
+            model_name='academicperiod',
+            index=models.Index(fields=['start_date'], name='Academics_a_start_d_19603b_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.7 on 2026-10-18 00:48
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_enrolled_count(apps, schema_editor):
+    Section = apps.get_model('Academics', 'Section')
+    Enrollment = apps.get_model('Academics', 'Enrollment')
+    counts = Enrollment.objects.values_list('section_course_offering__section').annotate(
+        student_count=Count('student_record', distinct=True)
+    ).order_by()
+    for section_id, student_count in counts:
+        Section.objects.filter(pk=section_id).update(enrolled_count=student_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0003_academicperiod_start_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='enrolled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_enrolled_count, migrations.RunPython.noop),
+    ]
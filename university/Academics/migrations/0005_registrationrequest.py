@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:05
+
+import django.db.models.deletion
+import shortuuid.django_fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0004_section_enrolled_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationRequest',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('request_id', shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='RegR', primary_key=True, serialize=False, unique=True)),
+                ('course_offering_ids', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('result_messages', models.JSONField(blank=True, default=list)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('student_record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_requests', to='Academics.studentacademicrecord')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='Academics_r_status_579024_idx'), models.Index(fields=['student_record', 'status'], name='Academics_r_student_9b475b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0005_registrationrequest'),
+        ('Users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptEntry',
+            fields=[
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='transcript_entry', serialize=False, to='Academics.enrollment')),
+                ('academic_year', models.CharField(max_length=20)),
+                ('semester', models.CharField(max_length=10)),
+                ('period_start_date', models.DateField()),
+                ('semester_number', models.PositiveIntegerField()),
+                ('course_code', models.CharField(max_length=20)),
+                ('course_name', models.CharField(max_length=100)),
+                ('credit_hours', models.PositiveIntegerField()),
+                ('section_name', models.CharField(max_length=100)),
+                ('registration_date', models.DateTimeField()),
+                ('is_retake', models.BooleanField(default=False)),
+                ('academic_period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transcript_entries', to='Academics.academicperiod')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transcript_entries', to='Academics.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transcript_entries', to='Users.student')),
+                ('student_record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transcript_entries', to='Academics.studentacademicrecord')),
+            ],
+            options={
+                'ordering': ['period_start_date', 'course_code'],
+                'indexes': [models.Index(fields=['student', 'period_start_date'], name='Academics_t_student_7fe61a_idx'), models.Index(fields=['student', 'course'], name='Academics_t_student_50f528_idx')],
+            },
+        ),
+    ]
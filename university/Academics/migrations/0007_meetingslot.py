@@ -0,0 +1,32 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:15
+
+import django.db.models.deletion
+import shortuuid.django_fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0006_transcriptentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingSlot',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('slot_id', shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='MeSl', primary_key=True, serialize=False, unique=True)),
+                ('day_of_week', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('room', models.CharField(blank=True, db_index=True, max_length=50)),
+                ('section_course_offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meeting_slots', to='Academics.sectioncourseoffering')),
+            ],
+            options={
+                'ordering': ['day_of_week', 'start_time'],
+                'indexes': [models.Index(fields=['room', 'day_of_week'], name='Academics_m_room_afdb6a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:42
+
+import shortuuid.django_fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0007_meetingslot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='courseoffering',
+            name='offering_id',
+            field=shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='CoOf', primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='enrollment_id',
+            field=shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='Enro', primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='section',
+            name='section_id',
+            field=shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=12, prefix='Sec', primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='studentacademicrecord',
+            name='record_id',
+            field=shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='StAc', primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='teacherassignment',
+            name='assignment_id',
+            field=shortuuid.django_fields.ShortUUIDField(alphabet='1234567890', length=9, max_length=13, prefix='TeAs', primary_key=True, serialize=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:46
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fail_duplicate_tickets(apps, schema_editor):
+    # Keep the oldest unfinished ticket of each record, like enqueue would have.
+    RegistrationRequest = apps.get_model('Academics', 'RegistrationRequest')
+    seen = set()
+    duplicates = []
+    for request_id, record_id in RegistrationRequest.objects.filter(
+        status__in=['pending', 'processing']
+    ).order_by('created_at').values_list('request_id', 'student_record_id'):
+        if record_id in seen:
+            duplicates.append(request_id)
+        seen.add(record_id)
+    RegistrationRequest.objects.filter(pk__in=duplicates).update(
+        status='failed',
+        result_messages=["Replaced by an earlier registration request."],
+        processed_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Academics', '0008_widen_short_uuid_primary_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_tickets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='registrationrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'processing'])), fields=('student_record',), name='one_unfinished_registration_per_record'),
+        ),
+    ]
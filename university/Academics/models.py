@@ -1,9 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from shortuuid.django_fields import ShortUUIDField
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Q, Count
+from django.db.models import Q, Count, F, Sum
 
 class BaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -41,6 +41,7 @@ class AcademicPeriod(BaseModel):
         ordering = ['academic_year', 'semester']
         indexes = [
             models.Index(fields=['academic_year', 'semester']),
+            models.Index(fields=['start_date']),
         ]
 
 class Course(BaseModel):
@@ -54,6 +55,12 @@ class Course(BaseModel):
     def __str__(self):
         return f"{self.course_code} - {self.course_name}"
 
+    def clean(self):
+        if self.prerequisite_id:
+            from .prerequisites import PrerequisiteGraph
+            if PrerequisiteGraph.load().would_create_cycle(self.pk, self.prerequisite_id):
+                raise ValidationError({'prerequisite': _('A course cannot require itself, directly or through its prerequisites.')})
+
     def get_departments(self):
         return Department.objects.filter(courses__course=self)
 
@@ -93,7 +100,7 @@ class CourseDepartment(BaseModel):
         return self.course_offerings.all()
 
 class CourseOffering(BaseModel):
-    offering_id = ShortUUIDField(unique=True, length=9, max_length=10, prefix="CoOf", alphabet="1234567890", primary_key=True)
+    offering_id = ShortUUIDField(unique=True, length=9, prefix="CoOf", alphabet="1234567890", primary_key=True)
     course_department = models.ForeignKey(CourseDepartment, on_delete=models.CASCADE, related_name='course_offerings')
     academic_period = models.ForeignKey(AcademicPeriod, on_delete=models.CASCADE, related_name='course_offerings')
     semester_number = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(12)])
@@ -116,10 +123,23 @@ class CourseOffering(BaseModel):
     def get_sections(self):
         return self.sections.all()
 
+    @staticmethod
+    def invalidate_cohort_catalog(course_offerings):
+        """Drop the cached catalog of the cohorts these offerings belong to."""
+        from .catalog import invalidate_cohort_catalog
+
+        cohorts = {
+            (offering.course_department.department_id, offering.academic_period_id, offering.semester_number)
+            for offering in course_offerings
+        }
+        for cohort in cohorts:
+            invalidate_cohort_catalog(*cohort)
+
 class Section(BaseModel):
-    section_id = ShortUUIDField(unique=True, length=9, max_length=10, prefix="Sec", alphabet="1234567890", primary_key=True)
+    section_id = ShortUUIDField(unique=True, length=9, prefix="Sec", alphabet="1234567890", primary_key=True)
     section_name = models.CharField(max_length=20)
     max_students = models.PositiveIntegerField(validators=[MaxValueValidator(30)])
+    enrolled_count = models.PositiveIntegerField(default=0, editable=False)
     course_offerings = models.ManyToManyField(CourseOffering, through='SectionCourseOffering', related_name='sections')
 
     def __str__(self):
@@ -135,7 +155,63 @@ class Section(BaseModel):
         return Enrollment.objects.filter(section_course_offering__section=self)
 
     def get_unique_student_count(self):
-        return self.get_enrollments().values('student_record').distinct().count()
+        return self.enrolled_count
+
+    def has_free_seat(self):
+        return self.enrolled_count < self.max_students
+
+    @classmethod
+    def get_enrolled_counts(cls, section_ids=None):
+        """
+        Count the distinct students enrolled in each section from Enrollment.
+
+        Args:
+            section_ids (list, optional): Restrict the count to these sections.
+
+        Returns:
+            dict: Mapping of section ID to number of enrolled students.
+        """
+        enrollments = Enrollment.objects.all()
+        if section_ids is not None:
+            enrollments = enrollments.filter(section_course_offering__section__in=section_ids)
+        return dict(enrollments.values_list('section_course_offering__section').annotate(
+            student_count=Count('student_record', distinct=True)
+        ).order_by())
+
+    @classmethod
+    def claim_seat(cls, section_id):
+        """
+        Atomically take one seat in the section if it is not full.
+
+        Returns:
+            bool: True if the seat was taken.
+        """
+        return cls.objects.filter(
+            pk=section_id,
+            enrolled_count__lt=F('max_students')
+        ).update(enrolled_count=F('enrolled_count') + 1) == 1
+
+    @classmethod
+    def release_seat(cls, section_id):
+        cls.objects.filter(
+            pk=section_id,
+            enrolled_count__gt=0
+        ).update(enrolled_count=F('enrolled_count') - 1)
+
+    @classmethod
+    def recount_seats(cls, section_id):
+        """
+        Set enrolled_count to the number of students enrolled in the section.
+
+        The section row is locked before counting, so seats claimed or
+        released by other transactions are either counted already or wait
+        until this transaction ends.
+        """
+        with transaction.atomic():
+            if cls.objects.select_for_update().filter(pk=section_id).values_list('pk', flat=True):
+                cls.objects.filter(pk=section_id).update(
+                    enrolled_count=cls.get_enrolled_counts([section_id]).get(section_id, 0)
+                )
 
     def get_semester_year_info(self):
         course_offering = self.section_course_offerings.first().course_offering
@@ -143,34 +219,62 @@ class Section(BaseModel):
 
     @classmethod
     def create_or_get_section(cls, course_offerings):
-        academic_period = course_offerings[0].academic_period
-        semester_number = course_offerings[0].semester_number
-
-        sections = cls.objects.filter(
-            section_course_offerings__course_offering__in=course_offerings
-        ).annotate(
-            course_count=Count('section_course_offerings')
-        ).filter(course_count=len(course_offerings))
+        """
+        Reserve a seat for one student in a section of the cohort.
 
-        for section in sections:
-            enrolled_student_count = Enrollment.objects.filter(
-                section_course_offering__section=section,
-                section_course_offering__course_offering__academic_period=academic_period,
-                section_course_offering__course_offering__semester_number=semester_number
-            ).values('student_record').distinct().count()
+        Seats are tracked in the enrolled_count column and taken with a
+        conditional UPDATE, so a section can never go past max_students.
+        The cohort's course offering rows are also locked with
+        SELECT ... FOR UPDATE, so concurrent registrations for the same
+        department, period and semester are serialised and a new section name
+        is never minted twice. Call this inside the transaction that writes the
+        student's enrollments; the seat and the lock are then tied to that
+        transaction.
 
-            if enrolled_student_count < section.max_students:
-                return section
+        Args:
+            course_offerings (list): CourseOffering objects the section must carry.
 
+        Returns:
+            Section: The section in which the seat was reserved.
+        """
+        academic_period = course_offerings[0].academic_period
+        semester_number = course_offerings[0].semester_number
         department = course_offerings[0].course_department.department
-        new_section_name = f"{department.department_name[:3]}-{sections.count() + 1}sem({semester_number})"
-        new_section = cls.objects.create(
-            section_name=new_section_name,
-            max_students=30
-        )
-        
-        for course_offering in course_offerings:
-            SectionCourseOffering.objects.create(section=new_section, course_offering=course_offering)
+
+        with transaction.atomic():
+            cohort_offering_ids = list(CourseOffering.objects.select_for_update(of=('self',)).filter(
+                course_department__department=department,
+                academic_period=academic_period,
+                semester_number=semester_number
+            ).order_by('pk').values_list('pk', flat=True))
+
+            sections = cls.objects.filter(
+                section_course_offerings__course_offering__in=course_offerings,
+                enrolled_count__lt=F('max_students')
+            ).annotate(
+                course_count=Count('section_course_offerings')
+            ).filter(course_count=len(course_offerings)).order_by('created_at')
+
+            for section in sections:
+                if cls.claim_seat(section.pk):
+                    section.enrolled_count += 1
+                    return section
+
+            cohort_section_count = cls.objects.filter(
+                section_course_offerings__course_offering__in=cohort_offering_ids
+            ).distinct().count()
+            new_section_name = f"{department.department_name[:3]}-{cohort_section_count + 1}sem({semester_number})"
+            new_section = cls.objects.create(
+                section_name=new_section_name,
+                max_students=30,
+                enrolled_count=1
+            )
+
+            SectionCourseOffering.objects.bulk_create([
+                SectionCourseOffering(section=new_section, course_offering=course_offering)
+                for course_offering in course_offerings
+            ])
+            CourseOffering.invalidate_cohort_catalog(course_offerings)
 
         return new_section
 
@@ -189,6 +293,41 @@ class SectionCourseOffering(BaseModel):
     def __str__(self):
         return f"{self.section} - {self.course_offering}"
 
+class MeetingSlot(BaseModel):
+    DAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday')
+    ]
+    slot_id = ShortUUIDField(unique=True, length=9, prefix="MeSl", alphabet="1234567890", primary_key=True)
+    section_course_offering = models.ForeignKey('SectionCourseOffering', on_delete=models.CASCADE, related_name='meeting_slots')
+    day_of_week = models.PositiveSmallIntegerField(choices=DAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    room = models.CharField(max_length=50, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ['day_of_week', 'start_time']
+        indexes = [
+            models.Index(fields=['room', 'day_of_week']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_day_of_week_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M} {self.room}".strip()
+
+    def clean(self):
+        if self.start_time and self.end_time and self.start_time >= self.end_time:
+            raise ValidationError(_('Start time must be before end time.'))
+        if self.room and self.section_course_offering_id and self.start_time and self.end_time:
+            from .timetable import find_room_clash
+            clash = find_room_clash(self)
+            if clash:
+                raise ValidationError({'room': _('%(room)s is already booked for %(slot)s.') % {'room': self.room, 'slot': clash}})
+
 class AcademicStatus(BaseModel):
     STATUS_CHOICES = [
         ('enrolled', 'Enrolled'),
@@ -206,7 +345,7 @@ class AcademicStatus(BaseModel):
         return self.student_records.all()
 
 class TeacherAssignment(BaseModel):
-    assignment_id = ShortUUIDField(unique=True, length=9, max_length=10, prefix="TeAs", alphabet="1234567890", primary_key=True)
+    assignment_id = ShortUUIDField(unique=True, length=9, prefix="TeAs", alphabet="1234567890", primary_key=True)
     teacher = models.ForeignKey('Users.Teacher', on_delete=models.CASCADE, related_name='assignments')
     section_course_offering = models.ForeignKey(SectionCourseOffering, on_delete=models.CASCADE, related_name='teacher_assignments')
 
@@ -219,6 +358,18 @@ class TeacherAssignment(BaseModel):
     def __str__(self):
         return f"{self.teacher} - {self.section_course_offering}"
 
+    def clean(self):
+        if self.teacher_id and self.section_course_offering_id:
+            from .timetable import find_teacher_clashes
+            clashes = find_teacher_clashes(self.teacher_id, [self.section_course_offering_id], exclude=self.pk)
+            if clashes:
+                raise ValidationError(
+                    _('%(teacher)s is already teaching %(courses)s at the same time.') % {
+                        'teacher': self.teacher,
+                        'courses': ', '.join(sorted({busy for _new, busy in clashes}))
+                    }
+                )
+
     def get_teacher(self):
         return self.teacher
 
@@ -226,7 +377,7 @@ class TeacherAssignment(BaseModel):
         return self.section_course_offering
 
 class StudentAcademicRecord(BaseModel):
-    record_id = ShortUUIDField(unique=True, length=9, max_length=10, prefix="StAc", alphabet="1234567890", primary_key=True)
+    record_id = ShortUUIDField(unique=True, length=9, prefix="StAc", alphabet="1234567890", primary_key=True)
     student = models.ForeignKey('Users.Student', on_delete=models.CASCADE, related_name='academic_records')
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='student_records')
     academic_period = models.ForeignKey(AcademicPeriod, on_delete=models.CASCADE, related_name='student_records')
@@ -245,6 +396,40 @@ class StudentAcademicRecord(BaseModel):
     def __str__(self):
         return f"{self.student} - {self.department} - {self.academic_period}"
 
+    @classmethod
+    def get_current_record(cls, student):
+        """
+        Get the student's current record for the current academic period.
+
+        Args:
+            student (Student): The student whose record to look up.
+
+        Returns:
+            StudentAcademicRecord: The current record, or None if there is none.
+        """
+        from .periods import get_current_academic_period
+
+        return cls.objects.select_related(
+            'department', 'academic_status', 'academic_period'
+        ).filter(
+            student=student,
+            academic_period=get_current_academic_period(),
+            is_current=True
+        ).first()
+
+    @classmethod
+    async def aget_current_record(cls, student):
+        """Async version of get_current_record()."""
+        from .periods import aget_current_academic_period
+
+        return await cls.objects.select_related(
+            'department', 'academic_status', 'academic_period'
+        ).filter(
+            student=student,
+            academic_period=await aget_current_academic_period(),
+            is_current=True
+        ).afirst()
+
     def get_student(self):
         return self.student
 
@@ -260,44 +445,109 @@ class StudentAcademicRecord(BaseModel):
     def get_enrollments(self):
         return self.enrollments.all()
 
-    def enroll_in_courses(self, course_offerings):
+    def enroll_in_courses(self, course_offerings, check_prerequisites=True):
         """
         Enroll the student in multiple course offerings if they are eligible.
-        
+
+        The section is resolved once and the SectionCourseOffering and
+        Enrollment rows are written with bulk inserts inside one transaction,
+        so the number of queries does not grow with the number of offerings.
+        Enrollments in a course the student took in an earlier period are
+        flagged as retakes, and offerings whose meeting slots overlap are
+        rejected.
+
         Args:
             course_offerings (list): List of CourseOffering objects to enroll in.
-        
+            check_prerequisites (bool): Reject offerings whose course
+                prerequisites the student has not completed.
+
         Returns:
             list: List of created Enrollment objects if successful.
-        
+
         Raises:
             ValidationError: If the student is not eligible for enrollment.
         """
-        existing_enrollment = Enrollment.objects.filter(
-            student_record=self,
-            section_course_offering__course_offering__academic_period=self.academic_period,
-            section_course_offering__course_offering__semester_number=self.semester_number
-        ).first()
+        if not course_offerings:
+            return []
+
+        if check_prerequisites:
+            from .prerequisites import describe_missing, find_prerequisite_failures
+            failures = find_prerequisite_failures([self], course_offerings).get(self.pk)
+            if failures:
+                raise ValidationError([
+                    describe_missing(course_offering, failures[course_offering.pk])
+                    for course_offering in course_offerings
+                    if course_offering.pk in failures
+                ])
+
+        with transaction.atomic():
+            existing_enrollment = Enrollment.objects.filter(
+                student_record=self,
+                section_course_offering__course_offering__academic_period=self.academic_period,
+                section_course_offering__course_offering__semester_number=self.semester_number
+            ).select_related('section_course_offering__section').first()
 
-        if existing_enrollment:
-            section = existing_enrollment.section_course_offering.section
-        else:
-            section = Section.create_or_get_section(course_offerings)
+            if existing_enrollment:
+                section = existing_enrollment.section_course_offering.section
+            else:
+                section = Section.create_or_get_section(course_offerings)
 
-        enrollments = []
-        for course_offering in course_offerings:
-            section_course_offering, _ = SectionCourseOffering.objects.get_or_create(
+            linked_offering_ids = set(SectionCourseOffering.objects.filter(
                 section=section,
-                course_offering=course_offering
-            )
-            enrollment, created = Enrollment.objects.get_or_create(
-                student_record=self,
-                section_course_offering=section_course_offering
-            )
-            if created:
-                enrollments.append(enrollment)
+                course_offering__in=course_offerings
+            ).values_list('course_offering_id', flat=True))
+            unlinked_offerings = [
+                course_offering for course_offering in course_offerings
+                if course_offering.pk not in linked_offering_ids
+            ]
+            if unlinked_offerings:
+                SectionCourseOffering.objects.bulk_create(
+                    [
+                        SectionCourseOffering(section=section, course_offering=course_offering)
+                        for course_offering in unlinked_offerings
+                    ],
+                    ignore_conflicts=True
+                )
+                CourseOffering.invalidate_cohort_catalog(unlinked_offerings)
+
+            section_course_offerings = list(SectionCourseOffering.objects.filter(
+                section=section,
+                course_offering__in=course_offerings
+            ))
 
-        return enrollments
+            enrolled_ids = set(Enrollment.objects.filter(
+                student_record=self,
+                section_course_offering__in=section_course_offerings
+            ).values_list('section_course_offering_id', flat=True))
+
+            from .timetable import find_student_clashes
+            clashes = find_student_clashes(self, [
+                section_course_offering.pk for section_course_offering in section_course_offerings
+                if section_course_offering.pk not in enrolled_ids
+            ])
+            if clashes:
+                raise ValidationError([f"{first} clashes with {second}." for first, second in clashes])
+
+            from .retakes import find_retakes
+            retakes = find_retakes([(self, course_offering) for course_offering in course_offerings])
+
+            enrollments = Enrollment.objects.bulk_create([
+                Enrollment(
+                    student_record=self,
+                    section_course_offering=section_course_offering,
+                    is_retake=(self.pk, section_course_offering.course_offering_id) in retakes
+                )
+                for section_course_offering in section_course_offerings
+                if section_course_offering.pk not in enrolled_ids
+            ])
+
+            from .transcripts import record_enrollments
+            record_enrollments([enrollment.pk for enrollment in enrollments])
+
+            if enrollments:
+                from .signals import enrollments_created
+                enrollments_created.send(sender=Enrollment, student_records=[self])
+            return enrollments
 
     def get_compatible_courses(self):
         """
@@ -317,28 +567,82 @@ class StudentAcademicRecord(BaseModel):
             'academic_period'
         ).prefetch_related('sections')
 
+    def get_course_catalog(self):
+        """
+        Get the cached list of course offerings compatible with this record.
+
+        Same offerings as get_compatible_courses, shared through the cache by
+        every student of the department, academic period and semester.
+
+        Returns:
+            list: CourseOffering objects with course, department and sections loaded.
+        """
+        from .catalog import get_cohort_catalog
+
+        return get_cohort_catalog(self.department_id, self.academic_period_id, self.semester_number)
+
+    async def aget_course_catalog(self):
+        """Async version of get_course_catalog()."""
+        from .catalog import aget_cohort_catalog
+
+        return await aget_cohort_catalog(self.department_id, self.academic_period_id, self.semester_number)
+
     def batch_enroll(self, course_offering_ids):
         """
         Enroll the student in multiple course offerings.
 
+        All offerings are fetched with one query, checked against the
+        prerequisite graph with one more, and the eligible ones are enrolled
+        together through enroll_in_courses. If that fails, e.g. because two
+        offerings clash, they are enrolled one at a time instead, so every
+        offering that can be taken still is and the others get an error
+        message each.
+
         Args:
             course_offering_ids (list): List of CourseOffering IDs to enroll in.
+                Repeated IDs count once.
 
         Returns:
-            tuple: (success_count, error_messages)
+            tuple: (success_count, error_messages), success_count being the
+                number of distinct offerings the student is now enrolled in.
         """
-        success_count = 0
+        course_offering_ids = list(dict.fromkeys(course_offering_ids))
         error_messages = []
 
-        for offering_id in course_offering_ids:
-            try:
-                course_offering = CourseOffering.objects.get(offering_id=offering_id)
-                self.enroll_in_courses([course_offering])
-                success_count += 1
-            except (CourseOffering.DoesNotExist, ValidationError) as e:
-                error_messages.append(str(e))
+        offerings = CourseOffering.objects.select_related(
+            'course_department__course',
+            'course_department__department',
+            'academic_period'
+        ).in_bulk(course_offering_ids)
 
-        return success_count, error_messages
+        from .prerequisites import describe_missing, find_prerequisite_failures
+        failures = find_prerequisite_failures([self], list(offerings.values())).get(self.pk, {})
+
+        course_offerings = []
+        for offering_id in course_offering_ids:
+            course_offering = offerings.get(offering_id)
+            if course_offering is None:
+                error_messages.append("CourseOffering matching query does not exist.")
+                continue
+            if course_offering.pk in failures:
+                error_messages.append(describe_missing(course_offering, failures[course_offering.pk]))
+                continue
+            course_offerings.append(course_offering)
+
+        try:
+            self.enroll_in_courses(course_offerings, check_prerequisites=False)
+        except ValidationError:
+            success_count = 0
+            for course_offering in course_offerings:
+                try:
+                    self.enroll_in_courses([course_offering], check_prerequisites=False)
+                except ValidationError as e:
+                    error_messages.extend(e.messages)
+                else:
+                    success_count += 1
+            return success_count, error_messages
+
+        return len(course_offerings), error_messages
 
     def get_enrolled_course_ids(self):
         """
@@ -353,7 +657,7 @@ class StudentAcademicRecord(BaseModel):
         ).values_list('section_course_offering__course_offering_id', flat=True)
 
 class Enrollment(BaseModel):
-    enrollment_id = ShortUUIDField(unique=True, length=9, max_length=10, prefix="Enro", alphabet="1234567890", primary_key=True)
+    enrollment_id = ShortUUIDField(unique=True, length=9, prefix="Enro", alphabet="1234567890", primary_key=True)
     student_record = models.ForeignKey(StudentAcademicRecord, on_delete=models.CASCADE, related_name='enrollments')
     section_course_offering = models.ForeignKey(SectionCourseOffering, on_delete=models.CASCADE, related_name='enrollments')
     registration_date = models.DateTimeField(auto_now_add=True)
@@ -374,6 +678,105 @@ class Enrollment(BaseModel):
 
     def get_section_offering(self):
         return self.section_course_offering
-  
- 
- 
\ No newline at end of file
+
+class RegistrationRequest(BaseModel):
+    """A queued course registration, processed by run_enrollment_workers."""
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (PROCESSING, 'Processing'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed')
+    ]
+    request_id = ShortUUIDField(unique=True, length=9, prefix="RegR", alphabet="1234567890", primary_key=True)
+    student_record = models.ForeignKey(StudentAcademicRecord, on_delete=models.CASCADE, related_name='registration_requests')
+    course_offering_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    success_count = models.PositiveIntegerField(default=0)
+    result_messages = models.JSONField(default=list, blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['student_record', 'status']),
+        ]
+        constraints = [
+            # enqueue relies on this to never give a student two unfinished tickets.
+            models.UniqueConstraint(
+                fields=['student_record'],
+                condition=models.Q(status__in=['pending', 'processing']),
+                name='one_unfinished_registration_per_record'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.request_id} ({self.status}) for {self.student_record_id}"
+
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+class TranscriptEntry(models.Model):
+    """
+    One row per course attempt, denormalized from Enrollment for transcripts.
+
+    Maintained by Academics.transcripts; rebuild with `manage.py rebuild_transcripts`.
+    """
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, primary_key=True, related_name='transcript_entry')
+    student = models.ForeignKey('Users.Student', on_delete=models.CASCADE, related_name='transcript_entries')
+    student_record = models.ForeignKey(StudentAcademicRecord, on_delete=models.CASCADE, related_name='transcript_entries')
+    academic_period = models.ForeignKey(AcademicPeriod, on_delete=models.CASCADE, related_name='transcript_entries')
+    academic_year = models.CharField(max_length=20)
+    semester = models.CharField(max_length=10)
+    period_start_date = models.DateField()
+    semester_number = models.PositiveIntegerField()
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='transcript_entries')
+    course_code = models.CharField(max_length=20)
+    course_name = models.CharField(max_length=100)
+    credit_hours = models.PositiveIntegerField()
+    section_name = models.CharField(max_length=100)
+    registration_date = models.DateTimeField()
+    is_retake = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['period_start_date', 'course_code']
+        indexes = [
+            models.Index(fields=['student', 'period_start_date']),
+            models.Index(fields=['student', 'course']),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} {self.course_code} ({self.semester} {self.academic_year})"
+
+    @classmethod
+    def get_transcript(cls, student):
+        """
+        Get every course attempt of a student, oldest period first.
+
+        Args:
+            student (Student): The student.
+
+        Returns:
+            QuerySet: TranscriptEntry objects, read from one indexed table.
+        """
+        return cls.objects.filter(student=student).order_by('period_start_date', 'course_code')
+
+    @classmethod
+    def get_total_credit_hours(cls, student):
+        """
+        Get the credit hours a student has attempted, not counting retakes.
+
+        Args:
+            student (Student): The student.
+
+        Returns:
+            int: Sum of credit hours over first attempts.
+        """
+        return cls.objects.filter(
+            student=student, is_retake=False
+        ).aggregate(total=Sum('credit_hours'))['total'] or 0
@@ -0,0 +1,98 @@
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import AcademicPeriod
+from .utils import cache_timeout
+
+CACHE_KEY = 'academics:academic_periods'
+CACHE_TIMEOUT = 60 * 60
+LOCAL_TIMEOUT = 60
+
+_local_periods = None
+_local_expires_at = 0
+
+
+def _get_local_periods():
+    if _local_periods is not None and time.monotonic() < _local_expires_at:
+        return _local_periods
+    return None
+
+
+def _set_local_periods(periods):
+    global _local_periods, _local_expires_at
+    _local_periods = periods
+    _local_expires_at = time.monotonic() + LOCAL_TIMEOUT
+
+
+def _pick_current(periods, today):
+    if not periods:
+        return None
+
+    today = today or timezone.localdate()
+    for period in periods:
+        if today <= period.end_date:
+            return period
+    return periods[-1]
+
+
+def get_academic_periods():
+    """
+    Return every AcademicPeriod ordered by start date.
+
+    The list is kept in process memory for LOCAL_TIMEOUT seconds and in the
+    cache until an AcademicPeriod is saved or deleted (see
+    Academics.utils.cache_timeout() for caches that are not shared), so most
+    calls never reach the database.
+    """
+    periods = _get_local_periods()
+    if periods is not None:
+        return periods
+
+    periods = cache.get(CACHE_KEY)
+    if periods is None:
+        periods = list(AcademicPeriod.objects.order_by('start_date'))
+        cache.set(CACHE_KEY, periods, cache_timeout(CACHE_TIMEOUT))
+
+    _set_local_periods(periods)
+    return periods
+
+
+async def aget_academic_periods():
+    """Async version of get_academic_periods()."""
+    periods = _get_local_periods()
+    if periods is not None:
+        return periods
+
+    periods = await cache.aget(CACHE_KEY)
+    if periods is None:
+        periods = [period async for period in AcademicPeriod.objects.order_by('start_date')]
+        await cache.aset(CACHE_KEY, periods, cache_timeout(CACHE_TIMEOUT))
+
+    _set_local_periods(periods)
+    return periods
+
+
+def get_current_academic_period(today=None):
+    """
+    Return the academic period in effect on ``today``.
+
+    That is the period running on that date or, between terms, the next one
+    to start. Once the last known period has ended it stays current. The
+    answer is computed from the cached period list, so it moves across
+    start/end date boundaries without a query.
+    """
+    return _pick_current(get_academic_periods(), today)
+
+
+async def aget_current_academic_period(today=None):
+    """Async version of get_current_academic_period()."""
+    return _pick_current(await aget_academic_periods(), today)
+
+
+def invalidate_academic_periods():
+    """Drop the cached period list in this process and in the shared cache."""
+    global _local_periods
+    _local_periods = None
+    cache.delete(CACHE_KEY)
@@ -0,0 +1,214 @@
+import logging
+import time
+
+from django.core.cache import cache
+
+from .models import Course, Enrollment
+from .utils import cache_timeout
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'academics:prerequisite_graph'
+CACHE_TIMEOUT = 60 * 60 * 24
+LOCAL_TIMEOUT = 60
+
+_local_graph = None
+_local_expires_at = 0
+
+
+class PrerequisiteGraph:
+    """
+    The Course.prerequisite graph with every course's full prerequisite chain.
+
+    Each course has at most one direct prerequisite, so the transitive
+    closure of a course is a chain: its prerequisite, that course's
+    prerequisite and so on. All chains are computed in one pass over the
+    graph, and courses whose chain loops back on itself are collected in
+    ``cycles``.
+    """
+
+    def __init__(self, courses):
+        """
+        Args:
+            courses (iterable): (course_id, prerequisite_id, course_code) tuples.
+        """
+        self.prerequisites = {}
+        self.course_codes = {}
+        for course_id, prerequisite_id, course_code in courses:
+            self.prerequisites[course_id] = prerequisite_id
+            self.course_codes[course_id] = course_code
+        self.chains, self.cycles = self._build_chains()
+        if self.cycles:
+            logger.warning(
+                "Course prerequisites contain cycles: %s",
+                '; '.join(' -> '.join(self.course_codes[course_id] for course_id in cycle) for cycle in self.cycles)
+            )
+
+    @classmethod
+    def load(cls):
+        return cls(Course.objects.values_list('course_id', 'prerequisite_id', 'course_code'))
+
+    def _build_chains(self):
+        chains = {}
+        cycles = []
+        for start in self.prerequisites:
+            if start in chains:
+                continue
+
+            path = []
+            position = {}
+            node = start
+            while node is not None and node not in chains and node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = self.prerequisites.get(node)
+
+            if node is not None and node in position:
+                cycle = path[position[node]:]
+                cycles.append(tuple(cycle))
+                for index, member in enumerate(cycle):
+                    chains[member] = tuple(cycle[index + 1:] + cycle[:index])
+                path = path[:position[node]]
+
+            # Walk back along the path: each course's chain is the next
+            # course followed by that course's chain.
+            tail = () if node is None else (node,) + chains[node]
+            for member in reversed(path):
+                chains[member] = tail
+                tail = (member,) + tail
+        return chains, cycles
+
+    def get_chain(self, course_id):
+        """All prerequisites of a course, nearest first."""
+        return self.chains.get(course_id, ())
+
+    def has_prerequisites(self, course_id):
+        return bool(self.chains.get(course_id))
+
+    def get_missing(self, course_id, completed_course_ids):
+        """
+        Return the prerequisites a student still has to complete for a course.
+
+        Completing a course implies its own prerequisites were met, so the
+        chain is only followed up to the first completed course.
+
+        Returns:
+            list: Missing course IDs, nearest first; empty if eligible.
+        """
+        missing = []
+        for prerequisite_id in self.get_chain(course_id):
+            if prerequisite_id in completed_course_ids:
+                break
+            missing.append(prerequisite_id)
+        return missing
+
+    def would_create_cycle(self, course_id, prerequisite_id):
+        return prerequisite_id == course_id or course_id in self.get_chain(prerequisite_id)
+
+
+def get_prerequisite_graph():
+    """
+    Return the PrerequisiteGraph, built from one query over Course.
+
+    Like the academic period list, the graph is kept in process memory for
+    LOCAL_TIMEOUT seconds and in the cache until a Course changes (see
+    Academics.utils.cache_timeout() for caches that are not shared).
+    """
+    global _local_graph, _local_expires_at
+    if _local_graph is not None and time.monotonic() < _local_expires_at:
+        return _local_graph
+
+    graph = cache.get(CACHE_KEY)
+    if graph is None:
+        graph = PrerequisiteGraph.load()
+        cache.set(CACHE_KEY, graph, cache_timeout(CACHE_TIMEOUT))
+
+    _local_graph = graph
+    _local_expires_at = time.monotonic() + LOCAL_TIMEOUT
+    return graph
+
+
+def invalidate_prerequisite_graph():
+    """Drop the cached graph in this process and in the shared cache."""
+    global _local_graph
+    _local_graph = None
+    cache.delete(CACHE_KEY)
+
+
+def get_completed_courses(student_records):
+    """
+    Return the courses each student completed before the record's period.
+
+    A course counts as completed when the student was enrolled in it under
+    an academic record of an earlier academic period. One query covers all
+    the records.
+
+    Args:
+        student_records (list): StudentAcademicRecord objects.
+
+    Returns:
+        dict: Record ID -> set of completed Course IDs.
+    """
+    completed = {record.pk: set() for record in student_records}
+    if not student_records:
+        return completed
+
+    latest_start = max(record.academic_period.start_date for record in student_records)
+    rows = Enrollment.objects.filter(
+        student_record__student__in={record.student_id for record in student_records},
+        student_record__academic_period__start_date__lt=latest_start
+    ).values_list(
+        'student_record__student_id',
+        'student_record__academic_period__start_date',
+        'section_course_offering__course_offering__course_department__course_id'
+    ).distinct()
+
+    records_by_student = {}
+    for record in student_records:
+        records_by_student.setdefault(record.student_id, []).append(record)
+    for student_id, start_date, course_id in rows:
+        for record in records_by_student[student_id]:
+            if start_date < record.academic_period.start_date:
+                completed[record.pk].add(course_id)
+    return completed
+
+
+def find_prerequisite_failures(student_records, course_offerings):
+    """
+    Check which course offerings each student record lacks prerequisites for.
+
+    Offerings whose course has no prerequisite are skipped without touching
+    the database; otherwise one query loads the completed courses of every
+    record.
+
+    Args:
+        student_records (list): StudentAcademicRecord objects.
+        course_offerings (list): CourseOffering objects with
+            course_department loaded.
+
+    Returns:
+        dict: Record ID -> {CourseOffering ID: list of missing Course IDs},
+            containing only the records and offerings that fail.
+    """
+    graph = get_prerequisite_graph()
+    gated_offerings = [
+        course_offering for course_offering in course_offerings
+        if graph.has_prerequisites(course_offering.course_department.course_id)
+    ]
+    if not gated_offerings:
+        return {}
+
+    failures = {}
+    for record_id, completed_course_ids in get_completed_courses(student_records).items():
+        for course_offering in gated_offerings:
+            missing = graph.get_missing(course_offering.course_department.course_id, completed_course_ids)
+            if missing:
+                failures.setdefault(record_id, {})[course_offering.pk] = missing
+    return failures
+
+
+def describe_missing(course_offering, missing):
+    """Error message for an offering the student lacks prerequisites for."""
+    graph = get_prerequisite_graph()
+    codes = ', '.join(graph.course_codes.get(course_id, course_id) for course_id in missing)
+    return f"{course_offering.course_department.course.course_code} requires {codes}."
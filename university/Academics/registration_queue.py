@@ -0,0 +1,265 @@
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import RegistrationRequest
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrationQueueFull(Exception):
+    pass
+
+
+class RegistrationInProgress(Exception):
+    pass
+
+
+def is_enabled():
+    return settings.REGISTRATION_QUEUE
+
+
+def _update_unfinished(unfinished, course_offering_ids):
+    # The row lock keeps a worker from claiming the ticket mid-update.
+    with transaction.atomic():
+        ticket = unfinished.select_for_update().first()
+        if ticket is None:
+            return None
+        if ticket.status == RegistrationRequest.PROCESSING:
+            raise RegistrationInProgress(
+                "Your previous registration is being processed; submit again once it is done."
+            )
+        if ticket.course_offering_ids != course_offering_ids:
+            ticket.course_offering_ids = course_offering_ids
+            ticket.save(update_fields=['course_offering_ids', 'updated_at'])
+        return ticket
+
+
+def enqueue(student_record, course_offering_ids):
+    """
+    Queue a registration for the workers and return its ticket.
+
+    A student with a pending ticket gets that ticket back with its selection
+    replaced by course_offering_ids, so resubmitting the form while waiting
+    corrects the selection instead of piling up work. The
+    one_unfinished_registration_per_record constraint keeps this true for
+    concurrent submissions too.
+
+    Raises:
+        RegistrationInProgress: If a worker is already processing the
+            student's ticket, so the selection can no longer change.
+        RegistrationQueueFull: If REGISTRATION_QUEUE_MAX_PENDING tickets are
+            already waiting.
+    """
+    course_offering_ids = [str(offering_id) for offering_id in course_offering_ids]
+    unfinished = RegistrationRequest.objects.filter(
+        student_record=student_record,
+        status__in=(RegistrationRequest.PENDING, RegistrationRequest.PROCESSING)
+    )
+
+    ticket = _update_unfinished(unfinished, course_offering_ids)
+    if ticket:
+        return ticket
+
+    max_pending = settings.REGISTRATION_QUEUE_MAX_PENDING
+    if max_pending and RegistrationRequest.objects.filter(status=RegistrationRequest.PENDING).count() >= max_pending:
+        raise RegistrationQueueFull("Registration is very busy right now, please try again in a few minutes.")
+
+    try:
+        with transaction.atomic():
+            return RegistrationRequest.objects.create(
+                student_record=student_record,
+                course_offering_ids=course_offering_ids
+            )
+    except IntegrityError:
+        # A concurrent submission created the ticket first.
+        ticket = _update_unfinished(unfinished, course_offering_ids)
+        if ticket is None:
+            raise
+        return ticket
+
+
+def get_latest_ticket(student_record):
+    return RegistrationRequest.objects.filter(student_record=student_record).order_by('-created_at').first()
+
+
+async def aget_latest_ticket(student_record):
+    return await RegistrationRequest.objects.filter(student_record=student_record).order_by('-created_at').afirst()
+
+
+def queue_position(ticket):
+    """Number of pending tickets ahead of this one, or 0 once it is picked up."""
+    if ticket.status != RegistrationRequest.PENDING:
+        return 0
+    return RegistrationRequest.objects.filter(
+        status=RegistrationRequest.PENDING,
+        created_at__lt=ticket.created_at
+    ).count()
+
+
+async def aqueue_position(ticket):
+    if ticket.status != RegistrationRequest.PENDING:
+        return 0
+    return await RegistrationRequest.objects.filter(
+        status=RegistrationRequest.PENDING,
+        created_at__lt=ticket.created_at
+    ).acount()
+
+
+def claim_batch(worker, batch_size):
+    """
+    Claim up to batch_size pending tickets of a single cohort.
+
+    The cohort (department, academic period, semester) of the oldest pending
+    ticket is served first, so a batch competes for the same sections and the
+    tickets fill them in submission order. Rows are locked with SKIP LOCKED
+    where the database supports it; on SQLite the write transaction already
+    serializes workers.
+
+    Returns:
+        list: The claimed RegistrationRequest objects, oldest first.
+    """
+    pending = RegistrationRequest.objects.filter(
+        status=RegistrationRequest.PENDING
+    ).select_for_update(skip_locked=True, of=('self',)).order_by('created_at')
+
+    with transaction.atomic():
+        oldest = pending.select_related('student_record').first()
+        if oldest is None:
+            return []
+
+        record = oldest.student_record
+        batch = list(pending.filter(
+            student_record__department=record.department_id,
+            student_record__academic_period=record.academic_period_id,
+            student_record__semester_number=record.semester_number
+        ).select_related(
+            'student_record__department',
+            'student_record__academic_period'
+        )[:batch_size])
+
+        claimed_at = timezone.now()
+        RegistrationRequest.objects.filter(pk__in=[ticket.pk for ticket in batch]).update(
+            status=RegistrationRequest.PROCESSING,
+            worker=worker,
+            claimed_at=claimed_at
+        )
+        for ticket in batch:
+            ticket.status = RegistrationRequest.PROCESSING
+            ticket.worker = worker
+            ticket.claimed_at = claimed_at
+    return batch
+
+
+def process_batch(batch):
+    """
+    Enroll every ticket of a claimed batch and store the outcome.
+
+    The whole batch is written in one transaction, with a savepoint per
+    ticket, so the database commits once per batch instead of once per
+    student. A ticket that raises is marked failed without affecting the
+    others; an OperationalError aborts the batch so it can be retried.
+    """
+    with transaction.atomic():
+        for ticket in batch:
+            try:
+                with transaction.atomic():
+                    success_count, error_messages = ticket.student_record.batch_enroll(ticket.course_offering_ids)
+            except OperationalError:
+                # Locked or lost database: the batch goes back to the queue.
+                raise
+            except Exception:
+                logger.exception("Registration request %s failed.", ticket.pk)
+                ticket.status = RegistrationRequest.FAILED
+                ticket.success_count = 0
+                ticket.result_messages = ["Registration failed, please try again."]
+            else:
+                ticket.status = RegistrationRequest.DONE
+                ticket.success_count = success_count
+                ticket.result_messages = error_messages
+            ticket.processed_at = timezone.now()
+
+        RegistrationRequest.objects.bulk_update(
+            batch, ['status', 'success_count', 'result_messages', 'processed_at']
+        )
+
+
+def release_batch(batch):
+    """Put the tickets of a batch that could not be written back in the queue."""
+    RegistrationRequest.objects.filter(
+        pk__in=[ticket.pk for ticket in batch],
+        status=RegistrationRequest.PROCESSING
+    ).update(status=RegistrationRequest.PENDING, worker='', claimed_at=None)
+
+
+def requeue_stale(max_age):
+    """
+    Return tickets claimed more than max_age seconds ago to the queue.
+
+    Recovers the work of a worker that died in the middle of a batch.
+    """
+    return RegistrationRequest.objects.filter(
+        status=RegistrationRequest.PROCESSING,
+        claimed_at__lt=timezone.now() - timedelta(seconds=max_age)
+    ).update(status=RegistrationRequest.PENDING, worker='', claimed_at=None)
+
+
+def worker_name(index=0):
+    return f'{socket.gethostname()}:{os.getpid()}:{index}'
+
+
+def run_worker(index=0, batch_size=50, poll_interval=1.0, stale_after=300, once=False):
+    """
+    Drain the registration queue until interrupted.
+
+    Args:
+        index (int): Number of this worker in its pool, used in its name.
+        batch_size (int): Tickets claimed per batch.
+        poll_interval (float): Seconds to sleep when the queue is empty.
+        stale_after (int): Seconds after which another worker's claim is
+            considered abandoned.
+        once (bool): Return as soon as the queue is empty.
+
+    Returns:
+        int: Number of tickets processed.
+    """
+    worker = worker_name(index)
+    processed = 0
+    last_requeue = None
+    try:
+        while True:
+            close_old_connections()
+            if last_requeue is None or time.monotonic() - last_requeue > stale_after:
+                requeue_stale(stale_after)
+                last_requeue = time.monotonic()
+
+            try:
+                batch = claim_batch(worker, batch_size)
+            except DatabaseError:
+                logger.exception("Worker %s could not claim a batch.", worker)
+                time.sleep(poll_interval)
+                continue
+
+            if not batch:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            try:
+                process_batch(batch)
+            except DatabaseError:
+                logger.exception("Worker %s could not write a batch, returning it to the queue.", worker)
+                release_batch(batch)
+                time.sleep(poll_interval)
+                continue
+            processed += len(batch)
+    except KeyboardInterrupt:
+        pass
+    return processed
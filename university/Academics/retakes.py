@@ -0,0 +1,104 @@
+from django.db import transaction
+from django.db.models import Min
+
+from .models import Enrollment, TranscriptEntry
+from .signals import students_changed_in_bulk
+
+COURSE_LOOKUP = 'section_course_offering__course_offering__course_department__course_id'
+PERIOD_START_LOOKUP = 'section_course_offering__course_offering__academic_period__start_date'
+
+
+def find_retakes(pairs):
+    """
+    Determine which enrollments about to be made are retakes.
+
+    An enrollment is a retake when the student was already enrolled in the
+    same Course in an earlier academic period, under any department or
+    academic record. The first attempt of every (student, course) involved is
+    found with one aggregated query.
+
+    Args:
+        pairs (list): (StudentAcademicRecord, CourseOffering) tuples, with the
+            record's academic_period and the offering's course_department
+            loaded.
+
+    Returns:
+        set: (record ID, CourseOffering ID) of the pairs that are retakes.
+    """
+    if not pairs:
+        return set()
+
+    first_attempts = dict(
+        ((student_id, course_id), first_attempt)
+        for student_id, course_id, first_attempt in Enrollment.objects.filter(
+            student_record__student__in={record.student_id for record, _ in pairs},
+            section_course_offering__course_offering__course_department__course__in={
+                course_offering.course_department.course_id for _, course_offering in pairs
+            }
+        ).values_list(
+            'student_record__student_id', COURSE_LOOKUP
+        ).annotate(first_attempt=Min(PERIOD_START_LOOKUP)).order_by()
+    )
+
+    retakes = set()
+    for record, course_offering in pairs:
+        first_attempt = first_attempts.get((record.student_id, course_offering.course_department.course_id))
+        if first_attempt is not None and first_attempt < record.academic_period.start_date:
+            retakes.add((record.pk, course_offering.pk))
+    return retakes
+
+
+def backfill_retakes(chunk_size=500, dry_run=False):
+    """
+    Recompute Enrollment.is_retake for existing enrollments.
+
+    Students are processed in chunks of chunk_size; each chunk reads their
+    enrollments once, and only rows whose flag changes are written, together
+    with their transcript rows.
+
+    Yields:
+        tuple: (students processed, enrollments changed) after each chunk.
+    """
+    students = Enrollment.objects.values_list('student_record__student_id', flat=True).distinct().order_by(
+        'student_record__student_id'
+    )
+    last_student_id = ''
+    while True:
+        student_ids = list(students.filter(student_record__student__gt=last_student_id)[:chunk_size])
+        if not student_ids:
+            break
+        last_student_id = student_ids[-1]
+
+        rows = list(Enrollment.objects.filter(
+            student_record__student__in=student_ids
+        ).values_list(
+            'pk', 'student_record__student_id', 'student_record_id', COURSE_LOOKUP, PERIOD_START_LOOKUP, 'is_retake'
+        ))
+
+        first_attempts = {}
+        for _, student_id, _, course_id, start_date, _ in rows:
+            key = (student_id, course_id)
+            if key not in first_attempts or start_date < first_attempts[key]:
+                first_attempts[key] = start_date
+
+        now_retake = []
+        no_longer_retake = []
+        changed_records = set()
+        for enrollment_id, student_id, record_id, course_id, start_date, is_retake in rows:
+            should_be_retake = start_date > first_attempts[student_id, course_id]
+            if should_be_retake != is_retake:
+                (now_retake if should_be_retake else no_longer_retake).append(enrollment_id)
+                changed_records.add((student_id, record_id))
+
+        if not dry_run and changed_records:
+            with transaction.atomic():
+                for enrollment_ids, is_retake in ((now_retake, True), (no_longer_retake, False)):
+                    if enrollment_ids:
+                        Enrollment.objects.filter(pk__in=enrollment_ids).update(is_retake=is_retake)
+                        TranscriptEntry.objects.filter(enrollment__in=enrollment_ids).update(is_retake=is_retake)
+                students_changed_in_bulk.send(
+                    sender=Enrollment,
+                    student_ids=[student_id for student_id, _ in changed_records],
+                    student_record_ids=[record_id for _, record_id in changed_records]
+                )
+        yield len(student_ids), len(now_retake) + len(no_longer_retake)
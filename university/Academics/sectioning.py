@@ -0,0 +1,214 @@
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+
+from .models import (
+    CourseOffering,
+    Enrollment,
+    MeetingSlot,
+    Section,
+    SectionCourseOffering,
+    StudentAcademicRecord,
+)
+from .prerequisites import find_prerequisite_failures
+from .retakes import find_retakes
+from .signals import enrollments_created
+from .timetable import COURSE_CODE, TIME_FIELDS, find_group_clashes
+from .transcripts import record_enrollments
+from .utils import assign_unique_pks
+
+MAX_SECTION_SIZE = 30
+
+
+def plan_section_sizes(student_count, max_students=MAX_SECTION_SIZE):
+    """
+    Split a number of students into the fewest sections of at most
+    max_students, with sizes that differ by at most one.
+
+    Returns:
+        list: Section sizes, largest first.
+    """
+    if student_count <= 0:
+        return []
+    section_count = -(-student_count // max_students)
+    base, extra = divmod(student_count, section_count)
+    return [base + 1] * extra + [base] * (section_count - extra)
+
+
+def get_pending_records(academic_period, department, semester_number):
+    """Current records of a cohort that have no enrollment yet, in a stable order."""
+    return StudentAcademicRecord.objects.filter(
+        academic_period=academic_period,
+        department=department,
+        semester_number=semester_number,
+        is_current=True
+    ).exclude(
+        Exists(Enrollment.objects.filter(student_record=OuterRef('pk')))
+    ).select_related('academic_period', 'student__user').order_by('student__user__username', 'pk')
+
+
+class SectioningResult:
+    """What section_cohort did (or would do, in a dry run), for the report."""
+
+    def __init__(self):
+        self.sections = []
+        self.assigned = 0
+        self.enrollments = 0
+        self.prerequisite_failures = {}
+        self.clashing_sections = {}
+
+    def add_section(self, section, before, added):
+        self.sections.append({
+            'section': section.section_name,
+            'new': before is None,
+            'before': before or 0,
+            'added': added,
+            'after': (before or 0) + added,
+            'max_students': section.max_students,
+        })
+
+
+def section_cohort(academic_period, department, semester_number, max_students=MAX_SECTION_SIZE,
+                   fill_existing=True, dry_run=False):
+    """
+    Place every pending student of a cohort in a section and enroll them.
+
+    Free seats in the cohort's existing sections are used first (unless
+    fill_existing is False). The remaining students are split over the
+    fewest new sections that hold them, with balanced sizes. Sections,
+    SectionCourseOffering links, enrollments and transcript rows are then
+    written with bulk inserts in one transaction. The cohort's offerings are
+    locked like in Section.create_or_get_section, so live registrations wait
+    instead of racing the solver.
+
+    Offerings a student lacks prerequisites for are left out of that
+    student's enrollments and reported; a student eligible for none of them
+    is not placed. Existing sections whose meeting slots clash are reported
+    and get no new students, since every one of them would have the clash.
+
+    Args:
+        academic_period (AcademicPeriod): The cohort's period.
+        department (Department): The cohort's department.
+        semester_number (int): The cohort's semester.
+        max_students (int): Capacity of new sections.
+        fill_existing (bool): Top up existing sections before creating new ones.
+        dry_run (bool): Compute the plan without writing anything.
+
+    Returns:
+        SectioningResult: The sections used and the numbers written.
+    """
+    result = SectioningResult()
+    with transaction.atomic():
+        offerings = list(CourseOffering.objects.select_for_update(of=('self',)).filter(
+            course_department__department=department,
+            academic_period=academic_period,
+            semester_number=semester_number
+        ).select_related('course_department__course', 'course_department__department').order_by('pk'))
+        if not offerings:
+            return result
+
+        records = list(get_pending_records(academic_period, department, semester_number))
+        failures = find_prerequisite_failures(records, offerings)
+        result.prerequisite_failures = {
+            record.student.user.username: [
+                offering.course_department.course.course_code for offering in offerings
+                if offering.pk in failures[record.pk]
+            ]
+            for record in records if record.pk in failures
+        }
+        # Students who may take none of the offerings do not get a seat.
+        records = [record for record in records if len(failures.get(record.pk, ())) < len(offerings)]
+        if not records:
+            return result
+
+        cohort_sections = list(Section.objects.filter(
+            section_course_offerings__course_offering__in=offerings
+        ).distinct().order_by('created_at'))
+        # New sections have no meeting slots yet, so only existing ones can clash.
+        clashes = find_group_clashes(MeetingSlot.objects.filter(
+            section_course_offering__section__in=cohort_sections,
+            section_course_offering__course_offering__in=offerings
+        ).values_list('section_course_offering__section_id', COURSE_CODE, *TIME_FIELDS))
+        result.clashing_sections = {
+            section.section_name: clashes[section.pk] for section in cohort_sections if section.pk in clashes
+        }
+
+        # Existing sections first, then balanced new ones.
+        placements = []
+        remaining = len(records)
+        if fill_existing:
+            for section in cohort_sections:
+                if section.pk in clashes:
+                    continue
+                free = max(section.max_students - section.enrolled_count, 0)
+                if free and remaining:
+                    placements.append((section, section.enrolled_count, min(free, remaining)))
+                    remaining -= min(free, remaining)
+
+        new_sections = []
+        for number, size in enumerate(plan_section_sizes(remaining, max_students), start=len(cohort_sections) + 1):
+            section = Section(
+                section_name=f"{department.department_name[:3]}-{number}sem({semester_number})",
+                max_students=max_students,
+                enrolled_count=size
+            )
+            new_sections.append(section)
+            placements.append((section, None, size))
+
+        for section, before, added in placements:
+            result.add_section(section, before, added)
+        result.assigned = len(records)
+
+        if dry_run:
+            result.enrollments = sum(
+                len(offerings) - len(failures.get(record.pk, ())) for record in records
+            )
+            return result
+
+        assign_unique_pks(Section, new_sections)
+        Section.objects.bulk_create(new_sections)
+        for section, before, added in placements:
+            if before is not None:
+                Section.objects.filter(pk=section.pk).update(enrolled_count=F('enrolled_count') + added)
+
+        placed_sections = [section for section, _, _ in placements]
+        linked = set(SectionCourseOffering.objects.filter(
+            section__in=placed_sections
+        ).values_list('section_id', 'course_offering_id'))
+        links = [
+            SectionCourseOffering(section=section, course_offering=offering)
+            for section in placed_sections
+            for offering in offerings
+            if (section.pk, offering.pk) not in linked
+        ]
+        SectionCourseOffering.objects.bulk_create(links, batch_size=1000)
+        links_by_key = {
+            (section_id, offering_id): pk
+            for pk, section_id, offering_id in SectionCourseOffering.objects.filter(
+                section__in=placed_sections
+            ).values_list('pk', 'section_id', 'course_offering_id')
+        }
+
+        retakes = find_retakes([(record, offering) for record in records for offering in offerings])
+        enrollments = []
+        students = iter(records)
+        for section, _, added in placements:
+            for _ in range(added):
+                record = next(students)
+                record_failures = failures.get(record.pk, {})
+                enrollments.extend(
+                    Enrollment(
+                        student_record=record,
+                        section_course_offering_id=links_by_key[section.pk, offering.pk],
+                        is_retake=(record.pk, offering.pk) in retakes
+                    )
+                    for offering in offerings
+                    if offering.pk not in record_failures
+                )
+        assign_unique_pks(Enrollment, enrollments)
+        Enrollment.objects.bulk_create(enrollments, batch_size=1000)
+        record_enrollments([enrollment.pk for enrollment in enrollments])
+        enrollments_created.send(sender=Enrollment, student_records=records)
+        result.enrollments = len(enrollments)
+
+        CourseOffering.invalidate_cohort_catalog(offerings)
+    return result
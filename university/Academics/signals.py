@@ -0,0 +1,149 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .catalog import invalidate_catalog
+from .models import (
+    AcademicPeriod,
+    Course,
+    CourseDepartment,
+    CourseOffering,
+    Enrollment,
+    Section,
+    SectionCourseOffering,
+    TranscriptEntry,
+)
+from .periods import invalidate_academic_periods
+from .prerequisites import invalidate_prerequisite_graph
+from .transcripts import (
+    record_enrollments,
+    refresh_academic_period,
+    refresh_course,
+    refresh_course_department,
+    refresh_course_offering,
+    refresh_section,
+)
+
+# Sent with student_records=[...] after enrollments are written with
+# bulk_create, which sends no post_save.
+enrollments_created = Signal()
+
+# Sent with student_ids=[...] and student_record_ids=[...] after records,
+# enrollments or transcript rows of those students are changed with
+# bulk_create or update(), which send no post_save.
+students_changed_in_bulk = Signal()
+
+
+def send_students_changed(transcript_entries):
+    """Send students_changed_in_bulk for the students of a TranscriptEntry queryset."""
+    rows = set(transcript_entries.values_list('student_id', 'student_record_id'))
+    if rows:
+        students_changed_in_bulk.send(
+            sender=TranscriptEntry,
+            student_ids=[student_id for student_id, _ in rows],
+            student_record_ids=[record_id for _, record_id in rows]
+        )
+
+
+@receiver([post_save, post_delete], sender=AcademicPeriod)
+def academic_period_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_academic_periods)
+
+
+@receiver(post_save, sender=AcademicPeriod)
+def academic_period_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_academic_period(instance)
+        send_students_changed(TranscriptEntry.objects.filter(academic_period=instance))
+
+
+@receiver([post_save, post_delete], sender=Course)
+def course_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_prerequisite_graph)
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_course(instance)
+        send_students_changed(TranscriptEntry.objects.filter(course=instance))
+
+
+@receiver(post_save, sender=CourseDepartment)
+def course_department_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_course_department(instance)
+        send_students_changed(TranscriptEntry.objects.filter(
+            enrollment__section_course_offering__course_offering__course_department=instance
+        ))
+
+
+@receiver(post_save, sender=CourseOffering)
+def course_offering_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_course_offering(instance)
+        send_students_changed(TranscriptEntry.objects.filter(
+            enrollment__section_course_offering__course_offering=instance
+        ))
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=CourseDepartment)
+@receiver([post_save, post_delete], sender=CourseOffering)
+@receiver([post_save, post_delete], sender=SectionCourseOffering)
+def catalog_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=Section)
+def section_saved(sender, instance, created, **kwargs):
+    # A new section has no offerings yet; create_or_get_section invalidates
+    # its cohort once the offerings are linked.
+    if not created:
+        transaction.on_commit(invalidate_catalog)
+        refresh_section(instance)
+        send_students_changed(TranscriptEntry.objects.filter(enrollment__section_course_offering__section=instance))
+
+
+def _is_only_enrollment_in_section(enrollment, section_id):
+    return not Enrollment.objects.filter(
+        student_record_id=enrollment.student_record_id,
+        section_course_offering__section=section_id
+    ).exclude(pk=enrollment.pk).exists()
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, created, raw=False, **kwargs):
+    # Enrollments written by enroll_in_courses use bulk_create and reserve
+    # their seat through Section.create_or_get_section; this only covers
+    # single rows saved elsewhere, e.g. from the admin.
+    if raw:
+        return
+    record_enrollments([instance.pk])
+    if not created:
+        return
+    section_id = instance.section_course_offering.section_id
+    if _is_only_enrollment_in_section(instance, section_id):
+        Section.objects.filter(pk=section_id).update(enrolled_count=F('enrolled_count') + 1)
+
+
+@receiver(pre_delete, sender=Enrollment)
+def enrollment_deleting(sender, instance, **kwargs):
+    # The section is looked up before the delete, which may cascade from
+    # the section course offering itself.
+    try:
+        instance._section_id = instance.section_course_offering.section_id
+    except Enrollment.section_course_offering.RelatedObjectDoesNotExist:
+        instance._section_id = None
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    # A cascade or queryset delete removes every row before sending
+    # post_delete, so each of a student's enrollments in the section sees
+    # none left. The seat count is recounted rather than decremented, which
+    # gives the same answer however many of them get here.
+    section_id = getattr(instance, '_section_id', None)
+    if section_id is not None and _is_only_enrollment_in_section(instance, section_id):
+        Section.recount_seats(section_id)
@@ -1,3 +1,693 @@
-from django.test import TestCase
+import csv
+import datetime
+import itertools
+import json
+import logging
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models.query import QuerySet
+from django.db.models.sql import DeleteQuery
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from university.middleware import QueryBudgetExceeded
+from Users.models import Student, User
+
+from . import periods, prerequisites, registration_queue
+from .catalog import CATALOG_TIMEOUT, get_cohort_catalog
+from .exports import ENROLLMENT_COLUMNS, RECORD_COLUMNS
+from .management.commands.run_benchmarks import stub_templates_settings
+from .periods import get_academic_periods, invalidate_academic_periods
+from .retakes import backfill_retakes, find_retakes
+from .prerequisites import (
+    PrerequisiteGraph, get_completed_courses, get_prerequisite_graph, invalidate_prerequisite_graph
+)
+from .sectioning import section_cohort
+from .timetable import slot_mask
+from .utils import assign_unique_pks
+
+from .models import (
+    AcademicPeriod, AcademicStatus, Course, CourseDepartment, CourseOffering, Department, Enrollment, MeetingSlot,
+    RegistrationRequest, Section, StudentAcademicRecord, TranscriptEntry
+)
+
+
+def create_cohort(student_count=2, course_count=5):
+    """Create one department's first-semester offerings and records for its students."""
+    # The caches are invalidated on commit, which never comes in a TestCase.
+    cache.clear()
+    invalidate_academic_periods()
+    invalidate_prerequisite_graph()
+    today = datetime.date.today()
+    period = AcademicPeriod.objects.create(
+        academic_year='2024-2025', semester='Fall', start_date=today, end_date=today + datetime.timedelta(days=120)
+    )
+    department = Department.objects.create(department_name="Test department")
+    status, _ = AcademicStatus.objects.get_or_create(status_name='enrolled')
+    # Course keys have five digits, so a few dozen courses clash now and then.
+    courses = assign_unique_pks(Course, [
+        Course(course_name=f"Course {index}", course_code=f"TC{index}", credit_hours=3)
+        for index in range(course_count)
+    ])
+    offerings = []
+    for course in Course.objects.bulk_create(courses):
+        offerings.append(CourseOffering.objects.create(
+            course_department=CourseDepartment.objects.create(course=course, department=department),
+            academic_period=period,
+            semester_number=1
+        ))
+    records = []
+    for index in range(student_count):
+        user = User.objects.create_user(
+            email=f"student{index}@example.com", username=f"student{index}", password='x', role='Student'
+        )
+        records.append(StudentAcademicRecord.objects.create(
+            student=Student.objects.create(user=user),
+            department=department,
+            academic_period=period,
+            academic_status=status,
+            semester_number=1,
+            year=1
+        ))
+    return offerings, records
+
+
+def enroll_in_earlier_period(student_record, course_offerings):
+    """Enroll the record's student in the offerings' courses in an earlier academic period."""
+    start_date = student_record.academic_period.start_date
+    period = AcademicPeriod.objects.create(
+        academic_year='2023-2024', semester='Winter',
+        start_date=start_date - datetime.timedelta(days=200), end_date=start_date - datetime.timedelta(days=80)
+    )
+    record = StudentAcademicRecord.objects.create(
+        student=student_record.student, department=student_record.department, academic_period=period,
+        academic_status=student_record.academic_status, semester_number=1, year=1, is_current=False
+    )
+    return record.enroll_in_courses([
+        CourseOffering.objects.create(
+            course_department=course_offering.course_department, academic_period=period, semester_number=1
+        )
+        for course_offering in course_offerings
+    ], check_prerequisites=False)
+
+
+class ConcurrentSectionAllocationTests(TransactionTestCase):
+    def test_sections_stay_within_capacity(self):
+        # Raises CommandError if a section is overfilled, a seat count
+        # drifts or a section name is minted twice.
+        call_command('stress_section_allocation', students=75, threads=8, stdout=StringIO())
+
+
+class SeatCountTests(TestCase):
+    def setUp(self):
+        self.offerings, self.records = create_cohort(student_count=3)
+        for record in self.records[:2]:
+            record.enroll_in_courses(self.offerings)
+        self.section = Section.objects.get()
+
+    def assertSeatsTaken(self, count):
+        self.section.refresh_from_db()
+        self.assertEqual(self.section.enrolled_count, count)
+
+    def test_enrollments_take_one_seat_per_student(self):
+        self.assertSeatsTaken(2)
+
+    def test_deleting_one_of_several_enrollments_keeps_the_seat(self):
+        Enrollment.objects.filter(student_record=self.records[0]).first().delete()
+        self.assertSeatsTaken(2)
+
+    def test_queryset_delete_releases_one_seat(self):
+        Enrollment.objects.filter(student_record=self.records[0]).delete()
+        self.assertSeatsTaken(1)
+
+    def test_cascaded_record_delete_releases_one_seat(self):
+        self.records[0].delete()
+        self.assertSeatsTaken(1)
+
+    def test_cascaded_student_delete_releases_one_seat(self):
+        self.records[0].student.user.delete()
+        self.assertSeatsTaken(1)
+
+    def test_failed_delete_does_not_hold_the_seat(self):
+        enrollments = Enrollment.objects.filter(student_record=self.records[0])
+        with mock.patch.object(DeleteQuery, 'delete_batch', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                enrollments.delete()
+        self.assertSeatsTaken(2)
+        # Another process deletes the enrollments, then the student enrolls again.
+        transcript_entries = TranscriptEntry.objects.filter(enrollment__in=enrollments)
+        transcript_entries._raw_delete(transcript_entries.db)
+        enrollments._raw_delete(enrollments.db)
+        Section.release_seat(self.section.pk)
+        self.records[0].enroll_in_courses(self.offerings)
+        self.assertSeatsTaken(2)
+
+        enrollments.delete()
+        self.assertSeatsTaken(1)
+
+    def test_reconcile_corrects_drift(self):
+        Section.objects.update(enrolled_count=5)
+        stdout = StringIO()
+        call_command('reconcile_section_counts', dry_run=True, stdout=stdout)
+        self.assertIn(f"Tes-1sem(1) ({self.section.pk}): 5 -> 2", stdout.getvalue())
+        self.assertSeatsTaken(5)
+        call_command('reconcile_section_counts', stdout=StringIO())
+        self.assertSeatsTaken(2)
+
+    def test_reconcile_keeps_seats_taken_while_counting(self):
+        Section.objects.update(enrolled_count=5)
+        get_enrolled_counts = Section.get_enrolled_counts
+
+        def count_then_enroll(*args, **kwargs):
+            counts = get_enrolled_counts(*args, **kwargs)
+            if not self.records[2].enrollments.exists():
+                self.records[2].enroll_in_courses(self.offerings)
+            return counts
+
+        with mock.patch.object(Section, 'get_enrolled_counts', side_effect=count_then_enroll):
+            call_command('reconcile_section_counts', stdout=StringIO())
+        self.assertSeatsTaken(3)
+
+
+class QueryBudgetTests(TestCase):
+    # Enough courses that a query per course would go over every budget.
+    COURSE_COUNT = 30
+
+    def setUp(self):
+        self.offerings, records = create_cohort(course_count=self.COURSE_COUNT)
+        records[0].enroll_in_courses(self.offerings)
+        self.record = records[1]
+        self.client.force_login(self.record.student.user)
+        profiled = override_settings(
+            MIDDLEWARE=['university.middleware.QueryProfilingMiddleware'] + settings.MIDDLEWARE,
+            QUERY_BUDGET_STRICT=True,
+            TEMPLATES=stub_templates_settings()
+        )
+        profiled.enable()
+        self.addCleanup(profiled.disable)
+        logger = logging.getLogger('university.queries')
+        logger.disabled = True
+        self.addCleanup(setattr, logger, 'disabled', False)
+
+    def assertWithinBudget(self, response, view_name):
+        # The middleware raises QueryBudgetExceeded when a view goes over.
+        self.assertIn(view_name, settings.QUERY_BUDGETS)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('queries', response['Server-Timing'])
+
+    def test_dashboard(self):
+        self.assertWithinBudget(self.client.get(reverse('Users:index')), 'Users:index')
+
+    def test_course_registration(self):
+        view_name = 'Academics:course_registration'
+        self.assertWithinBudget(self.client.get(reverse(view_name)), view_name)
+        response = self.client.post(
+            reverse(view_name), {'course_offering_ids': [offering.pk for offering in self.offerings]}
+        )
+        self.assertWithinBudget(response, view_name)
+        self.assertEqual(self.record.enrollments.count(), self.COURSE_COUNT)
+
+    def test_registration_api(self):
+        view_name = 'Academics:registration_courses_api'
+        self.assertWithinBudget(self.client.get(reverse(view_name)), view_name)
+        view_name = 'Academics:registration_enroll_api'
+        response = self.client.post(
+            reverse(view_name), {'course_offering_ids': [offering.pk for offering in self.offerings]},
+            content_type='application/json'
+        )
+        self.assertWithinBudget(response, view_name)
+        self.assertEqual(response.json()['success_count'], self.COURSE_COUNT)
+
+    def test_going_over_budget_raises(self):
+        with override_settings(QUERY_BUDGETS={'Users:index': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('Users:index'))
+
+
+class RegistrationApiTests(TestCase):
+    def setUp(self):
+        _, records = create_cohort(student_count=1)
+        self.record = records[0]
+        self.client.force_login(self.record.student.user)
+
+    def test_enroll_rejects_ids_that_are_not_strings(self):
+        url = reverse('Academics:registration_enroll_api')
+        for ids in ([1, 2], [None], [['CoOf1']], [{'id': 'CoOf1'}], 'CoOf1'):
+            response = self.client.post(url, {'course_offering_ids': ids}, content_type='application/json')
+            self.assertEqual(response.status_code, 400, ids)
+        self.assertFalse(self.record.enrollments.exists())
+
+
+class RegistrationQueueTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1)
+        self.record = records[0]
+
+    def assertSelection(self, ticket, offerings):
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.course_offering_ids, [offering.pk for offering in offerings])
+
+    def test_resubmitting_updates_the_pending_ticket(self):
+        ticket = registration_queue.enqueue(self.record, [self.offerings[0].pk])
+        self.assertEqual(registration_queue.enqueue(self.record, [self.offerings[1].pk]), ticket)
+        self.assertEqual(RegistrationRequest.objects.count(), 1)
+        self.assertSelection(ticket, self.offerings[1:2])
+
+    def test_ticket_being_processed_is_not_changed(self):
+        ticket = registration_queue.enqueue(self.record, [self.offerings[0].pk])
+        RegistrationRequest.objects.update(status=RegistrationRequest.PROCESSING)
+        with self.assertRaises(registration_queue.RegistrationInProgress):
+            registration_queue.enqueue(self.record, [self.offerings[1].pk])
+        self.assertSelection(ticket, self.offerings[:1])
+
+        self.client.force_login(self.record.student.user)
+        with override_settings(REGISTRATION_QUEUE=True):
+            response = self.client.post(
+                reverse('Academics:registration_enroll_api'), {'course_offering_ids': [self.offerings[1].pk]},
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 409)
+
+    def test_concurrent_submission_updates_the_winning_ticket(self):
+        ticket = registration_queue.enqueue(self.record, [self.offerings[0].pk])
+        # As if the other submission committed after this one looked for a ticket.
+        with mock.patch.object(QuerySet, 'first', autospec=True, side_effect=[None, ticket]):
+            self.assertEqual(registration_queue.enqueue(self.record, [self.offerings[1].pk]), ticket)
+        self.assertEqual(RegistrationRequest.objects.count(), 1)
+        self.assertSelection(ticket, self.offerings[1:2])
+
+    def test_one_unfinished_ticket_per_record(self):
+        RegistrationRequest.objects.create(student_record=self.record)
+        RegistrationRequest.objects.create(student_record=self.record, status=RegistrationRequest.DONE)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            RegistrationRequest.objects.create(student_record=self.record, status=RegistrationRequest.PROCESSING)
+
+
+class TimetableTests(TestCase):
+    def test_slot_mask(self):
+        monday_nine = slot_mask(0, datetime.time(9), datetime.time(10))
+        self.assertEqual(bin(monday_nine).count('1'), 60)
+        self.assertFalse(monday_nine & slot_mask(0, datetime.time(10), datetime.time(11)))
+        self.assertTrue(monday_nine & slot_mask(0, datetime.time(9, 59), datetime.time(11)))
+        self.assertFalse(monday_nine & slot_mask(1, datetime.time(9), datetime.time(10)))
+
+    def test_inverted_slot_covers_no_time(self):
+        self.assertEqual(slot_mask(0, datetime.time(11), datetime.time(9)), 0)
+        self.assertEqual(slot_mask(0, datetime.time(9), datetime.time(9)), 0)
+
+    def test_check_timetable_reports_inverted_slots(self):
+        offerings, _ = create_cohort(student_count=0, course_count=1)
+        section = Section.objects.create(section_name="Test-1sem(1)", max_students=30)
+        link = section.section_course_offerings.create(course_offering=offerings[0])
+        MeetingSlot.objects.create(
+            section_course_offering=link, day_of_week=0, start_time=datetime.time(11), end_time=datetime.time(9)
+        )
+        stdout = StringIO()
+        with self.assertRaisesMessage(CommandError, "0 clashes and 1 invalid meeting slots"):
+            call_command('check_timetable', offerings[0].academic_period_id, stdout=stdout)
+        self.assertIn("TC0 (Test-1sem(1)): Monday 11:00-09:00 ends before it starts", stdout.getvalue())
+
+
+class SectionCohortTests(TestCase):
+    def test_sections_with_a_clash_are_not_filled(self):
+        offerings, records = create_cohort(student_count=3, course_count=2)
+        clashing = Section.objects.create(section_name="Tes-1sem(1)", max_students=30)
+        for offering, start in zip(offerings, (datetime.time(9), datetime.time(9, 30))):
+            link = clashing.section_course_offerings.create(course_offering=offering)
+            MeetingSlot.objects.create(
+                section_course_offering=link, day_of_week=0, start_time=start, end_time=datetime.time(10, 30)
+            )
+
+        result = section_cohort(offerings[0].academic_period, records[0].department, 1)
+
+        self.assertEqual(list(result.clashing_sections), ["Tes-1sem(1)"])
+        self.assertEqual([row['section'] for row in result.sections], ["Tes-2sem(1)"])
+        self.assertFalse(Enrollment.objects.filter(section_course_offering__section=clashing).exists())
+        self.assertEqual(Enrollment.objects.count(), 6)
+
+
+class GenerateUniversityDataTests(TestCase):
+    def test_prerequisites_follow_redrawn_keys(self):
+        draws = itertools.count()
+        # Every key is drawn twice, so half of the courses get a new key.
+        with mock.patch.object(Course._meta.pk, 'get_default', lambda: f"Cour{next(draws) // 2:05d}"):
+            call_command('generate_university_data', students=20, stdout=StringIO())
+        pairs = list(Course.objects.filter(prerequisite__isnull=False).values_list(
+            'course_code', 'prerequisite__course_code'
+        ))
+        self.assertTrue(pairs)
+        for course_code, prerequisite_code in pairs:
+            # Course codes end in <semester><slot:02d>; the prerequisite is
+            # the course in the same slot of the previous semester.
+            department_code, number = course_code.split('-')
+            expected = f"{department_code}-{int(number[:-2]) - 1}{number[-2:]}"
+            self.assertEqual(prerequisite_code, expected, course_code)
+
+
+class CacheTimeoutTests(TestCase):
+    def setUp(self):
+        _, records = create_cohort(student_count=1, course_count=1)
+        self.record = records[0]
+
+    def cached_timeouts(self):
+        """Load the catalog, the period list and the prerequisite graph and return {cache: timeout}."""
+        invalidate_academic_periods()
+        invalidate_prerequisite_graph()
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            get_cohort_catalog(self.record.department_id, self.record.academic_period_id, 1)
+            get_academic_periods()
+            get_prerequisite_graph()
+        return {key.split(':')[1]: timeout for key, _, timeout in (call.args for call in cache_set.call_args_list)}
+
+    @override_settings(SHARED_CACHE=True)
+    def test_shared_cache_keeps_entries_until_invalidated(self):
+        self.assertEqual(self.cached_timeouts(), {
+            'catalog': CATALOG_TIMEOUT,
+            'academic_periods': periods.CACHE_TIMEOUT,
+            'prerequisite_graph': prerequisites.CACHE_TIMEOUT,
+        })
+
+    @override_settings(SHARED_CACHE=False, UNSHARED_CACHE_TIMEOUT=60)
+    def test_per_process_cache_expires_quickly(self):
+        self.assertEqual(
+            self.cached_timeouts(), {'catalog': 60, 'academic_periods': 60, 'prerequisite_graph': 60}
+        )
+
+
+class TranscriptTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1, course_count=2)
+        self.record = records[0]
+        self.record.enroll_in_courses(self.offerings)
+        self.offering = self.offerings[0]
+
+    def get_entry(self):
+        return TranscriptEntry.objects.get(enrollment__section_course_offering__course_offering=self.offering)
+
+    def test_enrollments_are_recorded(self):
+        entry = self.get_entry()
+        self.assertEqual(entry.student_id, self.record.student_id)
+        self.assertEqual(entry.course_id, self.offering.course_department.course_id)
+        self.assertEqual(entry.academic_period_id, self.offering.academic_period_id)
+        self.assertEqual(entry.section_name, "Tes-1sem(1)")
+
+    def test_course_edit_is_copied(self):
+        course = self.offering.course_department.course
+        course.course_name = "Renamed"
+        course.save()
+        self.assertEqual(self.get_entry().course_name, "Renamed")
+
+    def test_academic_period_edit_is_copied(self):
+        period = self.offering.academic_period
+        period.academic_year = '2030-2031'
+        period.save()
+        self.assertEqual(self.get_entry().academic_year, '2030-2031')
+
+    def test_section_rename_is_copied(self):
+        section = Section.objects.get()
+        section.section_name = "Renamed"
+        section.save()
+        self.assertEqual(self.get_entry().section_name, "Renamed")
+
+    def test_course_offering_edit_is_copied(self):
+        period = AcademicPeriod.objects.create(
+            academic_year='2030-2031', semester='Winter',
+            start_date=datetime.date(2031, 1, 1), end_date=datetime.date(2031, 5, 1)
+        )
+        self.offering.academic_period = period
+        self.offering.semester_number = 2
+        self.offering.save()
+        entry = self.get_entry()
+        self.assertEqual(entry.academic_period_id, period.pk)
+        self.assertEqual((entry.academic_year, entry.semester), ('2030-2031', 'Winter'))
+        self.assertEqual(entry.semester_number, 2)
+
+    def test_course_department_edit_is_copied(self):
+        course = Course.objects.create(course_name="Other course", course_code="OC1", credit_hours=5)
+        course_department = self.offering.course_department
+        course_department.course = course
+        course_department.save()
+        entry = self.get_entry()
+        self.assertEqual(entry.course_id, course.pk)
+        self.assertEqual((entry.course_code, entry.credit_hours), ("OC1", 5))
+
+    def test_rebuild_repairs_rows(self):
+        TranscriptEntry.objects.update(course_name="Stale")
+        call_command('rebuild_transcripts', stdout=StringIO())
+        self.assertEqual(self.get_entry().course_name, self.offering.course_department.course.course_name)
+
+        TranscriptEntry.objects.filter(enrollment__section_course_offering__course_offering=self.offering).delete()
+        stdout = StringIO()
+        call_command('rebuild_transcripts', clear=True, stdout=stdout)
+        self.assertIn("Wrote 2 transcript rows", stdout.getvalue())
+        self.assertEqual(TranscriptEntry.objects.count(), 2)
+
+
+class PrerequisiteTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1, course_count=3)
+        self.record = records[0]
+        # TC0 <- TC1 <- TC2
+        self.courses = [offering.course_department.course for offering in self.offerings]
+        for course, prerequisite in zip(self.courses[1:], self.courses):
+            course.prerequisite = prerequisite
+            course.save()
+        self.course_ids = [course.pk for course in self.courses]
+        invalidate_prerequisite_graph()
+
+    def test_missing_prerequisites_follow_the_chain(self):
+        first, second, third = self.course_ids
+        graph = get_prerequisite_graph()
+        self.assertEqual(graph.get_chain(third), (second, first))
+        self.assertEqual(graph.get_missing(third, set()), [second, first])
+        self.assertEqual(graph.get_missing(third, {first}), [second])
+        # Completing a course implies its own prerequisites were met.
+        self.assertEqual(graph.get_missing(third, {second}), [])
+        self.assertEqual(graph.get_missing(first, set()), [])
+
+    def test_cycles_are_rejected(self):
+        first, second, third = self.course_ids
+        graph = get_prerequisite_graph()
+        self.assertTrue(graph.would_create_cycle(first, first))
+        self.assertTrue(graph.would_create_cycle(first, third))
+        self.assertFalse(graph.would_create_cycle(third, first))
+        self.courses[0].prerequisite = self.courses[2]
+        with self.assertRaises(ValidationError):
+            self.courses[0].clean()
+
+    def test_cycles_in_the_data_are_found(self):
+        with self.assertLogs('Academics.prerequisites', 'WARNING'):
+            graph = PrerequisiteGraph([('a', 'b', 'A'), ('b', 'a', 'B'), ('c', 'a', 'C')])
+        self.assertEqual(graph.cycles, [('a', 'b')])
+        self.assertEqual(graph.get_chain('c'), ('a', 'b'))
+
+    def test_missing_prerequisite_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "TC1 requires TC0."):
+            self.record.enroll_in_courses(self.offerings[:2])
+        self.assertFalse(self.record.enrollments.exists())
+        self.assertEqual(len(self.record.enroll_in_courses(self.offerings[:1])), 1)
+
+    def test_completed_chain_allows_enrollment(self):
+        enroll_in_earlier_period(self.record, self.offerings[1:2])
+        self.assertEqual(get_completed_courses([self.record]), {self.record.pk: {self.course_ids[1]}})
+        self.assertEqual(len(self.record.enroll_in_courses(self.offerings[2:])), 1)
+
+
+class RolloverTermTests(TestCase):
+    def setUp(self):
+        _, self.records = create_cohort(student_count=3)
+        period = self.records[0].academic_period
+        self.next_period = AcademicPeriod.objects.create(
+            academic_year='2025-2026', semester='Winter',
+            start_date=period.end_date, end_date=period.end_date + datetime.timedelta(days=120)
+        )
+
+    def rollover(self):
+        stdout = StringIO()
+        call_command('rollover_term', self.next_period.pk, stdout=stdout)
+        return stdout.getvalue()
+
+    def current_records(self):
+        return dict(StudentAcademicRecord.objects.filter(is_current=True).values_list(
+            'student_id', 'academic_period_id'
+        ))
+
+    def test_rollover(self):
+        StudentAcademicRecord.objects.filter(pk=self.records[1].pk).update(semester_number=2)
+        self.assertIn("3 records created, 3 retired", self.rollover())
+        self.assertEqual(set(self.current_records().values()), {self.next_period.pk})
+        new_records = StudentAcademicRecord.objects.filter(academic_period=self.next_period)
+        self.assertEqual(
+            sorted(new_records.values_list('semester_number', 'year')), [(2, 1), (2, 1), (3, 2)]
+        )
+        # Running it again changes nothing.
+        self.assertIn("0 records created, 0 retired", self.rollover())
+
+    def test_student_already_rolled_over_keeps_the_new_record(self):
+        record = self.records[0]
+        new_record = StudentAcademicRecord.objects.create(
+            student=record.student, department=record.department, academic_period=self.next_period,
+            academic_status=record.academic_status, semester_number=5, year=3
+        )
+        self.assertIn("2 records created, 3 retired", self.rollover())
+        self.assertEqual(
+            StudentAcademicRecord.objects.get(student=record.student, is_current=True), new_record
+        )
+
+    def test_students_with_several_current_records_are_refused(self):
+        record = self.records[0]
+        earlier_period = AcademicPeriod.objects.create(
+            academic_year='2023-2024', semester='Winter',
+            start_date=datetime.date(2024, 1, 1), end_date=datetime.date(2024, 5, 1)
+        )
+        StudentAcademicRecord.objects.create(
+            student=record.student, department=record.department, academic_period=earlier_period,
+            academic_status=record.academic_status, semester_number=1, year=1
+        )
+        with self.assertRaisesMessage(CommandError, record.student_id):
+            self.rollover()
+        self.assertFalse(StudentAcademicRecord.objects.filter(academic_period=self.next_period).exists())
+
+
+class RetakeTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1, course_count=2)
+        self.record = records[0]
+        self.first_attempt = enroll_in_earlier_period(self.record, self.offerings[:1])[0]
+
+    def retake_flags(self):
+        return dict(Enrollment.objects.values_list('pk', 'is_retake'))
+
+    def test_retaken_course_is_flagged(self):
+        self.assertEqual(
+            find_retakes([(self.record, offering) for offering in self.offerings]),
+            {(self.record.pk, self.offerings[0].pk)}
+        )
+        enrollments = self.record.enroll_in_courses(self.offerings)
+        flags = {
+            enrollment.section_course_offering.course_offering_id: enrollment.is_retake for enrollment in enrollments
+        }
+        self.assertEqual(flags, {self.offerings[0].pk: True, self.offerings[1].pk: False})
+        self.assertEqual(
+            dict(TranscriptEntry.objects.filter(student_record=self.record).values_list('course_id', 'is_retake')),
+            {self.offerings[0].course_department.course_id: True, self.offerings[1].course_department.course_id: False}
+        )
+
+    def test_first_attempt_is_not_a_retake(self):
+        self.assertFalse(self.first_attempt.is_retake)
+        self.assertEqual(find_retakes([]), set())
+
+    def test_backfill_is_idempotent(self):
+        self.record.enroll_in_courses(self.offerings)
+        expected = self.retake_flags()
+        Enrollment.objects.update(is_retake=True)
+
+        self.assertEqual(list(backfill_retakes(dry_run=True)), [(1, 2)])
+        self.assertEqual(set(self.retake_flags().values()), {True})
+
+        self.assertEqual(list(backfill_retakes()), [(1, 2)])
+        self.assertEqual(self.retake_flags(), expected)
+        self.assertEqual(
+            dict(TranscriptEntry.objects.values_list('enrollment_id', 'is_retake')), expected
+        )
+        self.assertEqual(list(backfill_retakes()), [(1, 0)])
+        self.assertEqual(self.retake_flags(), expected)
+
+
+class ExportRosterTests(TestCase):
+    def setUp(self):
+        self.offerings, self.records = create_cohort(student_count=2, course_count=2)
+        self.records[0].enroll_in_courses(self.offerings)
+        self.registrar = User.objects.create_user(
+            email="registrar@example.com", username="registrar", password='x', role='Admin'
+        )
+
+    def export(self, view_name, **params):
+        self.client.force_login(self.registrar)
+        response = self.client.get(reverse(view_name), params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_enrollments_csv(self):
+        response, content = self.export('Academics:export_enrollments')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="enrollments.csv"')
+        header, *rows = csv.reader(StringIO(content))
+        self.assertEqual(header, [name for name, _ in ENROLLMENT_COLUMNS])
+        rows = [dict(zip(header, row)) for row in rows]
+        self.assertEqual(sorted(row['course_code'] for row in rows), ['TC0', 'TC1'])
+        self.assertEqual({(row['username'], row['section'], row['is_retake']) for row in rows}, {
+            ('student0', 'Tes-1sem(1)', 'False')
+        })
+
+    def test_records_jsonl(self):
+        response, content = self.export('Academics:export_records', format='jsonl')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(sorted(row['username'] for row in rows), ['student0', 'student1'])
+        self.assertEqual(set(rows[0]), {name for name, _ in RECORD_COLUMNS})
+
+    def test_section_without_enrollments(self):
+        empty = Section.objects.create(section_name="Tes-2sem(1)", max_students=30)
+        empty.section_course_offerings.create(course_offering=self.offerings[0])
+        _, content = self.export('Academics:export_enrollments')
+        self.assertNotIn("Tes-2sem(1)", content)
+
+        self.records[0].enrollments.all().delete()
+        _, content = self.export('Academics:export_enrollments')
+        self.assertEqual(list(csv.reader(StringIO(content))), [[name for name, _ in ENROLLMENT_COLUMNS]])
+
+    def test_filters_and_bad_parameters(self):
+        _, content = self.export('Academics:export_records', semester_number=2)
+        self.assertEqual(len(content.splitlines()), 1)
+        self.client.force_login(self.registrar)
+        url = reverse('Academics:export_records')
+        self.assertEqual(self.client.get(url, {'format': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'semester_number': 'one'}).status_code, 400)
+
+    def test_only_registrars_can_export(self):
+        url = reverse('Academics:export_enrollments')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.records[0].student.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(hasattr(response, 'streaming_content'))
+
+
+class BatchEnrollTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1, course_count=3)
+        self.record = records[0]
+
+    def enrolled_offering_ids(self):
+        return set(self.record.get_enrolled_course_ids())
+
+    def test_repeated_ids_count_once(self):
+        first, second, _ = [offering.pk for offering in self.offerings]
+        self.assertEqual(self.record.batch_enroll([first, first, second, 'CoOf0']), (
+            2, ["CourseOffering matching query does not exist."]
+        ))
+        self.assertEqual(self.record.enrollments.count(), 2)
+
+    def test_offerings_that_can_be_taken_are_enrolled_when_one_clashes(self):
+        # The student already takes the first course, which clashes with the second.
+        self.record.enroll_in_courses(self.offerings[:1])
+        section = Section.objects.get()
+        first = section.section_course_offerings.get()
+        second = section.section_course_offerings.create(course_offering=self.offerings[1])
+        for link, start in ((first, datetime.time(9)), (second, datetime.time(9, 30))):
+            MeetingSlot.objects.create(
+                section_course_offering=link, day_of_week=0, start_time=start, end_time=datetime.time(10, 30)
+            )
+
+        success_count, error_messages = self.record.batch_enroll([self.offerings[1].pk, self.offerings[2].pk])
+
+        self.assertEqual(success_count, 1)
+        self.assertEqual(error_messages, ["TC0 clashes with TC1."])
+        self.assertEqual(self.enrolled_offering_ids(), {self.offerings[0].pk, self.offerings[2].pk})
@@ -0,0 +1,228 @@
+from django.db.models import F, Q
+
+from .models import MeetingSlot, SectionCourseOffering, TeacherAssignment
+
+MINUTES_PER_DAY = 24 * 60
+COURSE_CODE = 'section_course_offering__course_offering__course_department__course__course_code'
+SECTION_NAME = 'section_course_offering__section__section_name'
+TIME_FIELDS = ('day_of_week', 'start_time', 'end_time')
+
+
+def slot_mask(day_of_week, start_time, end_time):
+    """
+    Return a meeting slot as a bitset over the minutes of the week.
+
+    Bit n stands for minute n of the week (Monday 00:00 is bit 0), and the
+    end minute is excluded, so back-to-back classes do not overlap. Two
+    timetables clash exactly when the AND of their masks is non-zero.
+
+    A slot that does not end after it starts covers no minutes. MeetingSlot.clean
+    rejects those, but rows written around it must not break the checks;
+    find_invalid_slots reports them instead.
+    """
+    start = day_of_week * MINUTES_PER_DAY + start_time.hour * 60 + start_time.minute
+    end = day_of_week * MINUTES_PER_DAY + end_time.hour * 60 + end_time.minute
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def build_masks(rows):
+    """
+    Combine (key, day_of_week, start_time, end_time) rows into one mask per key.
+
+    Returns:
+        dict: Key -> mask of all the key's meeting slots.
+    """
+    masks = {}
+    for key, day_of_week, start_time, end_time in rows:
+        masks[key] = masks.get(key, 0) | slot_mask(day_of_week, start_time, end_time)
+    return masks
+
+
+def find_clashes(masks, candidates=None):
+    """
+    Return the pairs of keys whose meeting times overlap.
+
+    Each mask is tested against the union of the masks before it, so
+    timetables without a clash cost one AND per key.
+
+    Args:
+        masks (dict): Key -> mask, as returned by build_masks.
+        candidates (set): Only report pairs involving one of these keys.
+
+    Returns:
+        list: (earlier key, later key) tuples.
+    """
+    clashes = []
+    busy = 0
+    seen = []
+    for key, mask in masks.items():
+        if mask & busy:
+            clashes.extend(
+                (other, key) for other in seen
+                if masks[other] & mask and (candidates is None or key in candidates or other in candidates)
+            )
+        busy |= mask
+        seen.append(key)
+    return clashes
+
+
+def find_group_clashes(rows):
+    """
+    Find clashes inside many timetables at once, e.g. every section of a cohort.
+
+    Args:
+        rows (iterable): (group, label, day_of_week, start_time, end_time) rows.
+
+    Returns:
+        dict: Group -> list of (label, label) clashes, only for groups with clashes.
+    """
+    grouped = {}
+    for group, label, day_of_week, start_time, end_time in rows:
+        grouped.setdefault(group, []).append((label, day_of_week, start_time, end_time))
+
+    clashes = {}
+    for group, group_rows in grouped.items():
+        group_clashes = find_clashes(build_masks(group_rows))
+        if group_clashes:
+            clashes[group] = group_clashes
+    return clashes
+
+
+def find_student_clashes(student_record, section_course_offering_ids):
+    """
+    Check the offerings a student is about to join against each other and
+    against the student's current enrollments, with one query.
+
+    Returns:
+        list: (course code, course code) pairs that overlap.
+    """
+    new_ids = set(section_course_offering_ids)
+    rows = list(MeetingSlot.objects.filter(
+        Q(section_course_offering__in=new_ids) |
+        Q(section_course_offering__enrollments__student_record=student_record)
+    ).values_list('section_course_offering_id', COURSE_CODE, *TIME_FIELDS))
+    if not rows:
+        return []
+
+    labels = {sco_id: course_code for sco_id, course_code, *_ in rows}
+    masks = build_masks((sco_id, *times) for sco_id, _, *times in rows)
+    return [(labels[first], labels[second]) for first, second in find_clashes(masks, new_ids)]
+
+
+def find_teacher_clashes(teacher_id, section_course_offering_ids, exclude=None):
+    """
+    Check offerings a teacher would take on against the teacher's other
+    assignments in the same academic periods, with one query.
+
+    Args:
+        teacher_id: The teacher's ID.
+        section_course_offering_ids (list): SectionCourseOffering IDs to check.
+        exclude: A TeacherAssignment ID to leave out, e.g. the one being edited.
+
+    Returns:
+        list: (new offering, clashing offering) label pairs, labels being
+            "course code (section name)".
+    """
+    new_ids = set(section_course_offering_ids)
+    assigned = TeacherAssignment.objects.filter(
+        teacher=teacher_id,
+        section_course_offering__course_offering__academic_period__in=SectionCourseOffering.objects.filter(
+            pk__in=new_ids
+        ).values('course_offering__academic_period')
+    ).exclude(pk=exclude).values('section_course_offering')
+    rows = list(MeetingSlot.objects.filter(
+        Q(section_course_offering__in=new_ids) | Q(section_course_offering__in=assigned)
+    ).values_list('section_course_offering_id', COURSE_CODE, SECTION_NAME, *TIME_FIELDS))
+    if not rows:
+        return []
+
+    labels = {sco_id: f"{course_code} ({section_name})" for sco_id, course_code, section_name, *_ in rows}
+    masks = build_masks((sco_id, *times) for sco_id, _, _, *times in rows)
+    return [
+        (labels[second], labels[first]) if second in new_ids else (labels[first], labels[second])
+        for first, second in find_clashes(masks, new_ids)
+    ]
+
+
+def find_room_clash(meeting_slot):
+    """
+    Return another slot booked in the same room at an overlapping time in
+    the same academic period, or None.
+    """
+    mask = slot_mask(meeting_slot.day_of_week, meeting_slot.start_time, meeting_slot.end_time)
+    others = MeetingSlot.objects.filter(
+        room=meeting_slot.room,
+        day_of_week=meeting_slot.day_of_week,
+        section_course_offering__course_offering__academic_period=SectionCourseOffering.objects.filter(
+            pk=meeting_slot.section_course_offering_id
+        ).values('course_offering__academic_period')[:1]
+    ).exclude(pk=meeting_slot.pk).select_related(
+        'section_course_offering__course_offering__course_department__course'
+    )
+    for other in others:
+        if slot_mask(other.day_of_week, other.start_time, other.end_time) & mask:
+            course_code = other.section_course_offering.course_offering.course_department.course.course_code
+            return f"{course_code} ({other.get_day_of_week_display()} {other.start_time:%H:%M}-{other.end_time:%H:%M})"
+    return None
+
+
+def _get_period_slots(academic_period, department=None):
+    slots = MeetingSlot.objects.filter(section_course_offering__course_offering__academic_period=academic_period)
+    if department is not None:
+        slots = slots.filter(section_course_offering__course_offering__course_department__department=department)
+    return slots
+
+
+def find_invalid_slots(academic_period, department=None):
+    """
+    Return the meeting slots of an academic period that do not end after they start.
+
+    Returns:
+        list: "course code (section name): day start-end" labels.
+    """
+    day_names = dict(MeetingSlot.DAY_CHOICES)
+    return [
+        f"{course_code} ({section_name}): {day_names[day_of_week]} {start_time:%H:%M}-{end_time:%H:%M}"
+        for course_code, section_name, day_of_week, start_time, end_time in _get_period_slots(
+            academic_period, department
+        ).filter(end_time__lte=F('start_time')).values_list(COURSE_CODE, SECTION_NAME, *TIME_FIELDS)
+    ]
+
+
+def check_academic_period(academic_period, department=None):
+    """
+    Bulk-check a whole academic period, or one department's cohorts in it.
+
+    Sections are checked because every student of a section takes all its
+    offerings; teachers and rooms must not be in two places at once.
+
+    Returns:
+        dict: {'sections': ..., 'teachers': ..., 'rooms': ...}, each mapping a
+            section, teacher ID or room to its list of clashing pairs.
+    """
+    slots = _get_period_slots(academic_period, department)
+
+    return {
+        'sections': find_group_clashes(
+            (f"{section_name} ({section_id})", course_code, *times)
+            for section_id, section_name, course_code, *times in slots.values_list(
+                'section_course_offering__section_id', SECTION_NAME, COURSE_CODE, *TIME_FIELDS
+            )
+        ),
+        'teachers': find_group_clashes(
+            (teacher_id, f"{course_code} ({section_name})", *times)
+            for teacher_id, course_code, section_name, *times in slots.filter(
+                section_course_offering__teacher_assignments__isnull=False
+            ).values_list(
+                'section_course_offering__teacher_assignments__teacher_id', COURSE_CODE, SECTION_NAME, *TIME_FIELDS
+            )
+        ),
+        'rooms': find_group_clashes(
+            (room, f"{course_code} ({section_name})", *times)
+            for room, course_code, section_name, *times in slots.exclude(room='').values_list(
+                'room', COURSE_CODE, SECTION_NAME, *TIME_FIELDS
+            )
+        ),
+    }
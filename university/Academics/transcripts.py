@@ -0,0 +1,129 @@
+from .models import Enrollment, TranscriptEntry
+
+# TranscriptEntry field -> Enrollment lookup it is copied from.
+ENTRY_SOURCES = {
+    'enrollment_id': 'enrollment_id',
+    'student_id': 'student_record__student_id',
+    'student_record_id': 'student_record_id',
+    'academic_period_id': 'section_course_offering__course_offering__academic_period_id',
+    'academic_year': 'section_course_offering__course_offering__academic_period__academic_year',
+    'semester': 'section_course_offering__course_offering__academic_period__semester',
+    'period_start_date': 'section_course_offering__course_offering__academic_period__start_date',
+    'semester_number': 'section_course_offering__course_offering__semester_number',
+    'course_id': 'section_course_offering__course_offering__course_department__course_id',
+    'course_code': 'section_course_offering__course_offering__course_department__course__course_code',
+    'course_name': 'section_course_offering__course_offering__course_department__course__course_name',
+    'credit_hours': 'section_course_offering__course_offering__course_department__course__credit_hours',
+    'section_name': 'section_course_offering__section__section_name',
+    'registration_date': 'registration_date',
+    'is_retake': 'is_retake',
+}
+UPDATE_FIELDS = [field.removesuffix('_id') for field in ENTRY_SOURCES if field != 'enrollment_id']
+CHUNK_SIZE = 2000
+
+
+def build_entries(enrollments):
+    """Build unsaved TranscriptEntry objects for an Enrollment queryset with one query."""
+    fields = list(ENTRY_SOURCES)
+    return [
+        TranscriptEntry(**dict(zip(fields, row)))
+        for row in enrollments.values_list(*ENTRY_SOURCES.values())
+    ]
+
+
+def record_enrollments(enrollment_ids):
+    """
+    Create or refresh the transcript rows of the given enrollments.
+
+    Args:
+        enrollment_ids (list): Enrollment IDs.
+
+    Returns:
+        int: Number of rows written.
+    """
+    written = 0
+    for start in range(0, len(enrollment_ids), CHUNK_SIZE):
+        written += _write_entries(build_entries(
+            Enrollment.objects.filter(pk__in=enrollment_ids[start:start + CHUNK_SIZE])
+        ))
+    return written
+
+
+def _write_entries(entries):
+    TranscriptEntry.objects.bulk_create(
+        entries,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['enrollment'],
+        update_fields=UPDATE_FIELDS
+    )
+    return len(entries)
+
+
+def refresh_course(course):
+    TranscriptEntry.objects.filter(course=course).update(
+        course_code=course.course_code,
+        course_name=course.course_name,
+        credit_hours=course.credit_hours
+    )
+
+
+def refresh_academic_period(academic_period):
+    TranscriptEntry.objects.filter(academic_period=academic_period).update(
+        academic_year=academic_period.academic_year,
+        semester=academic_period.semester,
+        period_start_date=academic_period.start_date
+    )
+
+
+def refresh_course_offering(course_offering):
+    """Rewrite the transcript rows of the enrollments in a course offering."""
+    _refresh_enrollments(Enrollment.objects.filter(section_course_offering__course_offering=course_offering))
+
+
+def refresh_course_department(course_department):
+    """Rewrite the transcript rows of the enrollments in a course department's offerings."""
+    _refresh_enrollments(Enrollment.objects.filter(
+        section_course_offering__course_offering__course_department=course_department
+    ))
+
+
+def _refresh_enrollments(enrollments):
+    # Offerings and course departments point at the period and course a row
+    # copies, so their rows are rebuilt whole rather than field by field.
+    record_enrollments(list(enrollments.values_list('pk', flat=True)))
+
+
+def refresh_section(section):
+    TranscriptEntry.objects.filter(
+        enrollment__section_course_offering__section=section
+    ).update(section_name=section.section_name)
+
+
+def rebuild_transcripts(chunk_size=CHUNK_SIZE, student_ids=None):
+    """
+    Rewrite the transcript rows of every enrollment, chunk by chunk.
+
+    Enrollments are walked by primary key so memory use stays flat and an
+    interrupted rebuild can simply be started again.
+
+    Args:
+        chunk_size (int): Enrollments written per query.
+        student_ids (list): Only rebuild these students (default: everyone).
+
+    Returns:
+        int: Number of rows written.
+    """
+    enrollments = Enrollment.objects.order_by('pk')
+    if student_ids:
+        enrollments = enrollments.filter(student_record__student__in=student_ids)
+
+    written = 0
+    last_pk = ''
+    while True:
+        entries = build_entries(enrollments.filter(pk__gt=last_pk)[:chunk_size])
+        if not entries:
+            break
+        last_pk = entries[-1].enrollment_id
+        written += _write_entries(entries)
+    return written
@@ -7,4 +7,10 @@ app_name = 'Academics'
 urlpatterns = [
    
     path('course_registration/', views.course_registration, name='course_registration'),
+    path('course_registration/async/', views.course_registration_async, name='course_registration_async'),
+    path('api/registration/courses/', views.registration_courses_api, name='registration_courses_api'),
+    path('api/registration/enroll/', views.registration_enroll_api, name='registration_enroll_api'),
+    path('api/registration/tickets/<str:request_id>/', views.registration_ticket_api, name='registration_ticket_api'),
+    path('exports/enrollments/', views.export_roster, {'kind': 'enrollments'}, name='export_enrollments'),
+    path('exports/records/', views.export_roster, {'kind': 'records'}, name='export_records'),
 ]
\ No newline at end of file
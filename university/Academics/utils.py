@@ -0,0 +1,52 @@
+from django.conf import settings
+
+
+def assign_unique_pks(model, instances, batch_size=500):
+    """
+    Make sure every instance has a primary key that is free to insert.
+
+    ShortUUID keys are drawn at random from a small alphabet, so a large
+    bulk_create can hit a key that is already used, or draw the same key
+    twice, and abort the whole batch. Keys are regenerated up front instead:
+    duplicates within the batch are redrawn in memory and clashes with
+    existing rows are found with one query per batch_size instances.
+
+    Args:
+        model: The model class the instances belong to.
+        instances (list): Unsaved model instances with generated keys.
+        batch_size (int): Number of keys checked against the database per query.
+
+    Returns:
+        list: The same instances.
+    """
+    pk_field = model._meta.pk
+    seen = set()
+    pending = list(instances)
+
+    while pending:
+        for instance in pending:
+            while instance.pk in seen:
+                instance.pk = pk_field.get_default()
+            seen.add(instance.pk)
+
+        taken = set()
+        for start in range(0, len(pending), batch_size):
+            keys = [instance.pk for instance in pending[start:start + batch_size]]
+            taken.update(model._default_manager.filter(pk__in=keys).values_list('pk', flat=True))
+        pending = [instance for instance in pending if instance.pk in taken]
+
+    return instances
+
+
+def cache_timeout(timeout):
+    """
+    Return how long a signal-invalidated cache entry may live.
+
+    Invalidating an entry only reaches other processes through a shared
+    cache, so with a per-process cache (settings.SHARED_CACHE off) entries
+    expire after settings.UNSHARED_CACHE_TIMEOUT seconds instead of
+    ``timeout``, bounding how long other processes serve stale data.
+    """
+    if settings.SHARED_CACHE:
+        return timeout
+    return min(timeout, settings.UNSHARED_CACHE_TIMEOUT)
@@ -1,10 +1,20 @@
 # views.py
 
-from django.contrib.auth.decorators import login_required
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from .models import StudentAcademicRecord
-from django.shortcuts import get_object_or_404
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+from . import registration_queue
+from .exports import EXPORT_FORMATS, get_export_rows, iter_export
+from .models import RegistrationRequest, StudentAcademicRecord
+from .registration_queue import RegistrationInProgress, RegistrationQueueFull
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.urls import reverse
 from Users.models import Student
 
 
@@ -12,19 +22,25 @@ from Users.models import Student
 @login_required
 def course_registration(request):
     student=get_object_or_404(Student,user=request.user)
-    student_record = StudentAcademicRecord.objects.get(
-        student=student,
-        is_current=True
-    )
+    student_record = StudentAcademicRecord.get_current_record(student)
 
     if not student_record:
         messages.error(request, "No active academic record found.")
-        return redirect('student_dashboard')  
+        return redirect('Users:dashboard')
 
-    available_courses = student_record.get_compatible_courses()
+    available_courses = student_record.get_course_catalog()
     enrolled_course_ids = student_record.get_enrolled_course_ids()
     success = False
-    if request.method == 'POST':
+    registration_ticket = None
+    if request.method == 'POST' and registration_queue.is_enabled():
+        try:
+            registration_ticket = registration_queue.enqueue(
+                student_record, request.POST.getlist('course_offering_ids')
+            )
+            messages.info(request, "Your registration has been queued and will be processed shortly.")
+        except (RegistrationInProgress, RegistrationQueueFull) as e:
+            messages.error(request, str(e))
+    elif request.method == 'POST':
         course_offering_ids = request.POST.getlist('course_offering_ids')
         success_count, error_messages = student_record.batch_enroll(course_offering_ids)
 
@@ -38,11 +54,215 @@ def course_registration(request):
         # Refresh the enrolled course IDs after enrollment
         enrolled_course_ids= student_record.get_enrolled_course_ids()
 
+    if registration_ticket is None and registration_queue.is_enabled():
+        registration_ticket = registration_queue.get_latest_ticket(student_record)
+
     context = {
         'student_record': student_record,
         'available_courses': available_courses,
         'enrolled_course_ids': enrolled_course_ids,
+        'registration_ticket': registration_ticket,
         'success':success
     }
 
-    return render(request, 'academics/course_registration.html', context)
\ No newline at end of file
+    return render(request, 'academics/course_registration.html', context)
+
+
+async def course_registration_async(request):
+    """
+    Async version of course_registration for the ASGI stack.
+
+    Lookups use the async ORM; only the enrollment transaction and the
+    template rendering (context processors are synchronous) run in a thread.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+
+    student = await aget_object_or_404(Student, user=user)
+    student_record = await StudentAcademicRecord.aget_current_record(student)
+
+    if not student_record:
+        messages.error(request, "No active academic record found.")
+        return redirect('Users:dashboard')
+
+    available_courses = await student_record.aget_course_catalog()
+    success = False
+    registration_ticket = None
+    if request.method == 'POST' and registration_queue.is_enabled():
+        try:
+            registration_ticket = await sync_to_async(registration_queue.enqueue)(
+                student_record, request.POST.getlist('course_offering_ids')
+            )
+            messages.info(request, "Your registration has been queued and will be processed shortly.")
+        except (RegistrationInProgress, RegistrationQueueFull) as e:
+            messages.error(request, str(e))
+    elif request.method == 'POST':
+        course_offering_ids = request.POST.getlist('course_offering_ids')
+        success_count, error_messages = await sync_to_async(student_record.batch_enroll)(course_offering_ids)
+
+        if success_count:
+            messages.success(request, f"Successfully enrolled in {success_count} course(s).")
+            success = True
+
+        for error in error_messages:
+            messages.error(request, error)
+
+    if registration_ticket is None and registration_queue.is_enabled():
+        registration_ticket = await registration_queue.aget_latest_ticket(student_record)
+
+    enrolled_course_ids = [
+        offering_id async for offering_id in student_record.get_enrolled_course_ids()
+    ]
+
+    context = {
+        'student_record': student_record,
+        'available_courses': available_courses,
+        'enrolled_course_ids': enrolled_course_ids,
+        'registration_ticket': registration_ticket,
+        'success': success
+    }
+
+    return await sync_to_async(render)(request, 'academics/course_registration.html', context)
+
+
+async def _aget_api_student_record(request):
+    """Return (student_record, error_response) for the registration API."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None, JsonResponse({'error': "Authentication required."}, status=401)
+
+    student = await Student.objects.filter(user=user).afirst()
+    student_record = await StudentAcademicRecord.aget_current_record(student) if student else None
+    if student_record is None:
+        return None, JsonResponse({'error': "No active academic record found."}, status=404)
+    return student_record, None
+
+
+@require_GET
+async def registration_courses_api(request):
+    """List the course offerings the signed-in student can register for."""
+    student_record, error = await _aget_api_student_record(request)
+    if error:
+        return error
+
+    enrolled_course_ids = {
+        offering_id async for offering_id in student_record.get_enrolled_course_ids()
+    }
+    courses = [
+        {
+            'offering_id': offering.offering_id,
+            'course_code': offering.course_department.course.course_code,
+            'course_name': offering.course_department.course.course_name,
+            'credit_hours': offering.course_department.course.credit_hours,
+            'sections': [section.section_name for section in offering.sections.all()],
+            'enrolled': offering.offering_id in enrolled_course_ids,
+        }
+        for offering in await student_record.aget_course_catalog()
+    ]
+    return JsonResponse({
+        'student_record': student_record.record_id,
+        'academic_period': str(student_record.academic_period),
+        'semester_number': student_record.semester_number,
+        'courses': courses,
+    })
+
+
+@require_POST
+async def registration_enroll_api(request):
+    """
+    Enroll the signed-in student in the submitted course offerings.
+
+    Accepts a JSON body {"course_offering_ids": [...]} or form data.
+    """
+    student_record, error = await _aget_api_student_record(request)
+    if error:
+        return error
+
+    if request.content_type == 'application/json':
+        try:
+            course_offering_ids = json.loads(request.body).get('course_offering_ids', [])
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': "Invalid JSON body."}, status=400)
+    else:
+        course_offering_ids = request.POST.getlist('course_offering_ids')
+    if not isinstance(course_offering_ids, list) or not all(
+        isinstance(offering_id, str) for offering_id in course_offering_ids
+    ):
+        return JsonResponse({'error': "course_offering_ids must be a list of strings."}, status=400)
+
+    if registration_queue.is_enabled():
+        try:
+            ticket = await sync_to_async(registration_queue.enqueue)(student_record, course_offering_ids)
+        except RegistrationInProgress as e:
+            return JsonResponse({'error': str(e)}, status=409)
+        except RegistrationQueueFull as e:
+            return JsonResponse({'error': str(e)}, status=503, headers={'Retry-After': '60'})
+        return JsonResponse(await _aticket_payload(ticket), status=202)
+
+    success_count, error_messages = await sync_to_async(student_record.batch_enroll)(course_offering_ids)
+    enrolled_course_ids = [
+        offering_id async for offering_id in student_record.get_enrolled_course_ids()
+    ]
+    return JsonResponse({
+        'success_count': success_count,
+        'errors': error_messages,
+        'enrolled_course_ids': enrolled_course_ids,
+    })
+
+
+async def _aticket_payload(ticket):
+    return {
+        'ticket': ticket.request_id,
+        'status': ticket.status,
+        'queue_position': await registration_queue.aqueue_position(ticket),
+        'success_count': ticket.success_count,
+        'errors': ticket.result_messages,
+        'status_url': reverse('Academics:registration_ticket_api', args=[ticket.request_id]),
+    }
+
+
+@require_GET
+async def registration_ticket_api(request, request_id):
+    """Report the progress of a queued registration; polled by the registration page."""
+    student_record, error = await _aget_api_student_record(request)
+    if error:
+        return error
+
+    ticket = await RegistrationRequest.objects.filter(
+        request_id=request_id,
+        student_record__student=student_record.student_id
+    ).afirst()
+    if ticket is None:
+        return JsonResponse({'error': "Registration request not found."}, status=404)
+    return JsonResponse(await _aticket_payload(ticket))
+
+
+def is_registrar(user):
+    return user.is_staff or user.role == 'Admin'
+
+
+@login_required
+@user_passes_test(is_registrar)
+def export_roster(request, kind):
+    """Stream enrollments or academic records as CSV or JSONL."""
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Unsupported export format.")
+
+    semester_number = request.GET.get('semester_number')
+    if semester_number and not semester_number.isdigit():
+        return HttpResponseBadRequest("semester_number must be a number.")
+
+    header, rows = get_export_rows(
+        kind,
+        academic_period=request.GET.get('academic_period'),
+        department=request.GET.get('department'),
+        semester_number=semester_number
+    )
+    response = StreamingHttpResponse(
+        iter_export(export_format, header, rows),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{export_format}"'
+    return response
@@ -2,6 +2,7 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from university.paginators import EstimatedCountPaginator
 from .models import User, Student, Teacher
 
 class CustomUserAdmin(UserAdmin):
@@ -9,6 +10,8 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ('role', 'account_status', 'is_staff', 'is_superuser')
     search_fields = ('user_id', 'username', 'email', 'phone')
     ordering = ('-date_joined',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         (None, {'fields': ('user_id', 'username', 'email', 'password')}),
         ('Personal Info', {'fields': ('first_name', 'last_name', 'date_of_birth', 'gender', 'address', 'phone')}),
@@ -31,6 +34,9 @@ class CustomUserAdmin(UserAdmin):
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('student_id', 'get_username', 'get_email')
+    list_select_related = ('user',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     search_fields = ('student_id', 'user__username', 'user__email')
     readonly_fields = ('student_id', 'user')
 
@@ -46,7 +52,8 @@ class StudentAdmin(admin.ModelAdmin):
 class TeacherAdmin(admin.ModelAdmin):
     list_display = ('teacher_id', 'get_username', 'get_email', 'department')
     list_filter = ('department',)
-    search_fields = ('teacher_id', 'user__username', 'user__email', 'department__name')
+    list_select_related = ('user', 'department')
+    search_fields = ('teacher_id', 'user__username', 'user__email', 'department__department_name')
     readonly_fields = ('teacher_id', 'user')
 
     def get_username(self, obj):
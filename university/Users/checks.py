@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, Tags.security, deploy=True)
+def check_throttle_cache(app_configs, **kwargs):
+    """Sign-in throttling only limits attempts globally with a cache all processes share."""
+    backend = settings.CACHES.get(settings.LOGIN_THROTTLE_CACHE, {}).get('BACKEND')
+    if backend in PER_PROCESS_CACHES:
+        return [Error(
+            f"The {settings.LOGIN_THROTTLE_CACHE!r} cache used for sign-in throttling is not shared "
+            f"between processes, so every worker allows LOGIN_MAX_FAILURES_PER_EMAIL attempts.",
+            hint="Set CACHE_BACKEND to 'file' or 'redis'.",
+            id='Users.E001',
+        )]
+    return []
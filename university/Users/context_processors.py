@@ -1,111 +1,197 @@
+from functools import cached_property, partial
+
 from django.contrib.auth import get_user_model
 from Users.models import Student, Teacher
-from Academics.models import  StudentAcademicRecord, Enrollment, AcademicPeriod,Course, Department,TeacherAssignment
-from django.utils import timezone
-from django.db.models import Prefetch
+from Academics.periods import get_current_academic_period
+from Users.dashboard import (
+    get_admin_totals,
+    get_current_record,
+    get_enrollments,
+    get_teacher_assignments,
+    get_transcript,
+)
 
 
 User = get_user_model()
 
+STUDENT_KEYS = (
+    'student_profile', 'academic_record', 'enrollments', 'current_year', 'current_semester',
+    'department', 'academic_status', 'current_courses', 'compatible_courses', 'enrolled_course_ids',
+    'transcript', 'total_credit_hours',
+)
+TEACHER_KEYS = ('teacher_profile', 'teacher_assignments', 'taught_courses', 'taught_sections')
+ADMIN_KEYS = ('admin_profile', 'total_students', 'total_teachers', 'total_courses', 'total_departments')
+
+ROLE_KEYS = {
+    'Student': STUDENT_KEYS,
+    'Teacher': TEACHER_KEYS,
+    'Admin': ADMIN_KEYS,
+}
+
+
+class RoleContext:
+    """
+    Role-specific template data for the signed-in user.
+
+    Every key is a cached property, so nothing hits the database until a
+    template actually reads it, and each query runs at most once per request.
+    The dashboard fragments (academic record, enrollments, transcript,
+    teacher assignments, admin totals) come from Users.dashboard, which
+    caches them across requests.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    def keys(self):
+        return ('current_academic_period',) + ROLE_KEYS.get(self.user.role, ())
+
+    @cached_property
+    def current_academic_period(self):
+        return get_current_academic_period()
+
+    # Student
+
+    @cached_property
+    def student_profile(self):
+        return Student.objects.filter(user=self.user).first()
+
+    @cached_property
+    def academic_record(self):
+        if self.student_profile is None:
+            return None
+        return get_current_record(self.student_profile, self.current_academic_period)
+
+    @cached_property
+    def enrollments(self):
+        if self.academic_record is None:
+            return None
+        return get_enrollments(self.academic_record)
+
+    @cached_property
+    def current_year(self):
+        return self.academic_record.year if self.academic_record else None
+
+    @cached_property
+    def current_semester(self):
+        return self.academic_record.semester_number if self.academic_record else None
+
+    @cached_property
+    def department(self):
+        return self.academic_record.department if self.academic_record else None
+
+    @cached_property
+    def academic_status(self):
+        return self.academic_record.academic_status if self.academic_record else None
+
+    @cached_property
+    def current_courses(self):
+        if self.enrollments is None:
+            return None
+        return [
+            enrollment.section_course_offering.course_offering.course_department.course
+            for enrollment in self.enrollments
+        ]
+
+    @cached_property
+    def compatible_courses(self):
+        if self.academic_record is None:
+            return None
+        return self.academic_record.get_course_catalog()
+
+    @cached_property
+    def enrolled_course_ids(self):
+        if self.academic_record is None:
+            return None
+        return self.academic_record.get_enrolled_course_ids()
+
+    @cached_property
+    def _transcript(self):
+        if self.student_profile is None:
+            return None, None
+        return get_transcript(self.student_profile)
+
+    @cached_property
+    def transcript(self):
+        return self._transcript[0]
+
+    @cached_property
+    def total_credit_hours(self):
+        return self._transcript[1]
+
+    # Teacher
+
+    @cached_property
+    def teacher_profile(self):
+        return Teacher.objects.filter(user=self.user).first()
+
+    @cached_property
+    def teacher_assignments(self):
+        if self.teacher_profile is None:
+            return None
+        return get_teacher_assignments(self.teacher_profile, self.current_academic_period)
+
+    @cached_property
+    def taught_courses(self):
+        if self.teacher_assignments is None:
+            return None
+        return [
+            assignment.section_course_offering.course_offering.course_department.course
+            for assignment in self.teacher_assignments
+        ]
+
+    @cached_property
+    def taught_sections(self):
+        if self.teacher_assignments is None:
+            return None
+        return [
+            assignment.section_course_offering.section
+            for assignment in self.teacher_assignments
+        ]
+
+    # Admin
+
+    @cached_property
+    def admin_profile(self):
+        return self.user
+
+    @cached_property
+    def _admin_totals(self):
+        return get_admin_totals()
+
+    @cached_property
+    def total_students(self):
+        return self._admin_totals['total_students']
+
+    @cached_property
+    def total_teachers(self):
+        return self._admin_totals['total_teachers']
+
+    @cached_property
+    def total_courses(self):
+        return self._admin_totals['total_courses']
+
+    @cached_property
+    def total_departments(self):
+        return self._admin_totals['total_departments']
+
+
+def get_role_context(request):
+    """Return the request's RoleContext, creating it on first use."""
+    role_context = getattr(request, '_role_context', None)
+    if role_context is None or role_context.user != request.user:
+        role_context = request._role_context = RoleContext(request.user)
+    return role_context
 
 
-def get_current_academic_period():
-    return AcademicPeriod.objects.order_by('-start_date').first()
-
 def user_role_context(request):
     if request.user.is_authenticated:
-        user = request.user
-        role = user.role
-        user_data = {'user': user}
-        current_academic_period = get_current_academic_period()
-        user_data['current_academic_period'] = current_academic_period
-
-        if role == 'Student':
-            try:
-                student_profile = Student.objects.get(user=user)
-                user_data['student_profile'] = student_profile
-
-                academic_record = StudentAcademicRecord.objects.select_related(
-                    'department', 'academic_status'
-                ).get(student=student_profile, academic_period=current_academic_period, is_current=True)
-
-                enrollments = Enrollment.objects.filter(
-                    student_record=academic_record
-                ).select_related(
-                    'section_course_offering__section',
-                    'section_course_offering__course_offering__course_department__course',
-                    'section_course_offering__course_offering__course_department__department'
-                )
-
-                user_data['academic_record'] = academic_record
-                user_data['enrollments'] = enrollments
-                user_data['current_year'] = academic_record.year
-                user_data['current_semester'] = academic_record.semester_number
-                user_data['department'] = academic_record.department
-                user_data['academic_status'] = academic_record.academic_status
-
-                current_courses = [
-                    enrollment.section_course_offering.course_offering.course_department.course 
-                    for enrollment in enrollments
-                ]
-                user_data['current_courses'] = current_courses
-
-                compatible_courses = academic_record.get_compatible_courses()
-                user_data['compatible_courses'] = compatible_courses
-
-                enrolled_course_ids = academic_record.get_enrolled_course_ids()
-                user_data['enrolled_course_ids'] = enrolled_course_ids
-
-            except Student.DoesNotExist:
-                user_data['student_profile'] = None
-                user_data['academic_record'] = None
-                user_data['enrollments'] = None
-                user_data['current_courses'] = None
-                user_data['compatible_courses'] = None
-                user_data['enrolled_course_ids'] = None
-
-        elif role == 'Teacher':
-            try:
-                teacher_profile = Teacher.objects.get(user=user)
-                user_data['teacher_profile'] = teacher_profile
-
-                teacher_assignments = TeacherAssignment.objects.filter(
-                    teacher=teacher_profile,
-                    section_course_offering__course_offering__academic_period=current_academic_period
-                ).select_related(
-                    'section_course_offering__section',
-                    'section_course_offering__course_offering__course_department__course',
-                    'section_course_offering__course_offering__course_department__department'
-                )
-                user_data['teacher_assignments'] = teacher_assignments
-
-                taught_courses = [
-                    assignment.section_course_offering.course_offering.course_department.course
-                    for assignment in teacher_assignments
-                ]
-                user_data['taught_courses'] = taught_courses
-
-                taught_sections = [
-                    assignment.section_course_offering.section
-                    for assignment in teacher_assignments
-                ]
-                user_data['taught_sections'] = taught_sections
-
-            except Teacher.DoesNotExist:
-                user_data['teacher_profile'] = None
-                user_data['teacher_assignments'] = None
-                user_data['taught_courses'] = None
-                user_data['taught_sections'] = None
-
-        elif role == 'Admin':
-            user_data['admin_profile'] = user
-
-            # Add any specific admin-related data here
-            user_data['total_students'] = Student.objects.count()
-            user_data['total_teachers'] = Teacher.objects.count()
-            user_data['total_courses'] = Course.objects.count()
-            user_data['total_departments'] = Department.objects.count()
-
+        role_context = get_role_context(request)
+        # Templates call callables on lookup, so each value is only resolved
+        # when (and if) a template reads it.
+        user_data = {'user': request.user}
+        for key in role_context.keys():
+            user_data[key] = partial(getattr, role_context, key)
         return user_data
 
     return {}
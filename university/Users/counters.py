@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models import F
+
+from Academics.models import Course, Department
+
+from .models import StatisticsCounter, Student, Teacher
+
+# Counter name -> counted model. The names double as the dashboard's context keys.
+COUNTED_MODELS = {
+    'total_students': Student,
+    'total_teachers': Teacher,
+    'total_courses': Course,
+    'total_departments': Department,
+}
+COUNTER_NAMES = {model: name for name, model in COUNTED_MODELS.items()}
+
+
+def add(model, delta):
+    """
+    Adjust the counter of a counted model by delta; other models are ignored.
+
+    The update runs in the caller's transaction, so it is rolled back with
+    the rows it counts. A missing counter is created by counting the table.
+    """
+    name = COUNTER_NAMES.get(model)
+    if name is None or not delta:
+        return
+    if not StatisticsCounter.objects.filter(name=name).update(value=F('value') + delta):
+        reconcile([name])
+
+
+def get_totals():
+    """
+    Return every counter, read by primary key in one query.
+
+    Counters that do not exist yet, e.g. after a flush, are counted first.
+    """
+    totals = dict(StatisticsCounter.objects.filter(name__in=COUNTED_MODELS).values_list('name', 'value'))
+    missing = [name for name in COUNTED_MODELS if name not in totals]
+    if missing:
+        totals.update({name: counted for name, (_, counted) in reconcile(missing).items()})
+    return totals
+
+
+def reconcile(names=None, dry_run=False):
+    """
+    Recount the counted models and correct counters that drifted.
+
+    The counter rows are locked before counting, so concurrent signal
+    updates wait for the recount instead of being overwritten by it.
+
+    Args:
+        names (list): Counters to check (default: all).
+        dry_run (bool): Only report, leaving the counters as they were.
+
+    Returns:
+        dict: Counter name -> (stored value, or None if it was missing, counted value).
+    """
+    names = list(names or COUNTED_MODELS)
+    with transaction.atomic():
+        existing = set(StatisticsCounter.objects.filter(name__in=names).values_list('name', flat=True))
+        StatisticsCounter.objects.bulk_create(
+            [StatisticsCounter(name=name) for name in names if name not in existing],
+            ignore_conflicts=True
+        )
+        stored = dict(
+            StatisticsCounter.objects.select_for_update().filter(name__in=names).values_list('name', 'value')
+        )
+
+        results = {}
+        for name in names:
+            counted = COUNTED_MODELS[name].objects.count()
+            if stored[name] != counted:
+                StatisticsCounter.objects.filter(name=name).update(value=counted)
+            results[name] = (stored[name] if name in existing else None, counted)
+        if dry_run:
+            transaction.set_rollback(True)
+    return results
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from Academics.models import Enrollment, StudentAcademicRecord, TeacherAssignment, TranscriptEntry
+from Users.counters import get_totals
+
+# Fragments are invalidated by Users.signals; the timeout only bounds how
+# long edits that send no signal (e.g. renaming a department) can stay visible.
+# Invalidation only reaches other processes through a shared cache, so
+# fragments are only cached when DASHBOARD_CACHE is on.
+CACHE_TIMEOUT = 60 * 15
+
+
+def _key(fragment, owner_id):
+    return f'dashboard:{fragment}:{owner_id}'
+
+
+def _get_fragment(key, build, period_id=None):
+    """
+    Return a cached fragment, building and caching it on a miss.
+
+    Fragments that depend on the current academic period store its ID next
+    to the value, so they rebuild on their own once the period changes.
+    """
+    if not settings.DASHBOARD_CACHE:
+        return build()
+    cached = cache.get(key)
+    if cached is not None and cached[0] == period_id:
+        return cached[1]
+    value = build()
+    cache.set(key, (period_id, value), CACHE_TIMEOUT)
+    return value
+
+
+def get_current_record(student, academic_period):
+    """The student's current StudentAcademicRecord, cached per student."""
+    return _get_fragment(
+        _key('record', student.pk),
+        lambda: StudentAcademicRecord.get_current_record(student),
+        academic_period.pk if academic_period else None
+    )
+
+
+def get_enrollments(student_record):
+    """The enrollments of a student record with their courses and sections, cached per record."""
+    return _get_fragment(_key('enrollments', student_record.pk), lambda: list(
+        Enrollment.objects.filter(
+            student_record=student_record
+        ).select_related(
+            'section_course_offering__section',
+            'section_course_offering__course_offering__course_department__course',
+            'section_course_offering__course_offering__course_department__department'
+        )
+    ))
+
+
+def get_transcript(student):
+    """(transcript entries, total credit hours) of a student, cached per student."""
+    return _get_fragment(_key('transcript', student.pk), lambda: (
+        list(TranscriptEntry.get_transcript(student)),
+        TranscriptEntry.get_total_credit_hours(student)
+    ))
+
+
+def get_teacher_assignments(teacher, academic_period):
+    """A teacher's assignments in the current academic period, cached per teacher."""
+    return _get_fragment(_key('assignments', teacher.pk), lambda: list(
+        TeacherAssignment.objects.filter(
+            teacher=teacher,
+            section_course_offering__course_offering__academic_period=academic_period
+        ).select_related(
+            'section_course_offering__section',
+            'section_course_offering__course_offering__course_department__course',
+            'section_course_offering__course_offering__course_department__department'
+        )
+    ), academic_period.pk if academic_period else None)
+
+
+def get_admin_totals():
+    """Numbers of students, teachers, courses and departments, from Users.counters."""
+    return get_totals()
+
+
+def _delete_on_commit(keys):
+    if not settings.DASHBOARD_CACHE:
+        return
+    keys = list(keys)
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_student_records(student_ids):
+    _delete_on_commit(_key('record', student_id) for student_id in set(student_ids))
+
+
+def invalidate_enrollments(student_record_ids, student_ids):
+    """Drop the enrollment fragments of the given records and the transcripts of their students."""
+    _delete_on_commit(
+        [_key('enrollments', record_id) for record_id in set(student_record_ids)] +
+        [_key('transcript', student_id) for student_id in set(student_ids)]
+    )
+
+
+def invalidate_teacher_assignments(teacher_ids):
+    _delete_on_commit(_key('assignments', teacher_id) for teacher_id in set(teacher_ids))
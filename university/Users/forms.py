@@ -3,8 +3,11 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
 from django.core.exceptions import ValidationError
 
+from .throttling import get_client_ip, is_locked_out, record_failure, reset_failures
+
 User = get_user_model()
 
 class CustomAuthenticationForm(forms.Form):
@@ -12,21 +15,53 @@ class CustomAuthenticationForm(forms.Form):
     password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control', 'placeholder': 'Password'}))
     remember_me = forms.BooleanField(required=False, initial=False, widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}))
 
+    def __init__(self, request=None, *args, **kwargs):
+        self.request = request
+        self.user_cache = None
+        self.locked_out = False
+        super().__init__(*args, **kwargs)
+
     def clean(self):
+        """
+        Verify the credentials with one user query and one password hash.
+
+        The user is kept for get_user(), so the view does not authenticate
+        again. Emails or client addresses with too many recent failures are
+        refused before any hashing. Unknown emails and wrong passwords get
+        the same error.
+        """
         email = self.cleaned_data.get('email')
         password = self.cleaned_data.get('password')
 
         if email and password:
+            ip = get_client_ip(self.request) if self.request is not None else 'unknown'
+            if is_locked_out(email, ip):
+                self.locked_out = True
+                raise ValidationError("Too many failed sign-in attempts. Please try again later.")
+
             user = User.objects.filter(email=email).first()
             if user is None:
-                raise ValidationError("The email is not registered.")
-            if not user.check_password(password):
-                raise ValidationError("Incorrect password.")
+                # Hash anyway, so the response time does not tell whether
+                # the email is registered.
+                User().set_password(password)
+            if user is None or not user.check_password(password):
+                self._fail(email, ip)
+                raise ValidationError("Invalid email or password.")
             if not user.is_active:
                 raise ValidationError("This account is inactive.")
 
+            reset_failures(email)
+            self.user_cache = user
+
         return self.cleaned_data
 
+    def _fail(self, email, ip):
+        record_failure(email, ip)
+        user_login_failed.send(sender=__name__, credentials={'email': email}, request=self.request)
+
+    def get_user(self):
+        return self.user_cache
+
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(widget=forms.EmailInput(attrs={'class': 'form-control', 'placeholder': 'Email'}))
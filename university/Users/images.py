@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = 'profile_pictures'
+VARIANT_DIR = f'{UPLOAD_DIR}/variants'
+# Processed pictures are named after their content: profile_pictures/<hash>.jpg.
+PROCESSED_NAME = re.compile(rf'^{UPLOAD_DIR}/([0-9a-f]{{16}})\.jpg$')
+HASH = re.compile(r'^[0-9a-f]{16}$')
+
+# Square thumbnail sizes in pixels.
+VARIANTS = {
+    'small': 64,
+    'medium': 160,
+    'large': 320,
+}
+# File extension -> (Pillow format, save options, content type).
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}, 'image/webp'),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}, 'image/jpeg'),
+}
+
+_executor = None
+
+
+def get_storage():
+    return User._meta.get_field('profile_picture').storage
+
+
+def get_picture_hash(name):
+    """Return the content hash of a processed picture's file name, or None if it is unprocessed."""
+    match = PROCESSED_NAME.match(name or '')
+    return match.group(1) if match else None
+
+
+def get_variant_name(picture_hash, variant, extension):
+    return f'{VARIANT_DIR}/{picture_hash}-{variant}.{extension}'
+
+
+def _to_rgb(image):
+    # JPEG has no alpha channel: transparent areas become white.
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, extension):
+    image_format, options, _ = FORMATS[extension]
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _save(name, content):
+    """Store content under name unless a file is already there; return the stored name."""
+    storage = get_storage()
+    if storage.exists(name):
+        return name
+    saved = storage.save(name, ContentFile(content))
+    if saved != name:
+        # Another thread stored the same content meanwhile.
+        storage.delete(saved)
+    return name
+
+
+def normalize_image(file):
+    """
+    Downscale an uploaded picture to PROFILE_PICTURE_MAX_SIZE pixels on its
+    longest side, apply its EXIF rotation and re-encode it as JPEG.
+
+    EXIF data and any other metadata are dropped; only the colour profile is
+    kept.
+
+    Returns:
+        bytes: The JPEG file.
+    """
+    with Image.open(file) as image:
+        max_size = settings.PROFILE_PICTURE_MAX_SIZE
+        # For JPEGs, draft() lets the decoder skip most of the pixels.
+        image.draft('RGB', (max_size, max_size))
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        image = _to_rgb(image)
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', icc_profile=icc_profile, **FORMATS['jpg'][1])
+    return buffer.getvalue()
+
+
+def process_profile_picture(user_id, name=None):
+    """
+    Replace a user's uploaded picture with its normalized, content-named copy.
+
+    Pictures that are already processed are left alone. The user row is
+    only updated if it still points at the same upload, so a newer upload
+    is never overwritten. The upload itself is kept: a User instance loaded
+    before the update may save its name back, and is then processed again.
+    delete_unused_uploads removes uploads once nothing points at them.
+
+    Args:
+        user_id: The user's ID.
+        name (str): The stored profile_picture name, if already known.
+
+    Returns:
+        str: The picture's name after processing, or None without a picture.
+    """
+    if name is None:
+        name = User.objects.filter(pk=user_id).values_list('profile_picture', flat=True).first()
+    if not name or get_picture_hash(name):
+        return name or None
+
+    storage = get_storage()
+    with storage.open(name) as file:
+        content = normalize_image(file)
+    new_name = _save(f'{UPLOAD_DIR}/{hashlib.sha256(content).hexdigest()[:16]}.jpg', content)
+
+    if User.objects.filter(pk=user_id, profile_picture=name).update(profile_picture=new_name):
+        return new_name
+    return User.objects.filter(pk=user_id).values_list('profile_picture', flat=True).first()
+
+
+def delete_unused_uploads(min_age=timedelta(days=1), batch_size=500):
+    """
+    Delete the uploads no user points at any more, i.e. the originals of
+    processed pictures.
+
+    Uploads newer than min_age are kept: their user row may not be
+    committed yet, or a stale instance may still save them back.
+
+    Returns:
+        int: The number of files deleted.
+    """
+    storage = get_storage()
+    try:
+        _, file_names = storage.listdir(UPLOAD_DIR)
+    except FileNotFoundError:
+        return 0
+    uploads = [f'{UPLOAD_DIR}/{file_name}' for file_name in file_names]
+    uploads = [name for name in uploads if not get_picture_hash(name)]
+
+    cutoff = timezone.now() - min_age
+    deleted = 0
+    for start in range(0, len(uploads), batch_size):
+        batch = uploads[start:start + batch_size]
+        in_use = set(User.objects.filter(profile_picture__in=batch).values_list('profile_picture', flat=True))
+        for name in batch:
+            if name not in in_use and storage.get_modified_time(name) < cutoff:
+                storage.delete(name)
+                deleted += 1
+    return deleted
+
+
+def _render_variant(image, variant, extension):
+    size = VARIANTS[variant]
+    return _encode(ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS), extension)
+
+
+def get_variant(picture_hash, variant, extension):
+    """
+    Return the storage name of a thumbnail, creating it on first use.
+
+    Raises:
+        ValueError: For an unknown variant or extension or a malformed hash.
+        FileNotFoundError: If there is no processed picture with this hash.
+    """
+    if variant not in VARIANTS or extension not in FORMATS or not HASH.match(picture_hash):
+        raise ValueError(f"Unknown profile picture variant {picture_hash}-{variant}.{extension}.")
+
+    name = get_variant_name(picture_hash, variant, extension)
+    storage = get_storage()
+    if storage.exists(name):
+        return name
+
+    with storage.open(f'{UPLOAD_DIR}/{picture_hash}.jpg') as file, Image.open(file) as image:
+        image.draft('RGB', (VARIANTS[variant], VARIANTS[variant]))
+        return _save(name, _render_variant(image, variant, extension))
+
+
+def generate_variants(picture_hash):
+    """Create every missing thumbnail of a picture, decoding the picture once."""
+    storage = get_storage()
+    missing = [
+        (variant, extension)
+        for variant in VARIANTS
+        for extension in FORMATS
+        if not storage.exists(get_variant_name(picture_hash, variant, extension))
+    ]
+    if not missing:
+        return 0
+
+    with storage.open(f'{UPLOAD_DIR}/{picture_hash}.jpg') as file, Image.open(file) as image:
+        image.load()
+        for variant, extension in missing:
+            _save(get_variant_name(picture_hash, variant, extension), _render_variant(image, variant, extension))
+    return len(missing)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROFILE_PICTURE_WORKERS,
+            thread_name_prefix='profile-pictures'
+        )
+    return _executor
+
+
+def _process_in_background(user_id, name):
+    try:
+        process_profile_picture(user_id, name)
+    except Exception:
+        logger.exception("Could not process the profile picture of user %s.", user_id)
+    finally:
+        # Each worker thread has its own connections.
+        connections.close_all()
+
+
+def schedule_processing(user_id, name):
+    """
+    Process a new upload in the thread pool, so the request that uploaded it
+    does not wait for the image work. With PROFILE_PICTURE_WORKERS = 0 it is
+    processed right away instead.
+    """
+    if settings.PROFILE_PICTURE_WORKERS:
+        get_executor().submit(_process_in_background, user_id, name)
+    else:
+        process_profile_picture(user_id, name)
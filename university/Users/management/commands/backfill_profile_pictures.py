@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from Users.images import delete_unused_uploads, generate_variants, get_picture_hash, process_profile_picture
+from Users.models import User
+
+
+def backfill_user(user_id, name):
+    """Process one user's picture and create its thumbnails; return (processed, variants, error)."""
+    try:
+        new_name = process_profile_picture(user_id, name)
+        picture_hash = get_picture_hash(new_name)
+        return new_name != name, generate_variants(picture_hash) if picture_hash else 0, None
+    except Exception as e:
+        return False, 0, f"{user_id}: {e}"
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Normalize the profile pictures of existing users and create their thumbnails. "
+        "Pillow releases the GIL while decoding and resizing, so the work runs in a "
+        "thread pool. Users that are already done are skipped, so the command can be "
+        "run again after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Threads processing pictures.")
+        parser.add_argument(
+            '--delete-originals', action='store_true',
+            help="Afterwards, delete uploads older than a day that no user points at any more."
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_picture='').exclude(
+            profile_picture__isnull=True
+        ).values_list('pk', 'profile_picture').order_by('pk')
+
+        processed = variants = done = 0
+        errors = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for user_processed, user_variants, error in executor.map(
+                lambda row: backfill_user(*row), list(users)
+            ):
+                done += 1
+                processed += user_processed
+                variants += user_variants
+                if error:
+                    errors.append(error)
+
+        for error in errors:
+            self.stderr.write(f"Could not process the picture of user {error}")
+        self.stdout.write(
+            f"{done} user(s) with a picture: {processed} picture(s) normalized, {variants} thumbnail(s) "
+            f"created, {len(errors)} error(s) in {time.perf_counter() - started:.1f}s."
+        )
+        if options['delete_originals']:
+            self.stdout.write(f"{delete_unused_uploads()} unused upload(s) deleted.")
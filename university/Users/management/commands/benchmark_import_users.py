@@ -0,0 +1,77 @@
+import csv
+import os
+import tempfile
+import time
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from Users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark import_users on synthetic CSV files: once with --rows rows without "
+        "passwords, which measures reading and bulk inserts, and then with --passwords rows "
+        "that all carry a password, hashed serially and in the process pool. The imported "
+        "users are deleted afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help="Number of synthetic rows without a password.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes used to hash passwords.")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows inserted per transaction.")
+        parser.add_argument(
+            '--passwords', type=int, default=500,
+            help="Number of rows with a password in the hashing runs, 0 to skip them. Each hash "
+                 "costs a few hundred milliseconds of CPU."
+        )
+        parser.add_argument('--keep', action='store_true', help="Keep the imported users.")
+
+    def handle(self, *args, **options):
+        runs = [('no passwords', options['rows'], False, options['workers'])]
+        if options['passwords']:
+            runs.append(('passwords', options['passwords'], True, 1))
+            if options['workers'] > 1:
+                runs.append(('passwords', options['passwords'], True, options['workers']))
+
+        self.stdout.write(f"{'run':<14}{'rows':>8}{'workers':>9}{'seconds':>10}{'rows/s':>9}")
+        for label, rows, passwords, workers in runs:
+            elapsed = self.run_import(rows, passwords, workers, options)
+            self.stdout.write(f"{label:<14}{rows:>8}{workers:>9}{elapsed:>10.2f}{rows / elapsed:>9.0f}")
+
+    def run_import(self, rows, passwords, workers, options):
+        tag = uuid.uuid4().hex[:8]
+        domain = f"bench-{tag}.example.com"
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False) as handle:
+            path = handle.name
+            writer = csv.writer(handle)
+            writer.writerow(['email', 'username', 'password', 'role', 'first_name', 'last_name', 'gender'])
+            for index in range(rows):
+                writer.writerow([
+                    f"user{index}@{domain}",
+                    f"bench-{tag}-{index}",
+                    f"Pw-{tag}-{index}" if passwords else '',
+                    'Teacher' if index % 20 == 0 else 'Student',
+                    f"First{index}",
+                    f"Last{index}",
+                    ('Male', 'Female')[index % 2],
+                ])
+
+        try:
+            started = time.perf_counter()
+            call_command(
+                'import_users', path,
+                workers=workers,
+                chunk_size=options['chunk_size'],
+                stdout=StringIO(),
+                stderr=self.stderr,
+            )
+            return time.perf_counter() - started
+        finally:
+            os.unlink(path)
+            if not options['keep']:
+                User.objects.filter(email__endswith=f"@{domain}").delete()
@@ -0,0 +1,103 @@
+import statistics
+import time
+import uuid
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware as BaseSessionMiddleware
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+
+from university.middleware import QueryRecorder, SessionMiddleware
+from Users.models import User
+
+
+def view(request):
+    return HttpResponse(str(request.user.is_authenticated))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the session and authentication middleware for a signed-in user under each "
+        "session backend, once with Django's SessionMiddleware and default settings (unchanged "
+        "sessions are never saved) and once with university.middleware.SessionMiddleware, "
+        "which also saves active sessions every SESSION_REFRESH_INTERVAL seconds. Use "
+        "--refresh-interval 1 to measure the requests that do refresh. Reports latency, "
+        "queries and session saves per request. The benchmark user and its sessions are "
+        "deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backends', nargs='+', default=list(settings.SESSION_BACKENDS),
+            help=f"Session backends to compare, from: {', '.join(settings.SESSION_BACKENDS)}."
+        )
+        parser.add_argument('--requests', type=int, default=500, help="Requests per backend and mode.")
+        parser.add_argument(
+            '--refresh-interval', type=int, default=settings.SESSION_REFRESH_INTERVAL,
+            help="SESSION_REFRESH_INTERVAL for the refresh interval mode (default: the current setting)."
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['backends']) - set(settings.SESSION_BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown session backend(s): {', '.join(sorted(unknown))}.")
+
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"sessions-{tag}@bench.example.com", username=f"bench-sessions-{tag}", role='Student'
+        )
+        modes = [
+            ('django default', BaseSessionMiddleware, {}),
+            ('refresh interval', SessionMiddleware, {'SESSION_REFRESH_INTERVAL': options['refresh_interval']}),
+        ]
+        self.stdout.write(f"{'backend':<16}{'mode':<18}{'mean ms':>9}{'p95 ms':>9}{'queries':>9}{'saves':>8}")
+        try:
+            for backend in options['backends']:
+                for mode, middleware, mode_settings in modes:
+                    with override_settings(
+                        SESSION_ENGINE=settings.SESSION_BACKENDS[backend], SESSION_SAVE_EVERY_REQUEST=False,
+                        **mode_settings
+                    ):
+                        timings, queries, saves = self.run_backend(user, middleware, options['requests'])
+                    self.stdout.write(
+                        f"{backend:<16}{mode:<18}{statistics.mean(timings):>9.3f}"
+                        f"{statistics.quantiles(timings, n=20)[-1]:>9.3f}"
+                        f"{queries / len(timings):>9.2f}{saves / len(timings):>8.3f}"
+                    )
+        finally:
+            user.delete()
+
+    def run_backend(self, user, middleware, requests):
+        client = Client()
+        client.force_login(user)
+        cookies = {name: morsel.value for name, morsel in client.cookies.items()}
+        store_class = import_module(settings.SESSION_ENGINE).SessionStore
+        original_save = store_class.save
+        saves = [0]
+
+        def counting_save(store, *save_args, **save_kwargs):
+            saves[0] += 1
+            return original_save(store, *save_args, **save_kwargs)
+
+        handler = middleware(AuthenticationMiddleware(view))
+        factory = RequestFactory()
+        recorder = QueryRecorder()
+        timings = []
+        try:
+            with mock.patch.object(store_class, 'save', counting_save), connection.execute_wrapper(recorder):
+                for _ in range(requests):
+                    request = factory.get('/')
+                    request.COOKIES.update(cookies)
+                    started = time.perf_counter()
+                    response = handler(request)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    # Signed-cookie sessions live in the cookie, so keep the latest one.
+                    cookies.update({name: morsel.value for name, morsel in response.cookies.items()})
+        finally:
+            client.logout()
+        return timings, recorder.count, saves[0]
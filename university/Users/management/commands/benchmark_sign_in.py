@@ -0,0 +1,96 @@
+import time
+import uuid
+from copy import deepcopy
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from Users.models import User
+
+# Used only where the project's own templates are not installed.
+STUB_TEMPLATES = {
+    'authentication/sign_in.html': "{{ form.non_field_errors }}",
+}
+
+
+def templates_settings():
+    try:
+        get_template('authentication/sign_in.html')
+        return settings.TEMPLATES
+    except TemplateDoesNotExist:
+        templates = deepcopy(settings.TEMPLATES)
+        templates[0]['APP_DIRS'] = False
+        templates[0]['OPTIONS']['loaders'] = [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+            ('django.template.loaders.locmem.Loader', STUB_TEMPLATES),
+        ]
+        return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the sign-in view: successful sign-ins, then a burst of wrong passwords "
+        "against one account from one address. Reports time and password hashes per "
+        "request. The benchmark user is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help="Successful sign-ins to time.")
+        parser.add_argument('--attempts', type=int, default=200, help="Wrong-password attempts in the burst.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        email = f"sign-in-{tag}@bench.example.com"
+        password = f"Pw-{tag}"
+        User.objects.create_user(email=email, username=f"bench-sign-in-{tag}", password=password, role='Student')
+
+        hasher_class = type(get_hasher())
+        original_verify = hasher_class.verify
+        hashes = [0]
+
+        def counting_verify(hasher, *verify_args):
+            hashes[0] += 1
+            return original_verify(hasher, *verify_args)
+
+        url = reverse('Users:sign-in')
+        try:
+            with override_settings(TEMPLATES=templates_settings()), \
+                    mock.patch.object(hasher_class, 'verify', counting_verify):
+                started = time.perf_counter()
+                for index in range(options['logins']):
+                    response = Client(REMOTE_ADDR=f"192.0.2.{index % 250 + 1}").post(
+                        url, {'email': email, 'password': password}
+                    )
+                    if response.status_code != 302:
+                        self.stderr.write(f"Sign-in {index} failed with status {response.status_code}.")
+                elapsed = time.perf_counter() - started
+                login_hashes, hashes[0] = hashes[0], 0
+
+                attacker = Client(REMOTE_ADDR=f"198.51.100.{int(tag, 16) % 250 + 1}")
+                statuses = {}
+                started = time.perf_counter()
+                for index in range(options['attempts']):
+                    response = attacker.post(url, {'email': email, 'password': f"wrong-{index}"})
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                attack_elapsed = time.perf_counter() - started
+                attack_hashes = hashes[0]
+        finally:
+            User.objects.filter(email=email).delete()
+
+        if options['logins']:
+            self.stdout.write(
+                f"{options['logins']} sign-ins: {elapsed / options['logins'] * 1000:.1f}ms each, "
+                f"{login_hashes / options['logins']:.1f} password hashes each."
+            )
+        if options['attempts']:
+            self.stdout.write(
+                f"{options['attempts']} wrong passwords: {attack_elapsed / options['attempts'] * 1000:.1f}ms each, "
+                f"{attack_hashes} password hashes in total, statuses {statuses}."
+            )
@@ -0,0 +1,237 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from Academics.models import Department
+from Academics.utils import assign_unique_pks
+from Users import counters
+from Users.models import GENDER, ROLE, Student, Teacher, User
+
+ROLES = {value for value, _ in ROLE}
+GENDERS = {value for value, _ in GENDER}
+OPTIONAL_FIELDS = ('first_name', 'last_name', 'address', 'phone')
+
+
+class RowError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV or JSONL file and create their Student/Teacher "
+        "profiles. Rows are processed in chunks with bulk inserts and passwords "
+        "are hashed in a process pool. Columns: email, username, password, role, "
+        "first_name, last_name, date_of_birth, gender, address, phone, department."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file to import.")
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help="Input format (default: from the file extension).")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows inserted per transaction.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes used to hash passwords.")
+        parser.add_argument('--default-role', choices=sorted(ROLES), default='Student', help="Role for rows without one.")
+        parser.add_argument(
+            '--on-duplicate', choices=('report', 'skip'), default='report',
+            help="'report' lists rows whose email or username already exists and exits with an error "
+                 "after importing the rest; 'skip' only counts them."
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+
+        self.options = options
+        self.departments = self.load_departments()
+        self.seen_emails = set()
+        self.seen_usernames = set()
+        self.stats = {'created': 0, 'duplicates': 0, 'invalid': 0}
+
+        started = time.perf_counter()
+        rows = self.read_rows(path, input_format)
+        pool = None
+        if options['workers'] > 1:
+            pool = ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup)
+        try:
+            while True:
+                chunk = list(islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, pool)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  {self.stats['created']} users created...")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        elapsed = time.perf_counter() - started
+
+        stats = self.stats
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {stats['created']} users in {elapsed:.2f}s "
+            f"({stats['created'] / elapsed if elapsed else 0:.0f} rows/s); "
+            f"{stats['duplicates']} duplicates, {stats['invalid']} invalid rows."
+        ))
+        if stats['invalid'] or (stats['duplicates'] and options['on_duplicate'] == 'report'):
+            raise CommandError("Some rows were not imported, see the messages above.")
+
+    def read_rows(self, path, input_format):
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            if input_format == 'csv':
+                for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                    yield line_number, row
+            else:
+                for line_number, line in enumerate(handle, start=1):
+                    if line.strip():
+                        yield line_number, self.parse_json_line(line)
+
+    def parse_json_line(self, line):
+        # Bad lines are reported by import_chunk like invalid CSV rows.
+        try:
+            row = json.loads(line.rstrip('\r\n'))
+        except json.JSONDecodeError as e:
+            return RowError(f"invalid JSON ({e.msg} at column {e.colno})")
+        if not isinstance(row, dict):
+            return RowError(f"expected a JSON object, not {type(row).__name__}")
+        return row
+
+    def load_departments(self):
+        departments = {}
+        for department_id, department_name in Department.objects.values_list('department_id', 'department_name'):
+            departments[department_id] = department_id
+            departments[department_name.lower()] = department_id
+        return departments
+
+    def get_text(self, row, field, strip=True):
+        """Return a field as a string; JSONL numbers are accepted, other non-string values are not."""
+        value = row.get(field)
+        if value is None:
+            return ''
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if not isinstance(value, str):
+            raise RowError(f"{field} must be a string, not {type(value).__name__}")
+        return value.strip() if strip else value
+
+    def clean_row(self, row):
+        if isinstance(row, RowError):
+            raise row
+        email = User.objects.normalize_email(self.get_text(row, 'email'))
+        username = User.normalize_username(self.get_text(row, 'username'))
+        if not email or not username:
+            raise RowError("email and username are required")
+
+        role = self.get_text(row, 'role') or self.options['default_role']
+        if role not in ROLES:
+            raise RowError(f"unknown role {role!r}")
+
+        cleaned = {
+            'email': email,
+            'username': username,
+            'role': role,
+            'password': self.get_text(row, 'password', strip=False) or None,
+        }
+        for field in OPTIONAL_FIELDS:
+            cleaned[field] = self.get_text(row, field)
+
+        gender = self.get_text(row, 'gender')
+        if gender and gender not in GENDERS:
+            raise RowError(f"unknown gender {gender!r}")
+        cleaned['gender'] = gender or None
+
+        date_of_birth = self.get_text(row, 'date_of_birth')
+        try:
+            cleaned['date_of_birth'] = parse_date(date_of_birth) if date_of_birth else None
+        except ValueError:
+            cleaned['date_of_birth'] = None
+        if date_of_birth and cleaned['date_of_birth'] is None:
+            raise RowError(f"invalid date_of_birth {date_of_birth!r}")
+
+        department = self.get_text(row, 'department')
+        cleaned['department_id'] = None
+        if department:
+            cleaned['department_id'] = self.departments.get(department) or self.departments.get(department.lower())
+            if cleaned['department_id'] is None:
+                raise RowError(f"unknown department {department!r}")
+        return cleaned
+
+    def import_chunk(self, chunk, pool):
+        rows = []
+        for line_number, row in chunk:
+            try:
+                rows.append((line_number, self.clean_row(row)))
+            except RowError as e:
+                self.stats['invalid'] += 1
+                self.stderr.write(f"Line {line_number}: {e}")
+
+        existing_emails = set(User.objects.filter(
+            email__in=[row['email'] for _, row in rows]
+        ).values_list('email', flat=True))
+        existing_usernames = set(User.objects.filter(
+            username__in=[row['username'] for _, row in rows]
+        ).values_list('username', flat=True))
+
+        accepted = []
+        for line_number, row in rows:
+            duplicate = None
+            if row['email'] in existing_emails or row['email'] in self.seen_emails:
+                duplicate = f"email {row['email']}"
+            elif row['username'] in existing_usernames or row['username'] in self.seen_usernames:
+                duplicate = f"username {row['username']}"
+            if duplicate:
+                self.stats['duplicates'] += 1
+                if self.options['on_duplicate'] == 'report':
+                    self.stderr.write(f"Line {line_number}: duplicate {duplicate}")
+                continue
+            self.seen_emails.add(row['email'])
+            self.seen_usernames.add(row['username'])
+            accepted.append(row)
+
+        if not accepted:
+            return
+
+        passwords = [row['password'] for row in accepted if row['password']]
+        if pool is not None and passwords:
+            hashes = iter(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (4 * self.options['workers']))))
+        else:
+            hashes = iter(map(make_password, passwords))
+
+        users = []
+        for row in accepted:
+            users.append(User(
+                email=row['email'],
+                username=row['username'],
+                role=row['role'],
+                password=next(hashes) if row['password'] else make_password(None),
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                address=row['address'] or None,
+                phone=row['phone'] or None,
+                gender=row['gender'],
+                date_of_birth=row['date_of_birth'],
+            ))
+
+        with transaction.atomic():
+            assign_unique_pks(User, users)
+            User.objects.bulk_create(users)
+
+            students = [Student(user=user) for user in users if user.role == 'Student']
+            teachers = [
+                Teacher(user=user, department_id=row['department_id'])
+                for user, row in zip(users, accepted) if user.role == 'Teacher'
+            ]
+            Student.objects.bulk_create(assign_unique_pks(Student, students))
+            Teacher.objects.bulk_create(assign_unique_pks(Teacher, teachers))
+            counters.add(Student, len(students))
+            counters.add(Teacher, len(teachers))
+
+        self.stats['created'] += len(users)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Users.counters import COUNTED_MODELS, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the tables behind the admin statistics counters and correct any drift, "
+        "e.g. from rows written with bulk_create or raw SQL. Meant to run periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'counters', nargs='*',
+            help=f"Counters to check, from: {', '.join(COUNTED_MODELS)} (default: all)."
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without fixing it.")
+
+    def handle(self, *args, **options):
+        unknown = set(options['counters']) - set(COUNTED_MODELS)
+        if unknown:
+            raise CommandError(f"Unknown counter(s): {', '.join(sorted(unknown))}.")
+
+        results = reconcile(options['counters'], dry_run=options['dry_run'])
+
+        drifted = 0
+        for name, (stored, counted) in results.items():
+            if stored != counted:
+                drifted += 1
+                self.stdout.write(f"{name}: {'missing' if stored is None else stored} -> {counted}")
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All counters are up to date."))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{drifted} counter(s) drifted (dry run, nothing changed)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Corrected {drifted} counter(s)."))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.7 on 2026-10-18 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 from shortuuid.django_fields import ShortUUIDField
 from django.contrib.auth.models import AbstractUser
 
@@ -34,6 +35,23 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def get_profile_picture_url(self, variant='medium', extension='webp'):
+        """
+        Return the URL of a square thumbnail of the profile picture, or None.
+
+        Thumbnail URLs contain the picture's content hash, so browsers may
+        cache them for good. Until a new upload is processed, the uploaded
+        file's own URL is returned.
+        """
+        from .images import get_picture_hash
+
+        if not self.profile_picture:
+            return None
+        picture_hash = get_picture_hash(self.profile_picture.name)
+        if picture_hash is None:
+            return self.profile_picture.url
+        return reverse('Users:profile-picture', args=[picture_hash, variant, extension])
+
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
@@ -63,4 +81,15 @@ class Teacher(models.Model):
         indexes = [
             models.Index(fields=['user']),
             models.Index(fields=['department']),
-        ]
\ No newline at end of file
+        ]
+
+class StatisticsCounter(models.Model):
+    """
+    A running row count shown on the admin dashboard, e.g. the number of
+    students. Kept up to date by Users.counters.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
\ No newline at end of file
@@ -0,0 +1,88 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Academics.models import Course, Department, Enrollment, StudentAcademicRecord, TeacherAssignment
+from Academics.signals import enrollments_created, students_changed_in_bulk
+
+from . import counters
+from .dashboard import (
+    invalidate_enrollments,
+    invalidate_student_records,
+    invalidate_teacher_assignments,
+)
+from .images import get_picture_hash, get_storage, schedule_processing
+from .models import Student, Teacher, User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, **kwargs):
+    name = instance.profile_picture.name
+    # An upload that was deleted, e.g. by delete_unused_uploads, cannot be processed.
+    if name and not raw and not get_picture_hash(name) and get_storage().exists(name):
+        transaction.on_commit(partial(schedule_processing, instance.pk, name))
+
+
+# Dashboard fragments, see Users.dashboard.
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def enrollment_changed(sender, instance, **kwargs):
+    if Enrollment.student_record.is_cached(instance):
+        student_ids = [instance.student_record.student_id]
+    else:
+        student_ids = StudentAcademicRecord.objects.filter(
+            pk=instance.student_record_id
+        ).values_list('student_id', flat=True)
+    invalidate_enrollments([instance.student_record_id], student_ids)
+
+
+@receiver(enrollments_created, sender=Enrollment)
+def enrollments_created_in_bulk(sender, student_records, **kwargs):
+    invalidate_enrollments(
+        [record.pk for record in student_records],
+        [record.student_id for record in student_records]
+    )
+
+
+@receiver(students_changed_in_bulk)
+def students_changed(sender, student_ids, student_record_ids, **kwargs):
+    invalidate_student_records(student_ids)
+    invalidate_enrollments(student_record_ids, student_ids)
+
+
+@receiver(post_save, sender=StudentAcademicRecord)
+def student_record_saved(sender, instance, **kwargs):
+    invalidate_student_records([instance.student_id])
+
+
+@receiver(post_delete, sender=StudentAcademicRecord)
+def student_record_deleted(sender, instance, **kwargs):
+    invalidate_student_records([instance.student_id])
+    invalidate_enrollments([instance.pk], [instance.student_id])
+
+
+@receiver([post_save, post_delete], sender=TeacherAssignment)
+def teacher_assignment_changed(sender, instance, **kwargs):
+    invalidate_teacher_assignments([instance.teacher_id])
+
+
+# Admin statistics counters, see Users.counters. Rows written with
+# bulk_create are counted by the code that writes them.
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Teacher)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Department)
+def counted_object_saved(sender, created, **kwargs):
+    if created:
+        counters.add(sender, 1)
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Teacher)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Department)
+def counted_object_deleted(sender, **kwargs):
+    counters.add(sender, -1)
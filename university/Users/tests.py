@@ -1,3 +1,422 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from Academics.models import AcademicPeriod, Course, Department, Enrollment
+from Academics.retakes import backfill_retakes
+from Academics.tests import create_cohort
+from university.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from university.middleware import SessionMiddleware
+
+from . import counters, dashboard
+from .forms import CustomAuthenticationForm
+from .images import delete_unused_uploads, get_picture_hash, get_storage
+from .models import StatisticsCounter, Student, Teacher, User
+from .throttling import get_cache, get_client_ip
+
+
+class SignInThrottleTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.addCleanup(get_cache().clear)
+        self.user = User.objects.create_user(
+            email='student@example.com', username='student', password='secret-password', role='Student'
+        )
+
+    def sign_in(self, email, password, ip='10.0.0.1'):
+        form = CustomAuthenticationForm(
+            RequestFactory().post('/signin/', REMOTE_ADDR=ip), data={'email': email, 'password': password}
+        )
+        form.is_valid()
+        return form
+
+    def test_valid_credentials(self):
+        form = self.sign_in('student@example.com', 'secret-password')
+        self.assertEqual(form.get_user(), self.user)
+
+    def test_unknown_email_and_wrong_password_get_the_same_error(self):
+        unknown = self.sign_in('nobody@example.com', 'secret-password')
+        wrong = self.sign_in('student@example.com', 'wrong-password')
+        self.assertEqual(unknown.non_field_errors(), ["Invalid email or password."])
+        self.assertEqual(wrong.non_field_errors(), unknown.non_field_errors())
+
+    def test_unknown_email_still_hashes_the_password(self):
+        with mock.patch.object(User, 'set_password') as set_password:
+            self.sign_in('nobody@example.com', 'secret-password')
+        set_password.assert_called_once_with('secret-password')
+
+    @override_settings(LOGIN_MAX_FAILURES_PER_EMAIL=3)
+    def test_email_is_locked_out_after_repeated_failures(self):
+        for _ in range(3):
+            self.assertFalse(self.sign_in('student@example.com', 'wrong-password').locked_out)
+        form = self.sign_in('student@example.com', 'secret-password', ip='10.0.0.2')
+        self.assertTrue(form.locked_out)
+        self.assertIsNone(form.get_user())
+
+    @override_settings(LOGIN_MAX_FAILURES_PER_IP=3)
+    def test_address_is_locked_out_after_repeated_failures(self):
+        for index in range(3):
+            self.sign_in(f'nobody{index}@example.com', 'wrong-password')
+        self.assertTrue(self.sign_in('student@example.com', 'secret-password').locked_out)
+        self.assertFalse(self.sign_in('student@example.com', 'secret-password', ip='10.0.0.2').locked_out)
+
+    def test_client_ip_defaults_to_remote_addr(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(get_client_ip(request), '10.0.0.1')
+
+    @override_settings(LOGIN_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', LOGIN_TRUSTED_PROXIES=2)
+    def test_client_ip_from_trusted_proxies(self):
+        request = RequestFactory().get(
+            '/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='198.51.100.7, 203.0.113.9, 10.0.0.2'
+        )
+        # The first address was sent by the client and is not trusted.
+        self.assertEqual(get_client_ip(request), '203.0.113.9')
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.2')
+        self.assertEqual(get_client_ip(request), '10.0.0.1')
+
+    def test_deploy_check_requires_a_shared_throttle_cache(self):
+        local = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        shared = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}
+        with override_settings(CACHES={'default': local, 'throttle': local}):
+            self.assertIn('Users.E001', [error.id for error in run_checks(include_deployment_checks=True)])
+        with override_settings(CACHES={'default': local, 'throttle': shared}):
+            self.assertNotIn('Users.E001', [error.id for error in run_checks(include_deployment_checks=True)])
+
+
+@override_settings(PROFILE_PICTURE_WORKERS=0)
+class ProfilePictureTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(email='student@example.com', username='student', role='Student')
+
+    def upload(self, user):
+        buffer = BytesIO()
+        Image.new('RGB', (40, 30), 'red').save(buffer, 'PNG')
+        user.profile_picture = SimpleUploadedFile('me.png', buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        return user.profile_picture.name
+
+    def test_upload_is_processed(self):
+        upload = self.upload(self.user)
+        self.user.refresh_from_db()
+        self.assertTrue(get_picture_hash(self.user.profile_picture.name))
+        self.assertTrue(get_storage().exists(upload))
+
+    def test_stale_instance_saving_the_upload_back_is_processed_again(self):
+        stale = User.objects.get(pk=self.user.pk)
+        upload = self.upload(stale)
+        processed = User.objects.get(pk=self.user.pk).profile_picture.name
+        with self.captureOnCommitCallbacks(execute=True):
+            stale.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).profile_picture.name, processed)
+        self.assertNotEqual(processed, upload)
+
+    def test_deleted_upload_is_not_scheduled(self):
+        upload = self.upload(self.user)
+        self.assertEqual(delete_unused_uploads(min_age=timedelta(0)), 1)
+        self.assertFalse(get_storage().exists(upload))
+        User.objects.filter(pk=self.user.pk).update(profile_picture=upload)
+        self.user.refresh_from_db()
+        with mock.patch('Users.signals.schedule_processing') as schedule_processing:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+        schedule_processing.assert_not_called()
+
+    def test_recent_and_used_uploads_are_kept(self):
+        upload = self.upload(self.user)
+        self.assertEqual(delete_unused_uploads(), 0)
+        User.objects.filter(pk=self.user.pk).update(profile_picture=upload)
+        self.assertEqual(delete_unused_uploads(min_age=timedelta(0)), 0)
+        self.assertTrue(get_storage().exists(upload))
+
+
+@override_settings(DASHBOARD_CACHE=True)
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        self.offerings, records = create_cohort(student_count=1)
+        self.record = records[0]
+        self.record.enroll_in_courses(self.offerings)
+        self.student = self.record.student
+        self.period = self.record.academic_period
+        self.keys = [
+            dashboard._key('record', self.student.pk),
+            dashboard._key('enrollments', self.record.pk),
+            dashboard._key('transcript', self.student.pk),
+        ]
+        dashboard.get_current_record(self.student, self.period)
+        dashboard.get_enrollments(self.record)
+        dashboard.get_transcript(self.student)
+
+    def assertCached(self, *keys):
+        self.assertEqual(set(cache.get_many(keys)), set(keys))
+
+    def assertInvalidated(self, *keys):
+        self.assertEqual(cache.get_many(keys), {})
+
+    def test_fragments_are_cached(self):
+        self.assertCached(*self.keys)
+
+    @override_settings(DASHBOARD_CACHE=False)
+    def test_fragments_are_not_cached_without_a_shared_cache(self):
+        cache.clear()
+        dashboard.get_transcript(self.student)
+        self.assertInvalidated(*self.keys)
+
+    def test_rollover_invalidates_the_current_record(self):
+        next_period = AcademicPeriod.objects.create(
+            academic_year='2025-2026', semester='Spring',
+            start_date=self.period.end_date, end_date=self.period.end_date + timedelta(days=120)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rollover_term', next_period.pk, stdout=StringIO())
+        self.assertInvalidated(dashboard._key('record', self.student.pk))
+
+    def test_retake_backfill_invalidates_enrollments_and_transcript(self):
+        Enrollment.objects.filter(student_record=self.record).update(is_retake=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            list(backfill_retakes())
+        self.assertInvalidated(*self.keys[1:])
+
+    def test_transcript_rebuild_invalidates_enrollments_and_transcript(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_transcripts', stdout=StringIO())
+        self.assertInvalidated(*self.keys[1:])
+
+    def test_course_rename_invalidates_enrollments_and_transcript(self):
+        course = self.offerings[0].course_department.course
+        course.course_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            course.save()
+        self.assertInvalidated(*self.keys[1:])
+        entries, _ = dashboard.get_transcript(self.student)
+        self.assertIn("Renamed", [entry.course_name for entry in entries])
+
+
+class CounterTests(TestCase):
+    def assertTotalsMatchTables(self):
+        self.assertEqual(counters.get_totals(), {
+            name: model.objects.count() for name, model in counters.COUNTED_MODELS.items()
+        })
+
+    def test_saves_and_deletes_are_counted(self):
+        _, records = create_cohort(student_count=2)
+        user = User.objects.create_user(email='teacher@example.com', username='teacher', role='Teacher')
+        Teacher.objects.create(user=user, department=records[0].department)
+        self.assertEqual(counters.get_totals()['total_students'], 2)
+        self.assertTotalsMatchTables()
+
+        # Students are deleted through the User cascade, courses one by one.
+        records[0].student.user.delete()
+        Course.objects.first().delete()
+        self.assertEqual(counters.get_totals()['total_students'], 1)
+        self.assertTotalsMatchTables()
+
+    def test_generated_data_is_counted(self):
+        counters.get_totals()
+        call_command('generate_university_data', students=20, stdout=StringIO())
+        self.assertTotalsMatchTables()
+
+    def test_missing_counters_are_recounted(self):
+        create_cohort(student_count=2)
+        StatisticsCounter.objects.all().delete()
+        self.assertTotalsMatchTables()
+
+    def test_reconcile_corrects_drift(self):
+        create_cohort(student_count=2)
+        StatisticsCounter.objects.filter(name='total_students').update(value=40)
+        StatisticsCounter.objects.filter(name='total_departments').delete()
+
+        results = counters.reconcile(dry_run=True)
+        self.assertEqual(results['total_students'], (40, 2))
+        self.assertEqual(results['total_departments'], (None, 1))
+        self.assertEqual(StatisticsCounter.objects.get(name='total_students').value, 40)
+
+        counters.reconcile()
+        self.assertTotalsMatchTables()
+
+    def test_reconcile_command(self):
+        create_cohort(student_count=2)
+        StatisticsCounter.objects.filter(name='total_students').update(value=40)
+        stdout = StringIO()
+        call_command('reconcile_counters', 'total_students', stdout=stdout)
+        self.assertIn("total_students: 40 -> 2", stdout.getvalue())
+        self.assertEqual(Student.objects.count(), StatisticsCounter.objects.get(name='total_students').value)
+        with self.assertRaisesMessage(CommandError, "Unknown counter(s): total_rooms."):
+            call_command('reconcile_counters', 'total_rooms', stdout=StringIO())
+
+
+def read_session(request):
+    request.session.get('answer')
+    return HttpResponse()
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db', SESSION_REFRESH_INTERVAL=3600)
+class SessionMiddlewareTests(TestCase):
+    def setUp(self):
+        session = SessionStore()
+        session['answer'] = 42
+        session.create()
+        self.session_key = session.session_key
+        self.now = time.time()
+
+    def get(self, view=read_session, after=0):
+        """Send a request with the session and return whether the session was saved."""
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = self.session_key
+        with mock.patch('university.middleware.time.time', return_value=self.now + after):
+            response = SessionMiddleware(view)(request)
+        return settings.SESSION_COOKIE_NAME in response.cookies
+
+    def test_active_session_is_saved_once_per_interval(self):
+        self.assertTrue(self.get())
+        self.assertFalse(self.get(after=3599))
+        self.assertTrue(self.get(after=3600))
+        self.assertFalse(self.get(after=3601))
+
+    def test_refresh_pushes_back_the_expiry(self):
+        self.get()
+        expire_date = Session.objects.get().expire_date
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(hours=2)):
+            self.get(after=2 * 3600)
+        self.assertGreater(Session.objects.get().expire_date, expire_date)
+
+    def test_modified_session_is_always_saved(self):
+        def write_session(request):
+            request.session['answer'] = 43
+            return HttpResponse()
+
+        self.get()
+        self.assertTrue(self.get(write_session, after=1))
+
+    def test_unused_session_is_not_saved(self):
+        self.assertFalse(self.get(lambda request: HttpResponse(), after=3600))
+
+    @override_settings(SESSION_REFRESH_INTERVAL=0)
+    def test_no_interval_saves_only_modified_sessions(self):
+        self.assertFalse(self.get())
+        self.assertFalse(self.get(after=10 ** 6))
+
+
+class PurgeExpiredSessionsTests(TestCase):
+    def test_expired_sessions_are_deleted_in_chunks(self):
+        now = timezone.now()
+        for index in range(5):
+            Session.objects.create(
+                session_key=f'expired{index}', session_data='', expire_date=now - timedelta(minutes=1)
+            )
+        Session.objects.create(session_key='active', session_data='', expire_date=now + timedelta(days=1))
+        stdout = StringIO()
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            call_command('purge_expired_sessions', chunk_size=2, stdout=stdout)
+        self.assertIn("Deleted 5 expired session(s).", stdout.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['active'])
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.file')
+    def test_other_backends_clear_their_own_sessions(self):
+        stdout = StringIO()
+        with mock.patch('django.contrib.sessions.backends.file.SessionStore.clear_expired') as clear_expired:
+            call_command('purge_expired_sessions', stdout=stdout)
+        clear_expired.assert_called_once_with()
+        self.assertIn("Cleared expired sessions of django.contrib.sessions.backends.file.", stdout.getvalue())
+
+
+class ImportUsersTests(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(department_name="Physics")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.directory = directory
+
+    def import_file(self, name, content, **options):
+        path = f"{self.directory}/{name}"
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        try:
+            call_command('import_users', path, workers=1, stdout=stdout, stderr=stderr, **options)
+        finally:
+            self.stderr = stderr.getvalue()
+        return stdout.getvalue()
+
+    def test_csv_import(self):
+        output = self.import_file('users.csv', (
+            "email,username,password,role,first_name,date_of_birth,gender,department\n"
+            "ann@example.com,ann,secret-pw,Student,Ann,2001-02-03,Female,\n"
+            "bob@example.com,bob,,Teacher,Bob,,Male,physics\n"
+        ))
+        self.assertIn("Created 2 users", output)
+        ann = User.objects.get(email='ann@example.com')
+        self.assertTrue(ann.check_password('secret-pw'))
+        self.assertEqual(str(ann.date_of_birth), '2001-02-03')
+        self.assertTrue(Student.objects.filter(user=ann).exists())
+        bob = User.objects.get(email='bob@example.com')
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(Teacher.objects.get(user=bob).department, self.department)
+        self.assertEqual(counters.get_totals()['total_students'], 1)
+
+    def test_duplicates(self):
+        User.objects.create_user(email='ann@example.com', username='ann', role='Student')
+        content = "email,username\nann@example.com,ann2\ncid@example.com,cid\ncid@example.com,cid3\n"
+        with self.assertRaisesMessage(CommandError, "Some rows were not imported"):
+            self.import_file('users.csv', content)
+        self.assertIn("Line 2: duplicate email ann@example.com", self.stderr)
+        self.assertIn("Line 4: duplicate email cid@example.com", self.stderr)
+        self.assertTrue(User.objects.filter(username='cid').exists())
+
+        User.objects.filter(username='cid').delete()
+        self.assertIn("2 duplicates", self.import_file('users.csv', content, on_duplicate='skip'))
+        self.assertEqual(self.stderr, '')
+
+    def test_bad_jsonl_rows_are_reported(self):
+        content = '\n'.join([
+            '{"email": "ann@example.com", "username": "ann", "phone": 5550100}',
+            '{"email": "bob@example.com", "username": ',
+            '["not", "an", "object"]',
+            '{"email": "cid@example.com", "username": ["cid"]}',
+            '{"email": "dan@example.com", "username": "dan", "gender": "Unknown"}',
+            '',
+            '{"email": "eve@example.com", "username": "eve", "role": "Teacher", "first_name": null}',
+        ])
+        with self.assertRaisesMessage(CommandError, "Some rows were not imported"):
+            self.import_file('users.jsonl', content)
+        self.assertIn("Line 2: invalid JSON (Expecting value at column 42)", self.stderr)
+        self.assertIn("Line 3: expected a JSON object, not list", self.stderr)
+        self.assertIn("Line 4: username must be a string, not list", self.stderr)
+        self.assertIn("Line 5: unknown gender 'Unknown'", self.stderr)
+        self.assertEqual(
+            sorted(User.objects.values_list('username', flat=True)), ['ann', 'eve']
+        )
+        self.assertEqual(User.objects.get(username='ann').phone, '5550100')
+
+
+class SQLiteBackendTests(TestCase):
+    def test_synchronous_level(self):
+        wrapper = SQLiteDatabaseWrapper({})
+        self.assertEqual(wrapper.get_synchronous_level('NORMAL'), 1)
+        self.assertEqual(wrapper.get_synchronous_level('full'), 2)
+        self.assertEqual(wrapper.get_synchronous_level(0), 0)
+        self.assertEqual(wrapper.get_synchronous_level('3'), 3)
+        for value in ('NORMAL; PRAGMA foreign_keys = OFF', 'ON', 4, ''):
+            with self.assertRaises(ImproperlyConfigured):
+                wrapper.get_synchronous_level(value)
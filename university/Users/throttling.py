@@ -0,0 +1,71 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_PREFIX = 'users:sign_in_failures'
+
+
+def get_cache():
+    return caches[settings.LOGIN_THROTTLE_CACHE]
+
+
+def get_client_ip(request):
+    """
+    Return the client's address, from LOGIN_CLIENT_IP_HEADER if it is set.
+
+    Each of the LOGIN_TRUSTED_PROXIES proxies appends the address it got the
+    request from, so the client's is that many entries from the end. Entries
+    before it came from the client and may be forged.
+    """
+    header = settings.LOGIN_CLIENT_IP_HEADER
+    if header:
+        addresses = [address.strip() for address in request.META.get(header, '').split(',') if address.strip()]
+        if len(addresses) >= settings.LOGIN_TRUSTED_PROXIES:
+            return addresses[-settings.LOGIN_TRUSTED_PROXIES]
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def _email_key(email):
+    # Hashed so arbitrary input cannot produce an invalid cache key.
+    digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+    return f'{CACHE_PREFIX}:email:{digest}'
+
+
+def _ip_key(ip):
+    return f'{CACHE_PREFIX}:ip:{ip}'
+
+
+def is_locked_out(email, ip):
+    """
+    Return True if the email or the client address used up its failed
+    attempts in the current window. Costs one cache round trip.
+    """
+    counts = get_cache().get_many([_email_key(email), _ip_key(ip)])
+    return (
+        counts.get(_email_key(email), 0) >= settings.LOGIN_MAX_FAILURES_PER_EMAIL or
+        counts.get(_ip_key(ip), 0) >= settings.LOGIN_MAX_FAILURES_PER_IP
+    )
+
+
+def record_failure(email, ip):
+    """
+    Count a failed sign-in against the email and the client address.
+
+    The window starts at the first failure and is not extended by later
+    ones, so a locked-out user can try again LOGIN_FAILURE_WINDOW seconds
+    after the first failure.
+    """
+    cache = get_cache()
+    for key in (_email_key(email), _ip_key(ip)):
+        cache.add(key, 0, settings.LOGIN_FAILURE_WINDOW)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.set(key, 1, settings.LOGIN_FAILURE_WINDOW)
+
+
+def reset_failures(email):
+    """Forget the failures of an email after a successful sign-in."""
+    get_cache().delete(_email_key(email))
@@ -10,4 +10,5 @@ urlpatterns = [
     path('signin/', views.SignInView.as_view(), name='sign-in'),
     path('logout/', views.logout_view, name='sign-out'),
     path('dashboard/', views.index, name='dashboard'), 
+    path('profile-pictures/<str:picture_hash>/<str:variant>.<str:extension>', views.profile_picture, name='profile-picture'),
 ]
\ No newline at end of file
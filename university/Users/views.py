@@ -1,11 +1,13 @@
 from django.conf import settings
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
+from django.http import FileResponse, Http404
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views import View
 from django.utils.decorators import method_decorator
 from .forms import CustomAuthenticationForm, CustomUserCreationForm
+from .images import FORMATS, get_storage, get_variant
 
 User = settings.AUTH_USER_MODEL
 
@@ -27,20 +29,17 @@ class SignInView(View):
 
     def post(self, request):
         """Process the sign in form."""
-        form = self.form_class(request.POST)
+        form = self.form_class(request, request.POST)
         if form.is_valid():
-            email = form.cleaned_data.get('email')
-            password = form.cleaned_data.get('password')
             remember_me = form.cleaned_data.get('remember_me')
-            user = authenticate(request, username=email, password=password)
-            if user is not None:
-                login(request, user)
-                if remember_me:
-                    request.session.set_expiry(60 * 60 * 24 * 30)  # 30 days
-                else:
-                    request.session.set_expiry(0)  # Browser session
-                return redirect('Users:dashboard')
-        return render(request, self.template_name, {'form': form})
+            # The form already checked the password; authenticate() would hash it again.
+            login(request, form.get_user(), backend='django.contrib.auth.backends.ModelBackend')
+            if remember_me:
+                request.session.set_expiry(60 * 60 * 24 * 30)  # 30 days
+            else:
+                request.session.set_expiry(0)  # Browser session
+            return redirect('Users:dashboard')
+        return render(request, self.template_name, {'form': form}, status=429 if form.locked_out else 200)
 
 # class SignUpView(View):
 #     """Handle user sign up."""
@@ -60,6 +59,18 @@ class SignInView(View):
 #             return redirect('Users:dashboard')
 #         return render(request, self.template_name, {'form': form})
 
+@login_required
+def profile_picture(request, picture_hash, variant, extension):
+    """Serve a profile picture thumbnail, creating it on the first request."""
+    try:
+        name = get_variant(picture_hash, variant, extension)
+    except (ValueError, FileNotFoundError):
+        raise Http404("No such profile picture.")
+    response = FileResponse(get_storage().open(name), content_type=FORMATS[extension][2])
+    # The URL changes with the picture's content.
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
 @login_required
 def logout_view(request):
     """Log out the user and redirect to sign in page."""
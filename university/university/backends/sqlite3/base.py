@@ -0,0 +1,47 @@
+"""
+SQLite backend tuned for a single-node install serving concurrent requests.
+
+Each new connection switches to the WAL journal (readers no longer block the
+writer), waits up to OPTIONS['busy_timeout'] milliseconds for a lock instead
+of failing at once, and relaxes fsyncs to synchronous=NORMAL, which is still
+crash-safe in WAL mode.
+
+Transactions are opened with BEGIN IMMEDIATE so the write lock is taken up
+front. With SQLite's default deferred transactions, two requests that read
+and then write (such as section allocation) deadlock on the lock upgrade and
+one of them fails with "database is locked" regardless of the busy timeout.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+SYNCHRONOUS_LEVELS = {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        self.busy_timeout = conn_params.pop('busy_timeout', 5000)
+        self.synchronous = self.get_synchronous_level(conn_params.pop('synchronous', 'NORMAL'))
+        return conn_params
+
+    def get_synchronous_level(self, value):
+        """Return OPTIONS['synchronous'] (a level name or 0-3) as the level number."""
+        level = str(value).strip().upper()
+        if level in SYNCHRONOUS_LEVELS:
+            return SYNCHRONOUS_LEVELS[level]
+        if level in {str(number) for number in SYNCHRONOUS_LEVELS.values()}:
+            return int(level)
+        raise ImproperlyConfigured(
+            f"Invalid SQLite synchronous setting {value!r}, use one of "
+            f"{', '.join(SYNCHRONOUS_LEVELS)} or 0-3."
+        )
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout)}')
+        conn.execute(f'PRAGMA synchronous = {self.synchronous:d}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -0,0 +1,117 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware as BaseSessionMiddleware
+from django.db import connections
+
+logger = logging.getLogger('university.queries')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # Parameters are not part of the SQL here, so the same statement
+            # run for different rows (the N+1 pattern) shares one signature.
+            self.signatures[sql] += 1
+
+    def duplicates(self, threshold):
+        return {sql: count for sql, count in self.signatures.items() if count >= threshold}
+
+
+class QueryProfilingMiddleware:
+    """
+    Record the SQL issued by each request, independent of DEBUG.
+
+    Adds a Server-Timing header (database time and query count, plus total
+    time) and logs one JSON line per request to the 'university.queries'
+    logger with the view name, query count, database time and any statement
+    repeated QUERY_PROFILING_DUPLICATE_THRESHOLD times or more.
+
+    QUERY_BUDGETS maps view names to the maximum number of queries they may
+    issue. Going over budget logs a warning, or raises QueryBudgetExceeded
+    when QUERY_BUDGET_STRICT is True, which makes tests fail.
+
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        threshold = getattr(settings, 'QUERY_PROFILING_DUPLICATE_THRESHOLD', 3)
+        duplicates = recorder.duplicates(threshold)
+
+        response['Server-Timing'] = (
+            f'db;desc="{recorder.count} queries";dur={recorder.duration * 1000:.1f}, '
+            f'app;dur={elapsed * 1000:.1f}'
+        )
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'total_ms': round(elapsed * 1000, 2),
+            'duplicates': [{'sql': sql, 'count': count} for sql, count in duplicates.items()],
+        }))
+
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+        if budget is not None and recorder.count > budget:
+            message = f"{view_name} issued {recorder.count} queries (budget {budget})."
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+
+class SessionMiddleware(BaseSessionMiddleware):
+    """
+    SessionMiddleware that keeps active sessions alive without saving them
+    on every request.
+
+    Like Django's, it only saves sessions that changed. In addition, a
+    session used by a request is saved once its last save is
+    SESSION_REFRESH_INTERVAL seconds old, which pushes back its expiry
+    date and cookie. Requests in between cost no session write at all.
+    """
+    REFRESHED_AT_KEY = '_session_refreshed_at'
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', 0)
+        if session is not None and session.accessed and interval and not session.is_empty():
+            now = int(time.time())
+            if session.modified or now - session.get(self.REFRESHED_AT_KEY, 0) >= interval:
+                session[self.REFRESHED_AT_KEY] = now
+        return super().process_response(request, response)
@@ -12,12 +12,18 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import django
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Load environment variables from .env
 load_dotenv()
 
 
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -50,7 +56,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'university.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -58,6 +64,38 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request SQL profiling, see university.middleware.QueryProfilingMiddleware.
+QUERY_PROFILING = env_bool('QUERY_PROFILING', False)
+QUERY_PROFILING_DUPLICATE_THRESHOLD = 3
+# Maximum number of queries per view name. They do not depend on the number of
+# courses or enrollments; Academics.tests.QueryBudgetTests holds the views to them.
+QUERY_BUDGETS = {
+    'Users:index': 12,
+    'Academics:course_registration': 25,
+    'Academics:registration_courses_api': 12,
+    'Academics:registration_enroll_api': 25,
+}
+# Raise instead of logging when a view goes over its budget (for tests).
+QUERY_BUDGET_STRICT = False
+
+if QUERY_PROFILING:
+    MIDDLEWARE.insert(0, 'university.middleware.QueryProfilingMiddleware')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'university.queries': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'university.urls'
 
 TEMPLATES = [
@@ -83,12 +121,150 @@ WSGI_APPLICATION = 'university.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE picks the database:
+#   sqlite      (default) single-node installs. Unless DB_SQLITE_TUNED=False,
+#               uses university.backends.sqlite3: WAL journal, busy_timeout,
+#               synchronous=NORMAL and write transactions that take the lock
+#               up front.
+#   postgresql  persistent connections (DB_CONN_MAX_AGE) with health checks.
+#               DB_POOL=True uses psycopg's connection pool instead, which
+#               needs Django 5.1+ and psycopg[pool].
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'university'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', ''),
+            'PORT': os.getenv('DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+            'OPTIONS': {},
+        }
+    }
+    if env_bool('DB_POOL', False):
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                f"DB_POOL needs Django 5.1 or later, this is Django {django.get_version()}."
+            )
+        # Pooled connections are handed back to the pool after each request,
+        # so Django must not keep them open itself.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 20)),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+    if env_bool('DB_SQLITE_TUNED', True):
+        DATABASES['default']['ENGINE'] = 'university.backends.sqlite3'
+        DATABASES['default']['OPTIONS'] = {
+            'busy_timeout': int(os.getenv('DB_SQLITE_BUSY_TIMEOUT', 5000)),
+            'synchronous': os.getenv('DB_SQLITE_SYNCHRONOUS', 'NORMAL'),
+        }
+else:
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE {DB_ENGINE!r}, use 'sqlite' or 'postgresql'.")
+
+# Queued registration: course registration POSTs are stored as
+# RegistrationRequest tickets and processed by `manage.py run_enrollment_workers`
+# instead of enrolling inside the request. New tickets are refused once
+# REGISTRATION_QUEUE_MAX_PENDING tickets are waiting (0 means no limit).
+REGISTRATION_QUEUE = env_bool('REGISTRATION_QUEUE', False)
+REGISTRATION_QUEUE_MAX_PENDING = int(os.getenv('REGISTRATION_QUEUE_MAX_PENDING', 5000))
+
+
+# Cache
+# CACHE_BACKEND picks the default cache:
+#   locmem  (default) per-process memory; fine for a single process.
+#   file    files under CACHE_LOCATION, shared by all processes on the host.
+#           Defaults to /dev/shm, so entries stay in memory. Every write
+#           lists the whole directory to decide whether to cull, so its
+#           cost grows with CACHE_MAX_ENTRIES; use redis for large caches.
+#   redis   a Redis server at CACHE_LOCATION (needs the redis package).
+# CACHE_MAX_ENTRIES bounds the locmem and file caches (Django's default is 300).
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 10000))},
+        }
     }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv(
+                'CACHE_LOCATION',
+                '/dev/shm/university-cache' if os.path.isdir('/dev/shm') else BASE_DIR / 'cache'
+            ),
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 5000))},
+        }
+    }
+elif CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379'),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unsupported CACHE_BACKEND {CACHE_BACKEND!r}, use 'locmem', 'file' or 'redis'.")
+
+# Cached data is invalidated by signals in the process that changes it, and
+# only a shared cache carries that to the other processes. SHARED_CACHE says
+# whether the default cache is shared; when it is not, dashboard fragments
+# (see Users.dashboard) are not cached, and the catalog, academic period and
+# prerequisite caches of Academics expire after UNSHARED_CACHE_TIMEOUT
+# seconds instead of living until they are invalidated.
+SHARED_CACHE = env_bool('SHARED_CACHE', CACHE_BACKEND != 'locmem')
+UNSHARED_CACHE_TIMEOUT = int(os.getenv('UNSHARED_CACHE_TIMEOUT', 60))
+DASHBOARD_CACHE = env_bool('DASHBOARD_CACHE', SHARED_CACHE)
+
+# Sign-in throttle counters get a cache of their own, so that culling or
+# evicting other entries never resets them.
+CACHES['throttle'] = dict(CACHES['default'], KEY_PREFIX='throttle')
+if CACHE_BACKEND == 'locmem':
+    CACHES['throttle']['LOCATION'] = 'throttle'
+elif CACHE_BACKEND == 'file':
+    CACHES['throttle']['LOCATION'] = f"{CACHES['default']['LOCATION']}-throttle"
+
+# Sessions
+# SESSION_BACKEND picks where session data lives: db, cached_db (reads from
+# the cache, writes through to the database), cache, file or signed_cookies.
+# It defaults to cached_db when the cache is shared between processes, and
+# to db otherwise, because a per-process cache would keep serving a session
+# that another process has logged out.
+# Unchanged sessions are not saved; SESSION_REFRESH_INTERVAL is how often (in
+# seconds) an active session is saved anyway to push its expiry back, 0 to
+# never do so. See university.middleware.SessionMiddleware.
+
+SESSION_BACKENDS = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'file': 'django.contrib.sessions.backends.file',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'db' if CACHE_BACKEND == 'locmem' else 'cached_db')
+if SESSION_BACKEND not in SESSION_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unsupported SESSION_BACKEND {SESSION_BACKEND!r}, use one of {', '.join(SESSION_BACKENDS)}."
+    )
+SESSION_ENGINE = SESSION_BACKENDS[SESSION_BACKEND]
+SESSION_REFRESH_INTERVAL = int(os.getenv('SESSION_REFRESH_INTERVAL', 60 * 60 * 24))
 
 
 # Password validation
@@ -133,6 +309,12 @@ STATICFILES_DIRS=[os.path.join(BASE_DIR,'static')]
 MEDIA_URL='/media/'
 MEDIA_ROOT=os .path.join(BASE_DIR,'media')
 
+# Uploaded profile pictures are downscaled to PROFILE_PICTURE_MAX_SIZE pixels
+# by PROFILE_PICTURE_WORKERS background threads (0 processes them during the
+# upload request). See Users.images.
+PROFILE_PICTURE_MAX_SIZE = int(os.getenv('PROFILE_PICTURE_MAX_SIZE', 1024))
+PROFILE_PICTURE_WORKERS = int(os.getenv('PROFILE_PICTURE_WORKERS', 2))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -140,4 +322,23 @@ LOGIN_URL= "Users:sign-in"
 
 AUTH_USER_MODEL = 'Users.User'
 
+# Sign-in throttling: once an email has LOGIN_MAX_FAILURES_PER_EMAIL failed
+# attempts, or a client address LOGIN_MAX_FAILURES_PER_IP, within
+# LOGIN_FAILURE_WINDOW seconds, sign-in is refused before the password is
+# hashed. The counters live in the LOGIN_THROTTLE_CACHE cache, which must be
+# shared between processes for the limits to be global; `check --deploy`
+# reports a per-process one.
+# Behind a reverse proxy, set LOGIN_CLIENT_IP_HEADER to the request.META key
+# of the header the proxies append the client address to, e.g.
+# HTTP_X_FORWARDED_FOR, and LOGIN_TRUSTED_PROXIES to the number of proxies.
+# Otherwise REMOTE_ADDR is used.
+LOGIN_MAX_FAILURES_PER_EMAIL = int(os.getenv('LOGIN_MAX_FAILURES_PER_EMAIL', 5))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv('LOGIN_MAX_FAILURES_PER_IP', 50))
+LOGIN_FAILURE_WINDOW = int(os.getenv('LOGIN_FAILURE_WINDOW', 15 * 60))
+LOGIN_THROTTLE_CACHE = 'throttle'
+LOGIN_CLIENT_IP_HEADER = os.getenv('LOGIN_CLIENT_IP_HEADER', '')
+LOGIN_TRUSTED_PROXIES = int(os.getenv('LOGIN_TRUSTED_PROXIES', 1))
+if LOGIN_CLIENT_IP_HEADER and LOGIN_TRUSTED_PROXIES < 1:
+    raise ImproperlyConfigured("LOGIN_TRUSTED_PROXIES must be at least 1 when LOGIN_CLIENT_IP_HEADER is set.")
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'